@@ -0,0 +1,7 @@
+# Código usado por mais de um app do repositório:
+#   banco.py      perfil do SQLite e pool medido
+#   estaticos.py  build e serviço dos estáticos com hash (v1 e v2)
+#   indice_ingredientes.py  índice invertido em bitsets (v2 e semana_7)
+#   ingredientes.py  leitura do formulário e busca/criação em lote (v1 e v2)
+# Os apps rodam de dentro da própria pasta, então cada app.py põe a raiz do
+# repositório no sys.path antes de importar daqui.
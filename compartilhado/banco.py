@@ -0,0 +1,151 @@
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# ----------------- PERFIL DE PRODUÇÃO DO SQLITE -----------------
+# Por padrão o SQLite usa journal "DELETE": um escritor bloqueia todos os
+# leitores e, sem busy_timeout, a segunda escrita concorrente falha na hora
+# com "database is locked". Com WAL leitores e escritor andam juntos e o
+# busy_timeout faz quem chegou depois esperar em vez de falhar.
+#
+# Uso (ANTES de db.init_app):
+#     from compartilhado.banco import configurar_banco, registrar_pragmas
+#     configurar_banco(app)
+#     db.init_app(app)
+#     registrar_pragmas(app, db)
+# Módulo único para todos os apps (app_receitas_v1/v2, semana_6, semana_7):
+# cada app.py põe a raiz do repositório no sys.path antes de importar.
+
+PRAGMAS_PADRAO = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",     # seguro com WAL; fsync só no checkpoint
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,        # ms esperando o lock antes de desistir
+    "cache_size": -20000,        # negativo = KiB (~20 MB por conexão)
+    "mmap_size": 268435456,      # 256 MB lidos via mmap
+    "temp_store": "MEMORY",
+}
+
+# Chave no app.config -> argumento de create_engine
+OPCOES_POOL = {
+    "BANCO_POOL_SIZE": "pool_size",
+    "BANCO_MAX_OVERFLOW": "max_overflow",
+    "BANCO_POOL_TIMEOUT": "pool_timeout",
+    "BANCO_POOL_RECYCLE": "pool_recycle",
+    "BANCO_POOL_PRE_PING": "pool_pre_ping",
+}
+
+
+def opcoes_do_pool(config):
+    """Monta SQLALCHEMY_ENGINE_OPTIONS a partir das chaves BANCO_* do config."""
+    opcoes = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    for chave, argumento in OPCOES_POOL.items():
+        if config.get(chave) is not None:
+            opcoes[argumento] = config[chave]
+    return opcoes
+
+
+class PoolMedido(QueuePool):
+    """QueuePool que mede checkouts e o tempo de espera (inclui abrir conexão nova).
+
+    Só usa API pública: os eventos de pool ("checkout", "connect") disparam
+    depois que a conexão já saiu da fila e não há evento "antes do checkout",
+    então a espera é cronometrada em volta de Pool.connect(), por onde o
+    engine pega toda conexão.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trava_medidas = threading.Lock()
+        self.medidas = {"checkouts": 0, "timeouts": 0, "espera_total_s": 0.0, "espera_max_s": 0.0}
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._trava_medidas:
+                self.medidas["timeouts"] += 1
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._trava_medidas:
+                self.medidas["checkouts"] += 1
+                self.medidas["espera_total_s"] += espera
+                self.medidas["espera_max_s"] = max(self.medidas["espera_max_s"], espera)
+
+
+def estatisticas_pool(engine):
+    """Retrato do pool de conexões do `engine` (para /api/estatisticas/pool)."""
+    pool = engine.pool
+    dados = {"backend": engine.dialect.name, "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        dados.update(
+            tamanho=pool.size(),
+            em_uso=pool.checkedout(),
+            livres=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, PoolMedido):
+        with pool._trava_medidas:
+            medidas = dict(pool.medidas)
+        checkouts = medidas["checkouts"] or 1
+        medidas["espera_media_ms"] = round(medidas["espera_total_s"] / checkouts * 1000, 3)
+        dados.update(medidas)
+    return dados
+
+
+def _banco_em_memoria(url):
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def configurar_banco(app):
+    app.config.setdefault("SQLITE_PRAGMAS", {})
+    app.config.setdefault("SQLITE_BEGIN_IMMEDIATE", False)
+    opcoes = opcoes_do_pool(app.config)
+    if _banco_em_memoria(app.config["SQLALCHEMY_DATABASE_URI"]):
+        # SQLite em memória usa StaticPool (uma conexão só); pool não se aplica
+        for argumento in OPCOES_POOL.values():
+            opcoes.pop(argumento, None)
+    else:
+        opcoes.setdefault("poolclass", PoolMedido)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = opcoes
+
+
+def aplicar_pragmas(engine, pragmas=None, begin_immediate=False):
+    """Executa os PRAGMAs em toda conexão nova do `engine` (só SQLite)."""
+    pragmas = {**PRAGMAS_PADRAO, **(pragmas or {})}
+
+    @event.listens_for(engine, "connect")
+    def _ao_conectar(conexao_dbapi, registro):
+        if not isinstance(conexao_dbapi, sqlite3.Connection):
+            return
+        if begin_immediate:
+            # Deixa o SQLAlchemy controlar o BEGIN (ver _ao_iniciar)
+            conexao_dbapi.isolation_level = None
+        cursor = conexao_dbapi.cursor()
+        for nome, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nome} = {valor}")
+        cursor.close()
+
+    if begin_immediate:
+        # Pega o lock de escrita já no BEGIN: evita o SQLITE_BUSY imediato
+        # quando uma transação de leitura tenta virar escrita sob concorrência.
+        @event.listens_for(engine, "begin")
+        def _ao_iniciar(conexao):
+            if conexao.dialect.name == "sqlite":
+                conexao.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def registrar_pragmas(app, db):
+    with app.app_context():
+        aplicar_pragmas(
+            db.engine,
+            app.config.get("SQLITE_PRAGMAS"),
+            app.config.get("SQLITE_BEGIN_IMMEDIATE", False),
+        )
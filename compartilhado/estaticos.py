@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+
+from flask import request, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+# ----------------- ARQUIVOS ESTÁTICOS VERSIONADOS -----------------
+# `flask construir-estaticos` (no deploy) lê static/ e grava em
+# ESTATICOS_PASTA (padrão instance/estaticos):
+#   - css/style.css  ->  css/style.<hash do conteúdo>.css, já minificado
+#     (só comentários e espaços; JS e imagens vão como estão);
+#   - ao lado, .gz e .br (brotli, se `pip install brotli`) pré-comprimidos;
+#   - manifest.json {"css/style.css": "css/style.1a2b3c4d5e6f.css"}.
+# Com o manifesto, url_for('static', filename='css/style.css') gera a URL com
+# hash (templates não mudam) e esses arquivos saem com Cache-Control
+# immutable de 1 ano, na versão comprimida que o navegador aceitar. Conteúdo
+# novo = hash novo = URL nova, então o navegador nunca revalida: visitas
+# repetidas não fazem request de estático nenhum. Sem manifesto (ou para
+# arquivo fora dele) vale o /static normal do Flask.
+# Builds antigos não são apagados: página velha em cache (ou worker ainda
+# não reiniciado) continua achando o CSS que ela referencia.
+
+MANIFESTO = "manifest.json"
+COMPRIMIVEIS = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map", ".xml"}
+UM_ANO = 365 * 24 * 3600
+
+_URL_CSS = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def minificar_css(texto):
+    """Minificação conservadora: tira comentários e espaços que não mudam o significado."""
+    texto = re.sub(r"/\*.*?\*/", "", texto, flags=re.S)
+    texto = re.sub(r"\s+", " ", texto)
+    texto = re.sub(r"\s*([{};,>])\s*", r"\1", texto)
+    texto = re.sub(r":\s+", ":", texto)
+    return texto.replace(";}", "}").strip()
+
+
+def _reescrever_urls(texto, relativo, manifesto):
+    # url(../img/x.png) dentro do CSS também aponta para a versão com hash
+    pasta = posixpath.dirname(relativo)
+
+    def trocar(casamento):
+        alvo = casamento.group(2)
+        if ":" in alvo or alvo.startswith(("/", "#")):
+            return casamento.group(0)  # data:, http:, absoluto
+        caminho, _, resto = alvo.partition("?")
+        normalizado = posixpath.normpath(posixpath.join(pasta, caminho))
+        if normalizado not in manifesto:
+            return casamento.group(0)
+        novo = posixpath.relpath(manifesto[normalizado], pasta or ".")
+        return f"url({novo}{'?' + resto if resto else ''})"
+
+    return _URL_CSS.sub(trocar, texto)
+
+
+def _gravar(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)  # workers lendo nunca veem arquivo pela metade
+
+
+def construir(origem, destino):
+    """Gera os arquivos com hash (+ .gz/.br) e o manifesto; devolve (manifesto, brotli_disponivel)."""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    arquivos = []
+    for raiz, pastas, nomes in os.walk(origem):
+        pastas.sort()
+        for nome in sorted(nomes):
+            caminho = os.path.join(raiz, nome)
+            if os.path.abspath(caminho).startswith(os.path.abspath(destino) + os.sep):
+                continue
+            arquivos.append(os.path.relpath(caminho, origem).replace(os.sep, "/"))
+    # CSS por último: as url() dele precisam do hash dos outros arquivos
+    arquivos.sort(key=lambda relativo: relativo.endswith(".css"))
+
+    manifesto = {}
+    for relativo in arquivos:
+        with open(os.path.join(origem, relativo), "rb") as arquivo:
+            conteudo = arquivo.read()
+        base, extensao = posixpath.splitext(relativo)
+        if extensao == ".css":
+            texto = _reescrever_urls(conteudo.decode("utf-8"), relativo, manifesto)
+            conteudo = minificar_css(texto).encode("utf-8")
+        final = f"{base}.{hashlib.sha256(conteudo).hexdigest()[:12]}{extensao}"
+        caminho = os.path.join(destino, final)
+        _gravar(caminho, conteudo)
+        if extensao in COMPRIMIVEIS:
+            _gravar(caminho + ".gz", gzip.compress(conteudo, compresslevel=9, mtime=0))
+            if brotli:
+                _gravar(caminho + ".br", brotli.compress(conteudo, quality=11))
+        manifesto[relativo] = final
+
+    _gravar(os.path.join(destino, MANIFESTO),
+            json.dumps(manifesto, indent=2, sort_keys=True).encode("utf-8"))
+    return manifesto, brotli is not None
+
+
+class Estaticos:
+    def __init__(self):
+        self.pasta = None
+        self.manifesto = {}
+        self._versionados = set()
+        self._servir_original = None
+
+    def init_app(self, app):
+        self.pasta = app.config.get("ESTATICOS_PASTA") or os.path.join(app.instance_path, "estaticos")
+        self.carregar()
+        app.url_defaults(self._versionar)
+        self._servir_original = app.view_functions["static"]
+        app.view_functions["static"] = self._servir
+
+    def construir(self, origem):
+        """Build de `origem` (a pasta static/) para self.pasta, já valendo neste processo."""
+        resultado = construir(origem, self.pasta)
+        self.carregar()
+        return resultado
+
+    def carregar(self):
+        """(Re)lê o manifesto do build; sem build, url_for('static') fica como sempre foi."""
+        try:
+            with open(os.path.join(self.pasta, MANIFESTO), encoding="utf-8") as arquivo:
+                self.manifesto = json.load(arquivo)
+        except FileNotFoundError:
+            self.manifesto = {}
+        self._versionados = set(self.manifesto.values())
+
+    def _versionar(self, endpoint, valores):
+        if endpoint == "static" and "filename" in valores:
+            valores["filename"] = self.manifesto.get(valores["filename"], valores["filename"])
+
+    def _servir(self, filename):
+        if filename not in self._versionados and not self._de_build_antigo(filename):
+            return self._servir_original(filename=filename)
+        caminho = safe_join(self.pasta, filename)
+        if caminho is None or not os.path.isfile(caminho):
+            raise NotFound()
+        tipo = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        aceitas = request.accept_encodings
+        for codificacao, sufixo in (("br", ".br"), ("gzip", ".gz")):
+            if aceitas[codificacao] and os.path.isfile(caminho + sufixo):
+                resposta = send_file(caminho + sufixo, mimetype=tipo, max_age=UM_ANO, conditional=True)
+                resposta.headers["Content-Encoding"] = codificacao
+                break
+        else:
+            resposta = send_file(caminho, mimetype=tipo, max_age=UM_ANO, conditional=True)
+        resposta.cache_control.immutable = True
+        resposta.vary.add("Accept-Encoding")
+        return resposta
+
+    def _de_build_antigo(self, filename):
+        # nome com hash que não está no manifesto atual, mas existe na pasta do build
+        if not re.search(r"\.[0-9a-f]{12}\.[^./]+$", filename):
+            return False
+        caminho = safe_join(self.pasta, filename)
+        return caminho is not None and os.path.isfile(caminho)
+
+
+estaticos = Estaticos()
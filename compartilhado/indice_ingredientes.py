@@ -0,0 +1,140 @@
+import threading
+
+# ----------------- ÍNDICE INVERTIDO DE INGREDIENTES -----------------
+# "O que eu cozinho com tomate, cebola e ovo?"
+# Para cada ingrediente guardamos uma lista de postagem em forma de bitset
+# (um int do Python onde o bit N ligado = a receita da posição N usa o
+# ingrediente). As posições são densas e reaproveitadas: o bitset cresce com o
+# número de receitas com ingredientes, não com o maior id (ids esparsos ou
+# muito altos não inflam a memória).
+# A consulta soma os bitsets com um contador "fatiado em bits" (só AND/XOR),
+# então cobrir 1, 2, ... k ingredientes vira operações sobre inteiros, sem
+# JOIN + GROUP BY no banco a cada requisição.
+#
+# Aqui fica só a estrutura em memória. Ler os pares do banco, os hooks da
+# sessão e a versão que cada consulta confere ficam no indice_ingredientes.py
+# de cada app (app_receitas_v2, semana_7), que têm modelos diferentes.
+
+
+def _bits_ligados(bitset):
+    """Posições dos bits ligados, em ordem crescente."""
+    binario = bin(bitset)[:1:-1]  # bit 0 primeiro
+    ids = []
+    posicao = binario.find("1")
+    while posicao != -1:
+        ids.append(posicao)
+        posicao = binario.find("1", posicao + 1)
+    return ids
+
+
+class IndiceInvertido:
+    def __init__(self):
+        self.postagens = {}     # ingrediente_id -> bitset de posições
+        self.por_receita = {}   # receita_id -> frozenset(ingrediente_ids)
+        self.posicoes = {}      # receita_id -> posição do bit
+        self.receitas = []      # posição -> receita_id (None = livre)
+        self._livres = []
+        self.versao = None      # versão da tabela "receitas" refletida aqui
+        self.carregado = False
+        self._trava = threading.Lock()
+
+    def carregar(self, pares, versao=None):
+        """Monta o índice do zero a partir de (receita_id, ingrediente_id)."""
+        postagens, por_receita, posicoes, receitas = {}, {}, {}, []
+        for receita_id, ingrediente_id in pares:
+            posicao = posicoes.get(receita_id)
+            if posicao is None:
+                posicao = posicoes[receita_id] = len(receitas)
+                receitas.append(receita_id)
+            postagens[ingrediente_id] = postagens.get(ingrediente_id, 0) | (1 << posicao)
+            por_receita.setdefault(receita_id, set()).add(ingrediente_id)
+        with self._trava:
+            self.postagens = postagens
+            self.por_receita = {r: frozenset(i) for r, i in por_receita.items()}
+            self.posicoes = posicoes
+            self.receitas = receitas
+            self._livres = []
+            self.versao = versao
+            self.carregado = True
+
+    def _desligar(self, receita_id):
+        posicao = self.posicoes.pop(receita_id, None)
+        if posicao is None:
+            return
+        bit = 1 << posicao
+        for ingrediente_id in self.por_receita.pop(receita_id, ()):
+            restante = self.postagens.get(ingrediente_id, 0) & ~bit
+            if restante:
+                self.postagens[ingrediente_id] = restante
+            else:
+                self.postagens.pop(ingrediente_id, None)
+        self.receitas[posicao] = None
+        self._livres.append(posicao)
+
+    def _ocupar(self, receita_id):
+        if self._livres:
+            posicao = self._livres.pop()
+            self.receitas[posicao] = receita_id
+        else:
+            posicao = len(self.receitas)
+            self.receitas.append(receita_id)
+        self.posicoes[receita_id] = posicao
+        return posicao
+
+    def atualizar(self, ingredientes_por_receita, removidas=(), versao=None):
+        """Aplica mudanças: {receita_id: {ingrediente_ids}} e receitas removidas.
+
+        `versao` é a versão de "receitas" depois do commit que gerou as
+        mudanças; só é adotada se era a próxima da que o índice tinha (nenhum
+        outro processo escreveu no meio). Senão a próxima consulta recarrega.
+        """
+        with self._trava:
+            for receita_id in removidas:
+                self._desligar(receita_id)
+            for receita_id, ingrediente_ids in ingredientes_por_receita.items():
+                self._desligar(receita_id)
+                if not ingrediente_ids:
+                    continue
+                bit = 1 << self._ocupar(receita_id)
+                for ingrediente_id in ingrediente_ids:
+                    self.postagens[ingrediente_id] = self.postagens.get(ingrediente_id, 0) | bit
+                self.por_receita[receita_id] = frozenset(ingrediente_ids)
+            if self.versao is not None and versao == self.versao + 1:
+                self.versao = versao
+            else:
+                self.versao = None
+
+    def consultar(self, ingrediente_ids, limite=20):
+        """[(receita_id, quantos_ingredientes_cobertos)], melhores primeiro.
+
+        Empate: receitas com menos ingredientes no total vêm antes (faltam
+        menos coisas para comprar).
+        """
+        bitsets = [self.postagens.get(i, 0) for i in set(ingrediente_ids)]
+        alguma = 0
+        planos = []  # planos[n] = bit n do contador de cada receita
+        for bitset in bitsets:
+            alguma |= bitset
+            vai_um = bitset
+            for nivel, plano in enumerate(planos):
+                if not vai_um:
+                    break
+                planos[nivel], vai_um = plano ^ vai_um, plano & vai_um
+            if vai_um:
+                planos.append(vai_um)
+
+        resultado = []
+        maximo = min(len(bitsets), (1 << len(planos)) - 1)
+        for cobertos in range(maximo, 0, -1):
+            mascara = alguma
+            for nivel, plano in enumerate(planos):
+                mascara &= plano if (cobertos >> nivel) & 1 else ~plano
+            if not mascara:
+                continue
+            grupo = sorted((self.receitas[p] for p in _bits_ligados(mascara)),
+                           key=lambda r: (len(self.por_receita.get(r, ())), r))
+            for receita_id in grupo:
+                resultado.append((receita_id, cobertos))
+                if len(resultado) >= limite:
+                    return resultado
+        return resultado
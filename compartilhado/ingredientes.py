@@ -0,0 +1,73 @@
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+# ----------------- INGREDIENTES EM LOTE -----------------
+# Em vez de um SELECT por ingrediente, resolvemos a lista inteira com:
+#   1 SELECT ... WHERE nome IN (...)   -> os que já existem
+#   1 INSERT (executemany)             -> os que faltam
+#   1 SELECT ... WHERE nome IN (...)   -> ids dos recém-criados
+# Se duas requisições criarem o mesmo ingrediente ao mesmo tempo, o INSERT
+# ignora o conflito do UNIQUE(nome) e o segundo SELECT pega a linha da outra.
+# Cada app tem o próprio `db` e o próprio modelo Ingrediente: quem chama
+# passa a sessão e o modelo. A associação com a receita (e o que mais ela
+# atualiza, como os contadores do v2) fica no ingredientes.py de cada app.
+
+
+def sem_repetidos(pares):
+    """Um par por ingrediente (vale o primeiro): (receita, ingrediente) é único."""
+    unicos = {}
+    for nome, qtd in pares:
+        unicos.setdefault(nome, qtd)
+    return list(unicos.items())
+
+
+def interpretar_ingredientes(texto):
+    """'tomate:2, cebola:1' -> [('tomate', '2'), ('cebola', '1')]"""
+    pares = []
+    for par in texto.split(','):
+        par = par.strip()
+        if ':' in par:
+            nome, qtd = par.split(':', 1)
+            pares.append((nome.strip().lower(), qtd.strip()))
+    return sem_repetidos(pares)
+
+
+def inserir_ignorando_duplicados(sessao, tabela, nomes):
+    """INSERT de `nomes` em `tabela` (coluna nome UNIQUE) ignorando os que já existem."""
+    linhas = [{"nome": nome} for nome in nomes]
+    dialeto = sessao.get_bind().dialect.name
+
+    if dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+    elif dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+    else:
+        # Sem ON CONFLICT: um SAVEPOINT por linha para isolar o conflito
+        for linha in linhas:
+            try:
+                with sessao.begin_nested():
+                    sessao.execute(insert(tabela), [linha])
+            except IntegrityError:
+                pass
+        return
+
+    stmt = insert_dialeto(tabela).on_conflict_do_nothing(index_elements=["nome"])
+    sessao.execute(stmt, linhas)
+
+
+def resolver_ingredientes(sessao, modelo, nomes):
+    """Devolve {nome: instância de `modelo`}, criando os que ainda não existem."""
+    nomes = list(dict.fromkeys(nomes))
+    if not nomes:
+        return {}
+
+    encontrados = {
+        ing.nome: ing
+        for ing in sessao.scalars(select(modelo).where(modelo.nome.in_(nomes)))
+    }
+    faltando = [nome for nome in nomes if nome not in encontrados]
+    if faltando:
+        inserir_ignorando_duplicados(sessao, modelo.__table__, faltando)
+        for ing in sessao.scalars(select(modelo).where(modelo.nome.in_(faltando))):
+            encontrados[ing.nome] = ing
+    return encontrados
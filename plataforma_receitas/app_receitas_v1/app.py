@@ -1,30 +1,46 @@
 import os
+import sys
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 
 # Define o caminho base do projeto
 basedir = os.path.abspath(os.path.dirname(__file__))
 
+# compartilhado/ (banco.py, estaticos.py) fica na raiz do repositório, junto dos outros apps
+sys.path.append(os.path.abspath(os.path.join(basedir, '..', '..')))
+from compartilhado.banco import configurar_banco, registrar_pragmas
+
 # Cria a instância da aplicação Flask
 app = Flask(__name__)
 
 # Configurações da aplicação
-# Define o caminho para o nosso banco de dados SQLite
-app.config['SQLALCHEMY_DATABASE_URI'] = \
-    'sqlite:///' + os.path.join(basedir, 'instance', 'receitas.db')
+# Define o banco: DATABASE_URL do ambiente ou o nosso SQLite local
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'instance', 'receitas.db'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Pasta do build dos estáticos (padrão: instance/estaticos, ver compartilhado/estaticos.py)
+app.config['ESTATICOS_PASTA'] = os.environ.get('ESTATICOS_PASTA')
 
 # Cria a pasta 'instance' se ela não existir
 instance_path = os.path.join(basedir, 'instance')
 if not os.path.exists(instance_path):
     os.makedirs(instance_path)
 
-# Inicializa a extensão SQLAlchemy
+# Inicializa a extensão SQLAlchemy (com WAL/busy_timeout, ver compartilhado/banco.py)
+configurar_banco(app)
 db = SQLAlchemy(app)
+registrar_pragmas(app, db)
+
+# CSS com hash no nome, pré-comprimido e com cache immutable (depois do build)
+from compartilhado.estaticos import estaticos
+estaticos.init_app(app)
 
 # Importa os modelos DEPOIS de inicializar 'db'
 from flask import render_template, request, redirect, url_for
 from models import Chef, PerfilChef, Receita, Ingrediente, ReceitaIngrediente
+from ingredientes import associar_ingredientes
+from compartilhado.ingredientes import interpretar_ingredientes
 
 @app.route('/')
 def index():
@@ -43,26 +59,10 @@ def criar_receita():
         nova_receita = Receita(titulo=titulo, instrucoes=instrucoes, chef_id=chef_id)
         db.session.add(nova_receita)
 
-        # 3. Processa a string de ingredientes
-        ingredientes_str = request.form['ingredientes']
-        pares_ingredientes = [par.strip() for par in ingredientes_str.split(',') if par.strip()]
-        
-        for par in pares_ingredientes:
-            if ':' in par:
-                nome, qtd = par.split(':', 1)
-                nome_ingrediente = nome.strip().lower()
-                quantidade = qtd.strip()
-
-                # Encontra ou cria o ingrediente
-                ingrediente = Ingrediente.query.filter_by(nome=nome_ingrediente).first()
-                if not ingrediente:
-                    ingrediente = Ingrediente(nome=nome_ingrediente)
-                    db.session.add(ingrediente)
-                
-                # Cria a associação com a quantidade
-                associacao = ReceitaIngrediente(receita=nova_receita, ingrediente=ingrediente, quantidade=quantidade)
-                db.session.add(associacao)
-        
+        # 3. Processa a string de ingredientes (busca/cria todos de uma vez)
+        pares = interpretar_ingredientes(request.form['ingredientes'])
+        associar_ingredientes(nova_receita, pares)
+
         db.session.commit()
         return redirect(url_for('index'))
 
@@ -119,4 +119,13 @@ def init_db_command():
     ])
     
     db.session.commit()
-    print('Banco de dados inicializado com sucesso!')
\ No newline at end of file
+    click.echo('Banco de dados inicializado com sucesso!')
+
+@app.cli.command('construir-estaticos')
+def construir_estaticos_command():
+    """Minifica, versiona (hash no nome) e pré-comprime (gzip/brotli) os arquivos de static/."""
+    manifesto, com_brotli = estaticos.construir(app.static_folder)
+    for original, final in sorted(manifesto.items()):
+        click.echo(f"  {original} -> {final}", err=True)
+    click.echo(f"📦 {len(manifesto)} arquivos em {estaticos.pasta}"
+               + ("" if com_brotli else " (sem .br: `pip install brotli`)"), err=True)
@@ -0,0 +1,28 @@
+from sqlalchemy import insert
+
+from app import db
+from models import Ingrediente, ReceitaIngrediente
+from compartilhado.ingredientes import resolver_ingredientes, sem_repetidos
+
+# ----------------- INGREDIENTES EM LOTE -----------------
+# Busca/criação em lote e a leitura do formulário ficam em
+# compartilhado/ingredientes.py (iguais no v2). As associações com a receita
+# também vão num único INSERT (executemany).
+
+
+def associar_ingredientes(receita, pares):
+    """Cria as linhas de receita_ingredientes de `receita` num só INSERT."""
+    # receita_ingredientes tem PK (receita_id, ingrediente_id): um nome por receita
+    pares = sem_repetidos(pares)
+    if not pares:
+        return
+    ingredientes = resolver_ingredientes(db.session, Ingrediente, (nome for nome, _ in pares))
+    db.session.flush()  # garante receita.id
+    db.session.execute(insert(ReceitaIngrediente), [
+        {
+            "receita_id": receita.id,
+            "ingrediente_id": ingredientes[nome].id,
+            "quantidade": quantidade,
+        }
+        for nome, quantidade in pares
+    ])
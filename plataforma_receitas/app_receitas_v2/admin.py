@@ -0,0 +1,136 @@
+import hmac
+import os
+import tempfile
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request, send_file, stream_with_context
+from sqlalchemy import select
+
+from models import db, Chef, Ingrediente
+from auth import admin_required, carregar_usuario, eh_admin
+from aquecimento import aquecimento
+from compartilhado.banco import estatisticas_pool
+from fragmentos import fragmentos
+import exportacao
+from instrumentacao import instrumentacao
+from perfilador import perfilador, ENDPOINTS_PADRAO
+
+bp = Blueprint('admin', __name__)
+
+# ----------------- ESTATÍSTICAS -----------------
+@bp.route('/api/estatisticas/pool')
+@admin_required
+def api_estatisticas_pool():
+    return jsonify(estatisticas_pool(db.engine))
+
+
+@bp.route('/api/estatisticas/catalogo')
+@admin_required
+def api_estatisticas_catalogo():
+    """Chefs com mais receitas e ingredientes mais usados (lidos dos contadores)."""
+    limite = min(request.args.get("limite", 10, type=int), 100)
+    chefs = db.session.execute(
+        select(Chef.id, Chef.nome, Chef.total_receitas)
+        .order_by(Chef.total_receitas.desc()).limit(limite)
+    )
+    ingredientes = db.session.execute(
+        select(Ingrediente.id, Ingrediente.nome, Ingrediente.total_receitas)
+        .order_by(Ingrediente.total_receitas.desc()).limit(limite)
+    )
+    return jsonify(
+        chefs=[{"id": i, "nome": nome, "total_receitas": n} for i, nome, n in chefs],
+        ingredientes=[{"id": i, "nome": nome, "total_receitas": n} for i, nome, n in ingredientes],
+    )
+
+
+@bp.route('/api/estatisticas/fragmentos')
+@admin_required
+def api_estatisticas_fragmentos():
+    return jsonify(fragmentos.estatisticas())
+
+# ----------------- READINESS -----------------
+@bp.route('/pronto')
+def pronto():
+    """200 com o worker aquecido e o esquema em dia; 503 enquanto não (sem login: é do balanceador)."""
+    estado = aquecimento.verificar(current_app._get_current_object())
+    return jsonify(estado), 200 if estado["pronto"] else 503
+
+# ----------------- EXPORTAÇÃO -----------------
+@bp.route('/api/exportacao/receitas.<formato>')
+@admin_required
+def api_exportar_receitas(formato):
+    if formato not in exportacao.FORMATOS:
+        abort(404)
+    nome = f"receitas.{formato}"
+    lotes = exportacao.lotes_de_receitas()
+
+    if formato == "parquet":
+        # o parquet só fica válido depois do rodapé: monta num arquivo temporário
+        arquivo = tempfile.TemporaryFile()
+        try:
+            exportacao.escrever_parquet(lotes, arquivo)
+        except RuntimeError:
+            arquivo.close()
+            abort(501)
+        arquivo.seek(0)
+        return send_file(arquivo, mimetype=exportacao.TIPOS_MIME[formato],
+                         as_attachment=True, download_name=nome)
+
+    gerar = exportacao.gerar_csv if formato == "csv" else exportacao.gerar_ndjson
+    return Response(
+        stream_with_context(gerar(lotes)),
+        mimetype=exportacao.TIPOS_MIME[formato],
+        headers={"Content-Disposition": f"attachment; filename={nome}"},
+    )
+
+# ----------------- MÉTRICAS (Prometheus) -----------------
+def _pode_ler_metricas():
+    # O Prometheus não faz login: aceita o token do METRICAS_TOKEN
+    token = current_app.config.get("METRICAS_TOKEN")
+    enviado = request.headers.get("Authorization", "")
+    if token and hmac.compare_digest(enviado, f"Bearer {token}"):
+        return True
+    return eh_admin(carregar_usuario())
+
+
+@bp.route('/admin/metrics')
+def metricas_prometheus():
+    if not instrumentacao.ativa:
+        abort(404)
+    if not _pode_ler_metricas():
+        abort(403 if carregar_usuario() else 401)
+    return Response(instrumentacao.prometheus(), mimetype="text/plain; version=0.0.4")
+
+# ----------------- PERFILADOR -----------------
+@bp.route('/admin/perfilador', methods=['GET', 'POST', 'DELETE'])
+@admin_required
+def admin_perfilador():
+    """GET: estado. POST {"endpoints": [...], "porcentagem": 10}: liga. DELETE: desliga.
+
+    Vale para todos os workers que usam a mesma PERFILADOR_PASTA (controle.json
+    na pasta, relido por cada worker em até 1 s).
+    """
+    if request.method == 'POST':
+        dados = request.get_json(silent=True) or request.form
+        endpoints = dados.get("endpoints") or list(ENDPOINTS_PADRAO)
+        if isinstance(endpoints, str):
+            endpoints = [e.strip() for e in endpoints.split(",") if e.strip()]
+        desconhecidos = set(endpoints) - set(current_app.view_functions)
+        if desconhecidos:
+            return jsonify(erro=f"endpoints desconhecidos: {', '.join(sorted(desconhecidos))}"), 400
+        try:
+            perfilador.configurar(endpoints, dados.get("porcentagem", 100), dados.get("intervalo_ms"))
+        except (TypeError, ValueError):
+            return jsonify(erro="porcentagem/intervalo_ms inválidos"), 400
+    elif request.method == 'DELETE':
+        perfilador.desligar()
+    return jsonify(perfilador.estado())
+
+
+@bp.route('/admin/perfilador/<endpoint>.folded')
+@admin_required
+def admin_perfil_colapsado(endpoint):
+    caminho = os.path.join(perfilador.pasta, f"{endpoint}.folded")
+    if endpoint not in current_app.view_functions or not os.path.exists(caminho):
+        abort(404)
+    return send_file(caminho, mimetype="text/plain", as_attachment=True,
+                     download_name=f"{endpoint}.folded")
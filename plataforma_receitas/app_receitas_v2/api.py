@@ -0,0 +1,264 @@
+import json
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+
+from flask import Blueprint, Response, abort, jsonify, request, stream_with_context
+from werkzeug.exceptions import HTTPException
+
+from models import db, Chef, PerfilChef, Receita, Ingrediente, ReceitaIngrediente
+from auth import carregar_usuario
+from paginacao import paginar, decodificar_cursor
+
+bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+# ----------------- API JSON (v1) -----------------
+# Mesmo dado das páginas HTML, para o app mobile:
+#   GET /api/v1/receitas?fields=titulo,chef.nome&include=ingredientes&cursor=...
+#   GET /api/v1/receitas/<id>
+#   GET /api/v1/chefs?fields=nome,perfil.especialidade&include=receitas
+#   GET /api/v1/chefs/<id>
+#   GET /api/v1/ingredientes
+# `fields` escolhe as colunas: só elas entram no SELECT (e o JOIN com
+# chef/perfil só é feito se algum campo lido dessas tabelas for pedido). `include` traz as
+# coleções com uma consulta extra por página (WHERE ... IN ids).
+# Com ?formato=ndjson (ou Accept: application/x-ndjson) a coleção inteira é
+# enviada em streaming, uma linha JSON por item, lida do banco em lotes.
+
+LOTE_STREAMING = 500
+
+
+class Recurso:
+    def __init__(self, modelo, campos, padrao, joins=None, includes=None):
+        self.modelo = modelo
+        self.campos = campos        # "nome.publico" -> coluna
+        self.padrao = padrao        # campos quando ?fields= não é informado
+        self.joins = joins or {}    # prefixo -> (modelo, condição)
+        self.includes = includes or {}  # nome -> função(ids) -> SELECT (1ª coluna "dono")
+
+    def colunas(self, campos):
+        colunas = [self.modelo.id.label("id")]
+        colunas += [self.campos[c].label(c) for c in campos if c != "id"]
+        return colunas
+
+    def consulta(self, campos):
+        query = db.session.query(*self.colunas(campos)).select_from(self.modelo)
+        # o JOIN entra pela tabela de onde a coluna vem, não pelo nome do campo:
+        # "chef.id" é Receita.chef_id e não precisa da tabela chefs
+        lidos = {self.campos[c].class_ for c in campos}
+        for modelo, condicao in self.joins.values():
+            if modelo in lidos:
+                query = query.outerjoin(modelo, condicao)
+        return query
+
+
+def _ingredientes_das_receitas(ids):
+    return (
+        db.select(ReceitaIngrediente.receita_id.label("dono"), Ingrediente.id.label("id"),
+                  Ingrediente.nome.label("nome"), ReceitaIngrediente.quantidade.label("quantidade"))
+        .join(Ingrediente, ReceitaIngrediente.ingrediente_id == Ingrediente.id)
+        .where(ReceitaIngrediente.receita_id.in_(ids))
+        .order_by(ReceitaIngrediente.id)
+    )
+
+
+def _receitas_dos_chefs(ids):
+    return (
+        db.select(Receita.chef_id.label("dono"), Receita.id.label("id"), Receita.titulo.label("titulo"))
+        .where(Receita.chef_id.in_(ids))
+        .order_by(Receita.id)
+    )
+
+
+def agrupar(linhas):
+    """Linhas de um include -> {dono: [{coluna: valor, ...}]}."""
+    resultado = defaultdict(list)
+    for linha in linhas:
+        dono, *_ = linha
+        resultado[dono].append({k: v for k, v in linha._mapping.items() if k != "dono"})
+    return resultado
+
+
+RECURSOS = {
+    "receitas": Recurso(
+        Receita,
+        campos={
+            "id": Receita.id,
+            "titulo": Receita.titulo,
+            "instrucoes": Receita.instrucoes,
+            "versao": Receita.versao,
+            "atualizado_em": Receita.atualizado_em,
+            "total_ingredientes": Receita.total_ingredientes,
+            "chef.id": Receita.chef_id,
+            "chef.nome": Chef.nome,
+        },
+        padrao=["id", "titulo", "chef.id", "chef.nome"],
+        joins={"chef": (Chef, Receita.chef_id == Chef.id)},
+        includes={"ingredientes": _ingredientes_das_receitas},
+    ),
+    "chefs": Recurso(
+        Chef,
+        campos={
+            "id": Chef.id,
+            "nome": Chef.nome,
+            "versao": Chef.versao,
+            "atualizado_em": Chef.atualizado_em,
+            "total_receitas": Chef.total_receitas,
+            "perfil.especialidade": PerfilChef.especialidade,
+            "perfil.anos_experiencia": PerfilChef.anos_experiencia,
+        },
+        padrao=["id", "nome", "perfil.especialidade", "perfil.anos_experiencia"],
+        joins={"perfil": (PerfilChef, PerfilChef.chef_id == Chef.id)},
+        includes={"receitas": _receitas_dos_chefs},
+    ),
+    "ingredientes": Recurso(
+        Ingrediente,
+        campos={"id": Ingrediente.id, "nome": Ingrediente.nome,
+                "total_receitas": Ingrediente.total_receitas},
+        padrao=["id", "nome"],
+    ),
+}
+
+# ----------------- PARÂMETROS -----------------
+def _lista(parametro):
+    valor = request.args.get(parametro, "")
+    return [p.strip() for p in valor.split(",") if p.strip()]
+
+
+def _campos(recurso):
+    campos = _lista("fields") or recurso.padrao
+    desconhecidos = [c for c in campos if c not in recurso.campos]
+    if desconhecidos:
+        abort(400, description=f"Campos desconhecidos: {', '.join(desconhecidos)}")
+    return list(dict.fromkeys(campos))
+
+
+def _includes(recurso):
+    includes = _lista("include")
+    desconhecidos = [i for i in includes if i not in recurso.includes]
+    if desconhecidos:
+        abort(400, description=f"Include desconhecido: {', '.join(desconhecidos)}")
+    return includes
+
+
+def _quer_ndjson():
+    if request.args.get("formato") == "ndjson":
+        return True
+    melhor = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+    return melhor == "application/x-ndjson"
+
+# ----------------- SERIALIZAÇÃO -----------------
+def _valor(valor):
+    return valor.isoformat() if isinstance(valor, datetime) else valor
+
+
+def _montar(linha, campos):
+    """Row com rótulos "chef.nome" -> {"chef": {"nome": ...}}."""
+    mapa = linha._mapping
+    item = {}
+    for campo in campos:
+        destino = item
+        *caminho, nome = campo.split(".")
+        for parte in caminho:
+            destino = destino.setdefault(parte, {})
+        destino[nome] = _valor(mapa[campo])
+    return item
+
+
+def _serializar(recurso, linhas, campos, includes):
+    itens = [_montar(linha, campos) for linha in linhas]
+    if includes and linhas:
+        ids = [linha.id for linha in linhas]
+        for nome in includes:
+            anexar(linhas, itens, nome, agrupar(db.session.execute(recurso.includes[nome](ids))))
+    return itens
+
+
+def anexar(linhas, itens, nome, por_id):
+    for linha, item in zip(linhas, itens):
+        item[nome] = por_id.get(linha.id, [])
+
+# ----------------- AUTENTICAÇÃO / ERROS -----------------
+@bp.before_request
+def _exigir_login():
+    # API não redireciona para o formulário de login: responde 401
+    if carregar_usuario() is None:
+        return jsonify(erro="Não autenticado"), 401
+
+
+@bp.errorhandler(HTTPException)
+def _erro_json(erro):
+    return jsonify(erro=erro.description), erro.code
+
+
+# o 404 do app (página HTML) é por código e venceria o handler acima
+bp.register_error_handler(404, _erro_json)
+
+# ----------------- ROTAS -----------------
+def _colecao(nome):
+    recurso = RECURSOS[nome]
+    campos = _campos(recurso)
+    includes = _includes(recurso)
+    query = recurso.consulta(campos)
+
+    if _quer_ndjson():
+        return _streaming(recurso, query, campos, includes)
+
+    pagina = paginar(query, recurso.modelo.id)
+    return jsonify(
+        itens=_serializar(recurso, pagina.itens, campos, includes),
+        proximo=pagina.proximo,
+        anterior=pagina.anterior,
+        tamanho=pagina.tamanho,
+    )
+
+
+def _item(nome, item_id):
+    recurso = RECURSOS[nome]
+    campos = _campos(recurso)
+    linha = recurso.consulta(campos).filter(recurso.modelo.id == item_id).first()
+    if linha is None:
+        abort(404, description="Não encontrado")
+    return jsonify(_serializar(recurso, [linha], campos, _includes(recurso))[0])
+
+
+def _streaming(recurso, query, campos, includes):
+    """Envia a coleção inteira (a partir de ?cursor=, se houver) como NDJSON."""
+    cursor = request.args.get("cursor")
+    if cursor:
+        _, ultimo_id = decodificar_cursor(cursor)
+        query = query.filter(recurso.modelo.id > ultimo_id)
+    query = query.order_by(recurso.modelo.id).yield_per(LOTE_STREAMING)
+
+    def gerar():
+        linhas = iter(query)
+        while lote := list(islice(linhas, LOTE_STREAMING)):
+            for item in _serializar(recurso, lote, campos, includes):
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(gerar()), mimetype="application/x-ndjson")
+
+
+@bp.route('/receitas')
+def listar_receitas():
+    return _colecao("receitas")
+
+
+@bp.route('/receitas/<int:receita_id>')
+def obter_receita(receita_id):
+    return _item("receitas", receita_id)
+
+
+@bp.route('/chefs')
+def listar_chefs():
+    return _colecao("chefs")
+
+
+@bp.route('/chefs/<int:chef_id>')
+def obter_chef(chef_id):
+    return _item("chefs", chef_id)
+
+
+@bp.route('/ingredientes')
+def listar_ingredientes():
+    return _colecao("ingredientes")
@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import time
+
+from jinja2 import FileSystemBytecodeCache, TemplateError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+
+from models import db
+import consultas
+import migracoes
+
+# ----------------- AQUECIMENTO DO WORKER -----------------
+# Sem isto cada worker compila os templates (layout.html, index.html, ...) e
+# configura os mappers do ORM no primeiro request que usa cada um, e quem paga
+# é o usuário logo depois de um deploy/autoscale.
+#   - bytecode cache do Jinja em disco (JINJA_CACHE_PASTA, padrão
+#     instance/jinja): o template compilado por um processo vale para os
+#     outros e para o próximo deploy; o Jinja confere o checksum do fonte, então
+#     template editado é recompilado sozinho;
+#   - aquecer(): compila todos os templates (e grava o cache), configura os
+#     mappers e roda as consultas das listagens uma vez (cache de SQL
+#     compilado do SQLAlchemy + primeira conexão do pool);
+#   - AQUECER_NA_INICIALIZACAO (ligado em produção): create_app() só termina
+#     depois do aquecimento. No gunicorn sem --preload cada worker roda o
+#     create_app() antes de aceitar conexões, então só recebe tráfego quente;
+#   - GET /pronto (readiness do balanceador/orquestrador): 200 quando o
+#     processo está aquecido e sem migração pendente, 503 enquanto não.
+# `flask warmup` faz o mesmo no deploy, antes de subir os workers, e deixa o
+# cache em disco pronto para todos eles.
+
+logger = logging.getLogger("receitas.aquecimento")
+
+
+class Aquecimento:
+    def __init__(self):
+        self.aquecido = False
+        self.detalhes = {}
+        self.pendentes = []
+        self._trava = threading.Lock()
+
+    def init_app(self, app):
+        pasta = app.config.get("JINJA_CACHE_PASTA")
+        if pasta is None:
+            pasta = os.path.join(app.instance_path, "jinja")
+        if pasta:  # "" desliga o cache em disco
+            os.makedirs(pasta, exist_ok=True)
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(pasta)
+        if app.config.get("AQUECER_NA_INICIALIZACAO"):
+            self.aquecer(app)
+
+    @property
+    def pronto(self):
+        return self.aquecido and not self.pendentes
+
+    def aquecer(self, app):
+        """Compila templates, configura mappers e roda as consultas quentes."""
+        with self._trava:
+            marcas = [time.perf_counter()]
+            templates, templates_com_erro = self._compilar_templates(app)
+            marcas.append(time.perf_counter())
+            with app.app_context():
+                configure_mappers()
+                marcas.append(time.perf_counter())
+                erro = None
+                try:
+                    for query in (consultas.receitas_com_chef(), consultas.chefs_com_perfil()):
+                        query.limit(1).all()
+                    self.pendentes = [m.id for m in migracoes.pendentes(db.session.connection())]
+                except SQLAlchemyError as e:
+                    # banco fora do ar ou ainda sem tabelas (flask init-db/migrar
+                    # também passam por aqui): sobe frio, o /pronto tenta de novo
+                    erro = str(e.orig if getattr(e, "orig", None) else e)
+                    logger.warning("aquecimento sem banco: %s", erro)
+                finally:
+                    db.session.remove()
+                marcas.append(time.perf_counter())
+            ms = [round((depois - antes) * 1000, 1) for antes, depois in zip(marcas, marcas[1:])]
+            self.detalhes = {
+                "templates": templates,
+                "templates_ms": ms[0],
+                "mappers_ms": ms[1],
+                "consultas_ms": ms[2],
+                "total_ms": round(sum(ms), 1),
+            }
+            if templates_com_erro:
+                self.detalhes["templates_com_erro"] = templates_com_erro
+            if erro:
+                self.detalhes["erro"] = erro
+            self.aquecido = erro is None
+            logger.info("worker %s aquecido: %s", os.getpid(), self.detalhes)
+            return self.detalhes
+
+    def verificar(self, app):
+        """Estado para o /pronto; refaz a checagem de migrações enquanto não estiver pronto."""
+        if not self.aquecido:
+            self.aquecer(app)
+        elif self.pendentes:
+            self.pendentes = [m.id for m in migracoes.pendentes(db.session.connection())]
+        return {"pronto": self.pronto, "pid": os.getpid(), "migracoes_pendentes": self.pendentes,
+                **self.detalhes}
+
+    def _compilar_templates(self, app):
+        ambiente = app.jinja_env
+        compilados, erros = 0, {}
+        for nome in ambiente.list_templates():
+            try:
+                ambiente.get_template(nome)  # compila (ou lê do bytecode cache) e guarda em memória
+                compilados += 1
+            except TemplateError as erro:
+                # template quebrado que nenhuma view usa não deve derrubar o worker;
+                # o que alguma view usa quebra no request de qualquer jeito
+                erros[nome] = str(erro)
+                logger.warning("template %s não compila: %s", nome, erro)
+        return compilados, erros
+
+
+aquecimento = Aquecimento()
@@ -0,0 +1,11 @@
+"""Entrada ASGI opcional (rotas de leitura assíncronas, ver rotas_assincronas.py).
+
+    pip install "flask[async]" aiosqlite uvicorn
+    uvicorn asgi:app --workers 4
+
+O gunicorn com "app:create_app()" continua sendo o modo padrão.
+"""
+from app import create_app
+from rotas_assincronas import criar_asgi
+
+app = criar_asgi(create_app())
@@ -0,0 +1,148 @@
+from collections import namedtuple
+
+from flask import Blueprint, abort, current_app, render_template, request, redirect, url_for, session, flash, g
+from werkzeug.local import LocalProxy
+
+from models import db, Usuario
+from cache import CacheLRU
+import notificacoes
+
+bp = Blueprint('auth', __name__)
+
+# ----------------- USUÁRIO ATUAL -----------------
+# O usuário logado é resolvido uma vez por request (em g) e fica num cache
+# LRU com TTL por nome de usuário, então páginas autenticadas não fazem
+# consulta nenhuma só para saber quem é o usuário. Guardamos uma cópia
+# simples (não o objeto do ORM, que pertence à sessão de outro request).
+UsuarioAtual = namedtuple('UsuarioAtual', 'id usuario')
+
+cache_usuarios = CacheLRU(tamanho=1024, ttl=60)
+
+
+@bp.record_once
+def _configurar_cache(state):
+    cache_usuarios.tamanho = state.app.config.get('USUARIO_CACHE_TAMANHO', 1024)
+    cache_usuarios.ttl = state.app.config.get('USUARIO_CACHE_TTL', 60)
+
+
+def carregar_usuario():
+    if 'usuario_atual' in g:
+        return g.usuario_atual
+
+    nome = session.get('usuario')
+    usuario = None
+    if nome:
+        usuario = cache_usuarios.get(nome)
+        if usuario is None:
+            registro = Usuario.query.filter_by(usuario=nome).first()
+            if registro:
+                usuario = UsuarioAtual(registro.id, registro.usuario)
+                cache_usuarios.set(nome, usuario)
+    g.usuario_atual = usuario
+    return usuario
+
+
+current_user = LocalProxy(carregar_usuario)
+
+
+@bp.app_context_processor
+def _injetar_usuario():
+    return {'current_user': current_user}
+
+# ----------------- PROTEÇÃO -----------------
+def login_required(func):
+    def wrapper(*args, **kwargs):
+        if carregar_usuario() is None:
+            # sem sessão, ou o usuário da sessão não existe mais
+            session.pop('usuario', None)
+            return redirect(url_for('auth.login'))
+        # ensure_sync: também protege views `async def` (rotas_assincronas.py)
+        return current_app.ensure_sync(func)(*args, **kwargs)
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+def eh_admin(usuario):
+    return usuario is not None and usuario.usuario in current_app.config.get('ADMINS', ())
+
+
+def admin_required(func):
+    """login_required + usuário em ADMINS (403 para os demais)."""
+    @login_required
+    def wrapper(*args, **kwargs):
+        if not eh_admin(carregar_usuario()):
+            abort(403)
+        return current_app.ensure_sync(func)(*args, **kwargs)
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+# ----------------- LOGIN/LOGOUT -----------------
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        usuario_nome = request.form['usuario']
+        senha = request.form['senha']
+
+        usuario = Usuario.query.filter_by(usuario=usuario_nome).first()
+
+        if usuario and usuario.check_password(senha):
+            # Custo do hash mudou desde o último login: regrava com o atual
+            if usuario.precisa_rehash():
+                usuario.set_password(senha)
+                db.session.commit()
+            session['usuario'] = usuario.usuario
+            flash("Login realizado com sucesso!", "success")
+            return redirect(url_for('receitas.index'))
+        else:
+            flash("Usuário ou senha incorretos!", "danger")
+
+    return render_template('login.html')
+
+@bp.route('/logout')
+def logout():
+    session.pop('usuario', None)
+    flash("Você saiu do sistema.", "info")
+    return redirect(url_for('auth.login'))
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        usuario_nome = request.form['usuario']
+        senha = request.form['senha']
+
+        if Usuario.query.filter_by(usuario=usuario_nome).first():
+            flash("Usuário já existe!", "warning")
+            return redirect(url_for('auth.register'))
+
+        # o hash fica no request (senha em texto não vai para a fila); ele já
+        # roda no pool de processos de senhas.py, fora do worker
+        novo_usuario = Usuario(usuario=usuario_nome)
+        novo_usuario.set_password(senha)
+        db.session.add(novo_usuario)
+        db.session.flush()
+        notificacoes.notificar(
+            db.session.connection(), "usuario.registrado",
+            {"id": novo_usuario.id, "usuario": usuario_nome},
+            chave=f"usuario-registrado:{novo_usuario.id}",
+        )
+        db.session.commit()
+
+        flash("Usuário criado com sucesso! Agora faça login.", "success")
+        return redirect(url_for('auth.login'))
+
+    return render_template('register.html')
+
+@bp.route('/perfil', methods=['GET', 'POST'])
+@login_required
+def perfil():
+    if request.method == 'POST':
+        nova_senha = request.form['senha']
+        if nova_senha:
+            usuario = db.session.get(Usuario, current_user.id)
+            usuario.set_password(nova_senha)
+            db.session.commit()
+            cache_usuarios.delete(usuario.usuario)
+            flash("Senha alterada com sucesso!", "success")
+        return redirect(url_for('auth.perfil'))
+
+    return render_template('perfil.html', usuario=current_user)
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from compartilhado.banco import PRAGMAS_PADRAO, opcoes_do_pool
+
+# ----------------- ENGINE ASSÍNCRONO (modo ASGI) -----------------
+# Usado só pelas rotas de rotas_assincronas.py. O Flask roda cada view
+# `async def` num event loop próprio, criado e fechado a cada request; um
+# pool de conexões assíncronas preso a esse loop não sobreviveria ao request.
+# Por isso o engine vive num único loop por processo, numa thread dedicada,
+# e as views mandam o trabalho para lá (run_coroutine_threadsafe): o pool é
+# reaproveitado entre requests e consultas independentes de um mesmo request
+# rodam em paralelo, cada uma na sua conexão.
+#   ASSINCRONO_URL   padrão: o mesmo banco do app, com sqlite+aiosqlite ou
+#                    postgresql+asyncpg
+# Precisa de `pip install aiosqlite` (ou asyncpg no PostgreSQL).
+
+DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def url_assincrona(url):
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in DRIVERS:
+        raise RuntimeError(f"Sem driver assíncrono para '{backend}': defina ASSINCRONO_URL.")
+    return url.set(drivername=DRIVERS[backend])
+
+
+class BancoAssincrono:
+    def __init__(self):
+        self.url = None
+        self.opcoes = {}
+        self.pragmas = {}
+        self._engine = None
+        self._laco = None
+        self._pid = None
+        self._trava = threading.Lock()
+
+    def init_app(self, app):
+        self.url = app.config.get("ASSINCRONO_URL") or url_assincrona(app.config["SQLALCHEMY_DATABASE_URI"])
+        # PoolMedido é um QueuePool síncrono; o engine assíncrono usa o dele
+        self.opcoes = {k: v for k, v in opcoes_do_pool(app.config).items() if k != "poolclass"}
+        self.pragmas = {**PRAGMAS_PADRAO, **app.config.get("SQLITE_PRAGMAS", {})}
+
+    def _iniciar(self):
+        with self._trava:
+            # depois de um fork (workers do uvicorn) o loop/thread do pai não existe
+            if self._engine is not None and self._pid == os.getpid():
+                return
+            try:
+                from sqlalchemy.ext.asyncio import create_async_engine
+            except ImportError:
+                raise RuntimeError("O modo assíncrono requer `pip install aiosqlite greenlet`.")
+            engine = create_async_engine(self.url, **self.opcoes)
+            if engine.dialect.name == "sqlite":
+                event.listen(engine.sync_engine, "connect", self._aplicar_pragmas)
+            laco = asyncio.new_event_loop()
+            threading.Thread(target=laco.run_forever, name="banco-assincrono", daemon=True).start()
+            self._engine, self._laco, self._pid = engine, laco, os.getpid()
+
+    def _aplicar_pragmas(self, conexao_dbapi, registro):
+        cursor = conexao_dbapi.cursor()
+        for nome, valor in self.pragmas.items():
+            cursor.execute(f"PRAGMA {nome} = {valor}")
+        cursor.close()
+
+    async def executar(self, funcao):
+        """`await funcao(sessao)` no loop do banco, com uma AsyncSession só para ela."""
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        self._iniciar()
+
+        async def rodar():
+            # expire_on_commit=False: os objetos saem da sessão para o template
+            async with AsyncSession(self._engine, expire_on_commit=False) as sessao:
+                return await funcao(sessao)
+
+        futuro = asyncio.run_coroutine_threadsafe(rodar(), self._laco)
+        return await asyncio.wrap_future(futuro)
+
+    async def todas(self, consulta, escalares=False):
+        """Todas as linhas de `consulta` (Select ou Query do Flask-SQLAlchemy)."""
+        consulta = getattr(consulta, "statement", consulta)
+
+        async def ler(sessao):
+            resultado = await sessao.execute(consulta)
+            return resultado.scalars().all() if escalares else resultado.all()
+
+        return await self.executar(ler)
+
+
+banco_assincrono = BancoAssincrono()
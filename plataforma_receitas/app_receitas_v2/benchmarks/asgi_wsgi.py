@@ -0,0 +1,185 @@
+"""Throughput e latência das rotas de leitura: WSGI (threads) x ASGI (uvicorn).
+
+Monta o mesmo banco sintético do carga.py e sobe, um de cada vez, num único
+processo:
+  wsgi   servidor werkzeug com uma thread por conexão (como um worker gthread)
+  asgi   uvicorn + asgi.py: rotas de rotas_assincronas.py, ASGI_THREADS threads
+Para cada nível de concorrência (clientes HTTP simultâneos, com keep-alive
+desligado como no carga.py) mede req/s, p50 e p95 das rotas que têm versão
+assíncrona.
+
+Requer `pip install "flask[async]" aiosqlite uvicorn`.
+
+Uso (dentro de app_receitas_v2):
+    python benchmarks/asgi_wsgi.py --niveis 1,8,32 --requisicoes 300
+    python benchmarks/asgi_wsgi.py --salvar asgi.json
+    python benchmarks/asgi_wsgi.py --comparar asgi.json --tolerancia 20
+O --comparar sai com código 1 se o p95 de alguma rota/modo/nível piorou mais
+de `tolerancia`%.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import socket
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APP_CONFIG", "teste")
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from app import create_app  # noqa: E402
+from carga import abridor_logado, medir_http, montar_rotas, percentis, preparar_app  # noqa: E402
+from rotas_assincronas import criar_asgi  # noqa: E402
+
+# nomes de carga.montar_rotas com versão em rotas_assincronas.ROTAS
+ROTAS = (
+    "index", "index_pagina_2", "chefs", "detalhes_chef", "busca", "api_busca",
+    "api_v1_receitas", "api_v1_receitas_include", "api_v1_receita",
+    "api_v1_chefs", "api_v1_chef", "api_v1_ingredientes",
+)
+
+
+class ServidorWSGI:
+    def __init__(self, threads):
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        self._servidor = make_server("127.0.0.1", 0, create_app("teste"), threaded=True)
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self._servidor.server_port}"
+
+    def parar(self):
+        self._servidor.shutdown()
+
+
+class ServidorASGI:
+    def __init__(self, threads):
+        import uvicorn
+
+        app = create_app("teste")
+        app.config["ASGI_THREADS"] = threads
+        self._servidor = uvicorn.Server(uvicorn.Config(
+            criar_asgi(app), log_level="error", lifespan="on", access_log=False))
+        soquete = socket.socket()
+        soquete.bind(("127.0.0.1", 0))
+        self.base = f"http://127.0.0.1:{soquete.getsockname()[1]}"
+        self._thread = threading.Thread(target=self._servidor.run, kwargs={"sockets": [soquete]}, daemon=True)
+        self._thread.start()
+        while not self._servidor.started:
+            time.sleep(0.05)
+
+    def parar(self):
+        self._servidor.should_exit = True
+        self._thread.join()
+
+
+SERVIDORES = {"wsgi": ServidorWSGI, "asgi": ServidorASGI}
+
+
+def rodar(args):
+    app = preparar_app(args.chefs, args.receitas, args.ingredientes, args.semente)
+    rotas = [(nome, url) for nome, url in montar_rotas(app) if nome in ROTAS]
+    niveis = [int(n) for n in args.niveis.split(",")]
+    sem_contagem = SimpleNamespace(total=0)  # SQL/req é assunto do carga.py
+
+    resultado = {
+        "meta": {
+            "niveis": niveis,
+            "requisicoes_por_rota": args.requisicoes,
+            "threads_asgi": args.threads,
+            "dados": {"chefs": args.chefs, "receitas": args.receitas,
+                      "ingredientes": args.ingredientes, "semente": args.semente},
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quando": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "modos": {},
+    }
+    for modo in args.modos.split(","):
+        servidor = SERVIDORES[modo](args.threads)
+        try:
+            por_nivel = resultado["modos"][modo] = {}
+            for nivel in niveis:
+                abridores = [abridor_logado(servidor.base) for _ in range(nivel)]
+                por_rota = por_nivel[str(nivel)] = {}
+                for nome, url in rotas:
+                    inicio = time.perf_counter()
+                    tempos, _, status, _ = medir_http(
+                        servidor.base, abridores, url, args.requisicoes, args.aquecimento, sem_contagem)
+                    duracao = time.perf_counter() - inicio
+                    por_rota[nome] = {
+                        **percentis(tempos),
+                        "requisicoes_por_s": round(len(tempos) / duracao, 1),
+                        "status": sorted(status),
+                    }
+        finally:
+            servidor.parar()
+    return resultado
+
+
+def imprimir(resultado):
+    modos = list(resultado["modos"])
+    cabecalho = "".join(f"{m + ' req/s':>13}{m + ' p95':>11}" for m in modos)
+    for nivel in map(str, resultado["meta"]["niveis"]):
+        print(f"\nconcorrência {nivel}")
+        print(f"{'rota':<26}{cabecalho}")
+        for nome in resultado["modos"][modos[0]][nivel]:
+            colunas = ""
+            for modo in modos:
+                dados = resultado["modos"][modo][nivel][nome]
+                colunas += f"{dados['requisicoes_por_s']:>13.1f}{dados['p95_ms']:>11.2f}"
+            print(f"{nome:<26}{colunas}")
+
+
+def comparar(resultado, referencia, tolerancia):
+    for chave in ("niveis", "requisicoes_por_rota", "threads_asgi", "dados"):
+        if resultado["meta"][chave] != referencia["meta"].get(chave):
+            print(f"aviso: '{chave}' diferente da referência "
+                  f"({referencia['meta'].get(chave)} -> {resultado['meta'][chave]}); números não são comparáveis")
+    piorou = False
+    for modo, por_nivel in resultado["modos"].items():
+        for nivel, por_rota in por_nivel.items():
+            for nome, dados in por_rota.items():
+                antes = referencia["modos"].get(modo, {}).get(nivel, {}).get(nome)
+                if not antes:
+                    continue
+                variacao = (dados["p95_ms"] - antes["p95_ms"]) / antes["p95_ms"] * 100 if antes["p95_ms"] else 0
+                marca = " <-- piorou" if variacao > tolerancia else ""
+                print(f"{modo:<5} c={nivel:<4}{nome:<26} p95 {antes['p95_ms']:.2f} -> {dados['p95_ms']:.2f} ms "
+                      f"({variacao:+.1f}%){marca}")
+                piorou |= bool(marca)
+    return piorou
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modos", default="wsgi,asgi")
+    parser.add_argument("--niveis", default="1,8,32", help="clientes simultâneos")
+    parser.add_argument("--requisicoes", type=int, default=300, help="por rota e nível")
+    parser.add_argument("--aquecimento", type=int, default=5, help="requests descartados por rota")
+    parser.add_argument("--threads", type=int, default=32, help="ASGI_THREADS do modo asgi")
+    parser.add_argument("--chefs", type=int, default=200)
+    parser.add_argument("--receitas", type=int, default=20000)
+    parser.add_argument("--ingredientes", type=int, default=800)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--salvar")
+    parser.add_argument("--comparar")
+    parser.add_argument("--tolerancia", type=float, default=20.0, help="%% de piora aceita no p95")
+    args = parser.parse_args()
+
+    resultado = rodar(args)
+    imprimir(resultado)
+
+    if args.salvar:
+        with open(args.salvar, "w") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            referencia = json.load(arquivo)
+        sys.exit(1 if comparar(resultado, referencia, args.tolerancia) else 0)
@@ -0,0 +1,287 @@
+"""Latência (p50/p95/p99) e consultas por request de cada rota do app_receitas_v2.
+
+Monta um banco sintético (dados_sinteticos.py, sempre a mesma semente) e mede
+as rotas GET uma de cada vez:
+  --modo cliente   Flask test client no próprio processo (sem rede/servidor)
+  --modo http      servidor werkzeug com threads + N clientes HTTP simultâneos
+
+Uso (dentro de app_receitas_v2):
+    python benchmarks/carga.py --receitas 20000 --requisicoes 200
+    python benchmarks/carga.py --modo http --concorrencia 8 --salvar base.json
+    python benchmarks/carga.py --comparar base.json --tolerancia 20
+O --comparar sai com código 1 se o p95 de alguma rota piorou mais de
+`tolerancia`% ou se alguma rota passou a fazer mais consultas por request.
+"""
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APP_CONFIG", "teste")
+
+from sqlalchemy import event, func, select  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from app import create_app  # noqa: E402
+from models import db, Receita  # noqa: E402
+import dados_sinteticos  # noqa: E402
+import importacao  # noqa: E402
+
+
+def preparar_app(chefs, receitas, ingredientes, semente):
+    os.environ["DATABASE_URL_TESTE"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "carga.db")
+    app = create_app("teste")
+    resultado = app.test_cli_runner().invoke(args=["init-db"])
+    assert resultado.exit_code == 0, resultado.output
+    with app.app_context():
+        importacao.Importador().importar(
+            dados_sinteticos.gerar_receitas(semente, chefs, receitas, ingredientes))
+        db.session.commit()
+    return app
+
+
+def montar_rotas(app):
+    """[(nome, url)] com ids reais do banco (o chef com mais receitas etc.)."""
+    with app.app_context():
+        chef_id = db.session.execute(
+            select(Receita.chef_id).group_by(Receita.chef_id)
+            .order_by(func.count().desc()).limit(1)
+        ).scalar()
+        maior_id = db.session.execute(select(func.max(Receita.id))).scalar()
+        receita_id = maior_id // 2 or 1
+        cursor = app.test_client()  # só para descobrir o cursor da 2ª página
+        cursor.post("/login", data={"usuario": "admin", "senha": "admin"})
+        segunda = cursor.get("/api/v1/receitas").get_json()["proximo"]
+        db.session.remove()
+
+    return [
+        ("index", "/"),
+        ("index_pagina_2", f"/?cursor={segunda}"),
+        ("chefs", "/chefs"),
+        ("detalhes_chef", f"/chef/{chef_id}"),
+        ("editar_chef", f"/chef/editar/{chef_id}"),
+        ("nova_receita", "/receita/nova"),
+        ("editar_receita", f"/receita/editar/{receita_id}"),
+        ("busca", "/busca?q=bolo+cenoura"),
+        ("api_busca", "/api/busca?q=risoto"),
+        ("api_com_ingredientes", "/api/receitas/com-ingredientes?ingredientes=tomate,cebola,alho"),
+        ("api_v1_receitas", "/api/v1/receitas"),
+        ("api_v1_receitas_include", "/api/v1/receitas?fields=titulo,chef.nome&include=ingredientes"),
+        ("api_v1_receita", f"/api/v1/receitas/{receita_id}"),
+        ("api_v1_chefs", "/api/v1/chefs?include=receitas"),
+        ("api_v1_chef", f"/api/v1/chefs/{chef_id}"),
+        ("api_v1_ingredientes", "/api/v1/ingredientes"),
+        ("perfil", "/perfil"),
+        ("estatisticas_pool", "/api/estatisticas/pool"),
+        ("login_form", "/login"),
+    ]
+
+
+class ContadorSQL:
+    def __init__(self, engine):
+        self.total = 0
+        self._trava = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, *args):
+        with self._trava:
+            self.total += 1
+
+
+def percentis(amostras):
+    ordenadas = sorted(amostras)
+    cortes = statistics.quantiles(ordenadas, n=100, method="inclusive") if len(ordenadas) > 1 else ordenadas * 99
+    return {
+        "p50_ms": round(cortes[49] * 1000, 2),
+        "p95_ms": round(cortes[94] * 1000, 2),
+        "p99_ms": round(cortes[98] * 1000, 2),
+        "media_ms": round(statistics.fmean(ordenadas) * 1000, 2),
+    }
+
+# ----------------- MODO CLIENTE (test client) -----------------
+def medir_cliente(app, url, requisicoes, aquecimento, contador):
+    cliente = app.test_client()
+    cliente.post("/login", data={"usuario": "admin", "senha": "admin"})
+    for _ in range(aquecimento):
+        cliente.get(url)
+    tempos, status, tamanho = [], set(), 0
+    antes = contador.total
+    for _ in range(requisicoes):
+        inicio = time.perf_counter()
+        resposta = cliente.get(url)
+        corpo = resposta.get_data()
+        tempos.append(time.perf_counter() - inicio)
+        status.add(resposta.status_code)
+        tamanho = len(corpo)
+    return tempos, (contador.total - antes) / requisicoes, status, tamanho
+
+# ----------------- MODO HTTP (servidor com threads) -----------------
+class SemRedirecionar(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def abridor_logado(base):
+    abridor = urllib.request.build_opener(
+        urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), SemRedirecionar)
+    dados = urllib.parse.urlencode({"usuario": "admin", "senha": "admin"}).encode()
+    try:
+        abridor.open(base + "/login", dados)
+    except urllib.error.HTTPError as erro:  # 302 depois do login
+        if erro.code != 302:
+            raise
+    return abridor
+
+
+def _pedir(abridor, url):
+    try:
+        with abridor.open(url) as resposta:
+            return resposta.status, len(resposta.read())
+    except urllib.error.HTTPError as erro:
+        return erro.code, len(erro.read())
+
+
+def medir_http(base, abridores, url, requisicoes, aquecimento, contador):
+    for _ in range(aquecimento):
+        _pedir(abridores[0], base + url)
+    tempos, status, tamanhos = [], set(), []
+    trava = threading.Lock()
+    restantes = iter(range(requisicoes))
+
+    def cliente(abridor):
+        while True:
+            with trava:
+                if next(restantes, None) is None:
+                    return
+            inicio = time.perf_counter()
+            codigo, tamanho = _pedir(abridor, base + url)
+            decorrido = time.perf_counter() - inicio
+            with trava:
+                tempos.append(decorrido)
+                status.add(codigo)
+                tamanhos.append(tamanho)
+
+    antes = contador.total
+    threads = [threading.Thread(target=cliente, args=(a,)) for a in abridores]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return tempos, (contador.total - antes) / requisicoes, status, tamanhos[-1]
+
+# ----------------- EXECUÇÃO / COMPARAÇÃO -----------------
+def rodar(args):
+    app = preparar_app(args.chefs, args.receitas, args.ingredientes, args.semente)
+    rotas = montar_rotas(app)
+    with app.app_context():
+        contador = ContadorSQL(db.engine)
+
+    servidor = None
+    if args.modo == "http":
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        servidor = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{servidor.server_port}"
+        abridores = [abridor_logado(base) for _ in range(args.concorrencia)]
+
+    resultado = {
+        "meta": {
+            "modo": args.modo,
+            "concorrencia": args.concorrencia if args.modo == "http" else 1,
+            "requisicoes_por_rota": args.requisicoes,
+            "dados": {"chefs": args.chefs, "receitas": args.receitas,
+                      "ingredientes": args.ingredientes, "semente": args.semente},
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quando": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "rotas": {},
+    }
+    try:
+        for nome, url in rotas:
+            inicio = time.perf_counter()
+            if servidor:
+                tempos, consultas, status, tamanho = medir_http(
+                    base, abridores, url, args.requisicoes, args.aquecimento, contador)
+            else:
+                tempos, consultas, status, tamanho = medir_cliente(
+                    app, url, args.requisicoes, args.aquecimento, contador)
+            duracao = time.perf_counter() - inicio
+            resultado["rotas"][nome] = {
+                "url": url,
+                **percentis(tempos),
+                "requisicoes_por_s": round(len(tempos) / duracao, 1),
+                "consultas_por_request": round(consultas, 2),
+                "bytes": tamanho,
+                "status": sorted(status),
+            }
+    finally:
+        if servidor:
+            servidor.shutdown()
+    return resultado
+
+
+def imprimir(resultado):
+    print(f"{'rota':<26}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}{'SQL/req':>9}  status")
+    for nome, dados in resultado["rotas"].items():
+        print(f"{nome:<26}{dados['p50_ms']:>9.2f}{dados['p95_ms']:>9.2f}{dados['p99_ms']:>9.2f}"
+              f"{dados['requisicoes_por_s']:>9.1f}{dados['consultas_por_request']:>9.2f}  {dados['status']}")
+
+
+def comparar(resultado, referencia, tolerancia):
+    for chave in ("modo", "concorrencia", "requisicoes_por_rota", "dados"):
+        if resultado["meta"][chave] != referencia["meta"].get(chave):
+            print(f"aviso: '{chave}' diferente da referência "
+                  f"({referencia['meta'].get(chave)} -> {resultado['meta'][chave]}); números não são comparáveis")
+    piorou = False
+    for nome, dados in resultado["rotas"].items():
+        antes = referencia["rotas"].get(nome)
+        if not antes:
+            continue
+        variacao = (dados["p95_ms"] - antes["p95_ms"]) / antes["p95_ms"] * 100 if antes["p95_ms"] else 0
+        mais_sql = dados["consultas_por_request"] > antes["consultas_por_request"]
+        marca = " <-- piorou" if variacao > tolerancia or mais_sql else ""
+        print(f"{nome:<26} p95 {antes['p95_ms']:.2f} -> {dados['p95_ms']:.2f} ms ({variacao:+.1f}%), "
+              f"SQL/req {antes['consultas_por_request']} -> {dados['consultas_por_request']}{marca}")
+        piorou |= bool(marca)
+    return piorou
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modo", choices=["cliente", "http"], default="cliente")
+    parser.add_argument("--concorrencia", type=int, default=4)
+    parser.add_argument("--requisicoes", type=int, default=200, help="por rota")
+    parser.add_argument("--aquecimento", type=int, default=5, help="requests descartados por rota")
+    parser.add_argument("--chefs", type=int, default=200)
+    parser.add_argument("--receitas", type=int, default=20000)
+    parser.add_argument("--ingredientes", type=int, default=800)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--salvar")
+    parser.add_argument("--comparar")
+    parser.add_argument("--tolerancia", type=float, default=20.0, help="%% de piora aceita no p95")
+    args = parser.parse_args()
+
+    resultado = rodar(args)
+    imprimir(resultado)
+
+    if args.salvar:
+        with open(args.salvar, "w") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            referencia = json.load(arquivo)
+        sys.exit(1 if comparar(resultado, referencia, args.tolerancia) else 0)
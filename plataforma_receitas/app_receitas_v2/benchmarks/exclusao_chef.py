@@ -0,0 +1,181 @@
+"""Tempo para excluir um chef com muitas receitas (padrão: 10 mil).
+
+Monta um banco sintético onde um chef tem `--receitas` receitas (mais um
+catálogo de fundo) e exclui esse chef de duas formas, cada uma partindo do
+mesmo banco intacto:
+  cascata   o que o app faz: um DELETE do chef, o banco apaga perfil,
+            receitas e associações (ON DELETE CASCADE + passive_deletes)
+  orm       como era antes: o ORM carrega cada receita e cada associação
+            e apaga uma linha por vez
+Enquanto a exclusão roda, outra conexão tenta escrever a cada 5 ms; a maior
+espera dela mostra quanto tempo o lock de escrita do SQLite ficou preso.
+
+Uso (dentro de app_receitas_v2):
+    python benchmarks/exclusao_chef.py --receitas 10000
+    python benchmarks/exclusao_chef.py --salvar base.json
+    python benchmarks/exclusao_chef.py --comparar base.json --tolerancia 20
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APP_CONFIG", "teste")
+
+from sqlalchemy import select, text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from models import db, Chef  # noqa: E402
+import contadores  # noqa: E402
+import dados_sinteticos  # noqa: E402
+import importacao  # noqa: E402
+
+CHEF = "Chef Prolífico"
+
+
+def montar_base(pasta, receitas, fundo, semente):
+    """App apontando para pasta/trabalho.db + uma cópia intacta em pasta/base.db."""
+    trabalho = os.path.join(pasta, "trabalho.db")
+    os.environ["DATABASE_URL_TESTE"] = "sqlite:///" + trabalho
+    app = create_app("teste")
+    resultado = app.test_cli_runner().invoke(args=["init-db"])
+    assert resultado.exit_code == 0, resultado.output
+    do_chef = ({**r, "chef": CHEF} for r in dados_sinteticos.gerar_receitas(semente, 1, receitas, 500))
+    with app.app_context():
+        importacao.Importador().importar(do_chef)
+        importacao.Importador().importar(dados_sinteticos.gerar_receitas(semente + 1, 200, fundo, 500))
+        db.session.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        db.session.remove()
+        db.engine.dispose()
+    shutil.copy(trabalho, os.path.join(pasta, "base.db"))
+    return app, trabalho
+
+
+def excluir_cascata(chef):
+    db.session.delete(chef)
+    db.session.commit()
+
+
+def excluir_orm(chef):
+    # o comportamento antigo (cascade="all, delete" sem passive_deletes):
+    # carrega cada receita e cada associação e apaga tudo num flush só
+    with db.session.no_autoflush:
+        for receita in chef.receitas:
+            for associacao in receita.ingredientes:
+                db.session.delete(associacao)
+            db.session.delete(receita)
+        if chef.perfil:
+            db.session.delete(chef.perfil)
+        db.session.flush()
+    db.session.expire(chef, ["receitas", "perfil"])
+    db.session.delete(chef)
+    db.session.commit()
+
+
+MODOS = {"cascata": excluir_cascata, "orm": excluir_orm}
+
+
+class EscritorConcorrente(threading.Thread):
+    """Outra conexão escrevendo sem parar; mede quanto esperou pelo lock."""
+
+    def __init__(self, caminho):
+        super().__init__(daemon=True)
+        self.caminho = caminho
+        self.esperas = []
+        self.parar = threading.Event()
+
+    def run(self):
+        conexao = sqlite3.connect(self.caminho, timeout=60, isolation_level=None)
+        while not self.parar.is_set():
+            inicio = time.perf_counter()
+            conexao.execute("BEGIN IMMEDIATE")
+            conexao.execute("UPDATE versoes SET versao = versao WHERE nome = 'receitas'")
+            conexao.execute("COMMIT")
+            self.esperas.append(time.perf_counter() - inicio)
+            time.sleep(0.005)
+        conexao.close()
+
+
+def restaurar(pasta, trabalho):
+    for sufixo in ("-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(trabalho + sufixo)
+    shutil.copy(os.path.join(pasta, "base.db"), trabalho)
+
+
+def medir(app, pasta, trabalho, modo):
+    restaurar(pasta, trabalho)
+    with app.app_context():
+        chef = db.session.execute(select(Chef).where(Chef.nome == CHEF)).scalar_one()
+        escritor = EscritorConcorrente(trabalho)
+        escritor.start()
+        time.sleep(0.05)
+        inicio = time.perf_counter()
+        MODOS[modo](chef)
+        duracao = time.perf_counter() - inicio
+        escritor.parar.set()
+        escritor.join()
+        divergentes = contadores.divergentes(db.session.connection())
+        db.session.remove()
+        db.engine.dispose()
+    return {
+        "segundos": round(duracao, 3),
+        "maior_espera_escritor_ms": round(max(escritor.esperas) * 1000, 1),
+        "espera_mediana_escritor_ms": round(statistics.median(escritor.esperas) * 1000, 2),
+        "contadores_divergentes": sum(divergentes.values()),
+    }
+
+
+def rodar(args):
+    pasta = tempfile.mkdtemp()
+    try:
+        app, trabalho = montar_base(pasta, args.receitas, args.fundo, args.semente)
+        return {
+            "meta": {"receitas": args.receitas, "fundo": args.fundo, "semente": args.semente},
+            "modos": {modo: medir(app, pasta, trabalho, modo) for modo in args.modos},
+        }
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--receitas", type=int, default=10000, help="receitas do chef excluído")
+    parser.add_argument("--fundo", type=int, default=5000, help="receitas de outros chefs")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--modos", nargs="+", choices=list(MODOS), default=list(MODOS))
+    parser.add_argument("--salvar")
+    parser.add_argument("--comparar")
+    parser.add_argument("--tolerancia", type=float, default=20.0, help="%% de piora aceita")
+    args = parser.parse_args()
+
+    resultado = rodar(args)
+    for modo, dados in resultado["modos"].items():
+        print(f"{modo:<8} {dados['segundos']:>8.3f} s   lock: maior espera {dados['maior_espera_escritor_ms']} ms"
+              f" (mediana {dados['espera_mediana_escritor_ms']} ms)   contadores divergentes: "
+              f"{dados['contadores_divergentes']}")
+
+    if args.salvar:
+        with open(args.salvar, "w") as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            referencia = json.load(arquivo)
+        piorou = False
+        for modo, dados in resultado["modos"].items():
+            antes = referencia["modos"].get(modo)
+            if not antes:
+                continue
+            variacao = (dados["segundos"] - antes["segundos"]) / antes["segundos"] * 100
+            print(f"{modo}: {antes['segundos']} s -> {dados['segundos']} s ({variacao:+.1f}%)")
+            piorou |= variacao > args.tolerancia or dados["contadores_divergentes"] > 0
+        sys.exit(1 if piorou else 0)
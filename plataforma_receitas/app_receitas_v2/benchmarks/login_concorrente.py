@@ -0,0 +1,87 @@
+"""Logins/s conforme a concorrência sobe: hash no worker x pool de processos.
+
+Sobe o app num servidor werkzeug com threads (como um worker gthread) e
+dispara POST /login com N clientes simultâneos.
+
+Uso (dentro de app_receitas_v2):
+    python benchmarks/login_concorrente.py --niveis 1,2,4,8,16 --segundos 3
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APP_CONFIG", "teste")
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from app import create_app  # noqa: E402
+
+
+def subir_servidor(processos, metodo):
+    os.environ["DATABASE_URL_TESTE"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "login.db")
+    app = create_app("teste")
+    app.config["SENHA_PROCESSOS"] = processos
+    app.config["SENHA_METODO"] = metodo
+    app.config["SENHA_MAX_PENDENTES"] = 1000
+    app.config["SENHA_TIMEOUT"] = 60
+    resultado = app.test_cli_runner().invoke(args=["init-db"])
+    assert resultado.exit_code == 0, resultado.output
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    servidor = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+class SemRedirecionar(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def cliente(url, fim, contagem):
+    abridor = urllib.request.build_opener(SemRedirecionar)
+    dados = urllib.parse.urlencode({"usuario": "admin", "senha": "admin"}).encode()
+    feitos = 0
+    while time.perf_counter() < fim:
+        try:
+            abridor.open(url, dados)
+        except urllib.error.HTTPError as erro:  # 302 depois do login
+            if erro.code != 302:
+                raise
+        feitos += 1
+    contagem.append(feitos)
+
+
+def medir(servidor, concorrencia, segundos):
+    url = f"http://127.0.0.1:{servidor.server_port}/login"
+    contagem = []
+    fim = time.perf_counter() + segundos
+    clientes = [threading.Thread(target=cliente, args=(url, fim, contagem)) for _ in range(concorrencia)]
+    for t in clientes:
+        t.start()
+    for t in clientes:
+        t.join()
+    return sum(contagem) / segundos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--niveis", default="1,2,4,8,16")
+    parser.add_argument("--segundos", type=float, default=3)
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--metodo", default="scrypt")
+    args = parser.parse_args()
+    niveis = [int(n) for n in args.niveis.split(",")]
+
+    for nome, processos in (("no worker", 0), (f"pool({args.processos})", args.processos)):
+        servidor = subir_servidor(processos, args.metodo)
+        for concorrencia in niveis:
+            print(f"{nome:<10} concorrência={concorrencia:<3} logins/s={medir(servidor, concorrencia, args.segundos):7.1f}")
+        servidor.shutdown()
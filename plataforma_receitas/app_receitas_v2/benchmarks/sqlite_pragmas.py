@@ -0,0 +1,91 @@
+"""Leituras e escritas concorrentes no SQLite: configuração padrão x compartilhado/banco.py.
+
+Uso (dentro de app_receitas_v2):
+    python benchmarks/sqlite_pragmas.py --threads 8 --segundos 5 --escritas 0.2
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from compartilhado.banco import aplicar_pragmas  # noqa: E402
+
+
+def preparar(engine, linhas=5000):
+    with engine.begin() as conexao:
+        conexao.execute(text("CREATE TABLE receitas (id INTEGER PRIMARY KEY, titulo TEXT, instrucoes TEXT)"))
+        conexao.execute(
+            text("INSERT INTO receitas (titulo, instrucoes) VALUES (:t, :i)"),
+            [{"t": f"Receita {n}", "i": "x" * 200} for n in range(linhas)],
+        )
+
+
+def trabalhador(engine, fim, fracao_escrita, placar, semente):
+    aleatorio = random.Random(semente)
+    leituras = escritas = erros = 0
+    while time.perf_counter() < fim:
+        try:
+            with engine.connect() as conexao:
+                if aleatorio.random() < fracao_escrita:
+                    # lê e depois escreve na mesma transação (como um request típico)
+                    conexao.execute(text("SELECT count(*) FROM receitas WHERE id < 100")).scalar()
+                    conexao.execute(text("INSERT INTO receitas (titulo, instrucoes) VALUES ('nova', 'y')"))
+                    conexao.commit()
+                    escritas += 1
+                else:
+                    conexao.execute(
+                        text("SELECT titulo FROM receitas WHERE id = :id"),
+                        {"id": aleatorio.randint(1, 5000)},
+                    ).first()
+                    leituras += 1
+        except OperationalError:
+            erros += 1
+    placar.append((leituras, escritas, erros))
+
+
+def rodar(nome, ajustado, args):
+    pasta = tempfile.mkdtemp()
+    url = "sqlite:///" + os.path.join(pasta, "bench.db")
+    # timeout=0.1: sem busy_timeout a conexão desiste quase na hora,
+    # como acontece nos apps hoje quando o lock não sai rápido
+    engine = create_engine(url, pool_size=args.threads, connect_args={"timeout": 0.1})
+    if ajustado:
+        aplicar_pragmas(engine, begin_immediate=args.begin_immediate)
+    preparar(engine)
+
+    placar = []
+    fim = time.perf_counter() + args.segundos
+    threads = [
+        threading.Thread(target=trabalhador, args=(engine, fim, args.escritas, placar, n))
+        for n in range(args.threads)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    leituras = sum(p[0] for p in placar)
+    escritas = sum(p[1] for p in placar)
+    erros = sum(p[2] for p in placar)
+    print(f"{nome:<10} leituras/s={leituras / args.segundos:>9.0f}  "
+          f"escritas/s={escritas / args.segundos:>8.0f}  'database is locked'={erros}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--escritas", type=float, default=0.2, help="fração de operações de escrita")
+    parser.add_argument("--begin-immediate", action="store_true")
+    args = parser.parse_args()
+
+    rodar("padrão", False, args)
+    rodar("ajustado", True, args)
@@ -0,0 +1,111 @@
+"""Tempo de import/boot do app: `python -X importtime` + create_app() cronometrado.
+
+Uso (dentro de app_receitas_v2):
+    python benchmarks/tempo_importacao.py                      # mostra o relatório
+    python benchmarks/tempo_importacao.py --salvar base.json   # guarda a referência
+    python benchmarks/tempo_importacao.py --comparar base.json --tolerancia 20
+O --comparar sai com código 1 se o boot ficou mais de `tolerancia`% mais lento.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CENARIOS = {
+    # só importar o módulo (o que o gunicorn faz antes de chamar a fábrica)
+    "import": ("import app", ""),
+    # import + create_app(): tudo que um worker paga antes do 1º request
+    "boot": ("import app", "app.create_app('teste')"),
+}
+
+MARCA = "-- fabrica --"
+
+# imports até a MARCA vêm do -X importtime; depois dela o que conta é o
+# relógio de parede (blueprints, extensões, engine, imports tardios)
+PROGRAMA = """\
+import sys, time
+{importar}
+sys.stderr.write("{marca}\\n")
+inicio = time.perf_counter()
+{executar}
+print(round((time.perf_counter() - inicio) * 1e6))
+"""
+
+
+def medir(importar, executar):
+    """Roda o cenário num Python novo; devolve (total_us, fabrica_us, {modulo: cumulativo_us})."""
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         PROGRAMA.format(importar=importar, executar=executar, marca=MARCA)],
+        cwd=PASTA_APP, capture_output=True, text=True, check=True,
+    )
+    fabrica = int(processo.stdout.split()[-1])
+    modulos = {}
+    total = 0
+    na_fabrica = False
+    for linha in processo.stderr.splitlines():
+        if linha == MARCA:
+            na_fabrica = True
+            continue
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        _proprio, cumulativo, nome = linha.split(":", 1)[1].split("|")
+        nome = nome[1:]  # tira o espaço depois do "|", mantém a indentação
+        nome_limpo = nome.strip()
+        cumulativo = int(cumulativo)
+        modulos[nome_limpo] = max(modulos.get(nome_limpo, 0), cumulativo)
+        if not nome.startswith("  ") and not na_fabrica:  # nível 0 = importado diretamente
+            total += cumulativo
+    return total + fabrica, fabrica, modulos
+
+
+def rodar(repeticoes):
+    resultado = {}
+    for cenario, (importar, executar) in CENARIOS.items():
+        totais, fabricas, ultimo = [], [], {}
+        for _ in range(repeticoes):
+            total, fabrica, ultimo = medir(importar, executar)
+            totais.append(total)
+            fabricas.append(fabrica)
+        mais_lentos = sorted(ultimo.items(), key=lambda item: item[1], reverse=True)[:15]
+        resultado[cenario] = {
+            "mediana_ms": round(statistics.median(totais) / 1000, 1),
+            "create_app_ms": round(statistics.median(fabricas) / 1000, 1),
+            "modulos_mais_lentos_ms": {nome: round(us / 1000, 1) for nome, us in mais_lentos},
+        }
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--salvar")
+    parser.add_argument("--comparar")
+    parser.add_argument("--tolerancia", type=float, default=20.0, help="%% de piora aceita")
+    args = parser.parse_args()
+
+    resultado = rodar(args.repeticoes)
+    for cenario, dados in resultado.items():
+        print(f"{cenario}: {dados['mediana_ms']} ms (mediana de {args.repeticoes}; "
+              f"create_app {dados['create_app_ms']} ms)")
+        for nome, ms in dados["modulos_mais_lentos_ms"].items():
+            print(f"    {ms:>8.1f} ms  {nome}")
+
+    if args.salvar:
+        with open(args.salvar, "w") as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            referencia = json.load(arquivo)
+        piorou = False
+        for cenario, dados in resultado.items():
+            antes = referencia[cenario]["mediana_ms"]
+            variacao = (dados["mediana_ms"] - antes) / antes * 100
+            print(f"{cenario}: {antes} ms -> {dados['mediana_ms']} ms ({variacao:+.1f}%)")
+            piorou |= variacao > args.tolerancia
+        sys.exit(1 if piorou else 0)
@@ -0,0 +1,174 @@
+import re
+
+from sqlalchemy import bindparam, event, text
+
+from models import db, Receita, ReceitaIngrediente
+import tarefas
+
+# ----------------- BUSCA (SQLite FTS5) -----------------
+# Tabela virtual FTS5 com o texto de cada receita. O rowid é o id da receita,
+# então o resultado da busca vira um simples WHERE id IN (...).
+# Pesos do bm25: título > ingredientes > instruções.
+
+TABELA = "receitas_busca"
+PESOS = (10.0, 1.0, 5.0)  # titulo, instrucoes, ingredientes
+LOTE_IDS = 500
+
+_SQL_CRIAR = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA} USING fts5(
+    titulo, instrucoes, ingredientes,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+_SQL_DOCUMENTOS = f"""
+INSERT INTO {TABELA} (rowid, titulo, instrucoes, ingredientes)
+SELECT r.id, r.titulo, r.instrucoes,
+       COALESCE((SELECT group_concat(i.nome, ' ')
+                   FROM receitas_ingredientes ri
+                   JOIN ingredientes i ON i.id = ri.ingrediente_id
+                  WHERE ri.receita_id = r.id), '')
+  FROM receitas r
+"""
+
+_indice_existe = set()
+
+
+def disponivel(conexao):
+    """True se o banco é SQLite e a tabela de busca já foi criada."""
+    if conexao.dialect.name != "sqlite":
+        return False
+    chave = str(conexao.engine.url)
+    if chave not in _indice_existe:
+        existe = conexao.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :nome"), {"nome": TABELA}
+        ).first()
+        if not existe:
+            return False
+        _indice_existe.add(chave)
+    return True
+
+
+def criar_indice():
+    db.session.execute(text(_SQL_CRIAR))
+
+
+def reconstruir_indice():
+    """Recria o índice inteiro a partir das tabelas (comando reindexar-busca)."""
+    db.session.execute(text(f"DROP TABLE IF EXISTS {TABELA}"))
+    criar_indice()
+    db.session.execute(text(_SQL_DOCUMENTOS))
+    db.session.execute(text(f"INSERT INTO {TABELA}({TABELA}) VALUES ('optimize')"))
+    db.session.commit()
+    return db.session.execute(text(f"SELECT count(*) FROM {TABELA}")).scalar()
+
+
+def _em_lotes(ids, lote=LOTE_IDS):
+    ids = sorted(ids)
+    for inicio in range(0, len(ids), lote):
+        yield ids[inicio:inicio + lote]
+
+
+def _atualizar(conexao, alterados, removidos):
+    # em lotes: excluir um chef pode remover milhares de receitas de uma vez
+    # (e o SQLite tem limite de parâmetros por comando)
+    for ids in _em_lotes(alterados | removidos):
+        conexao.execute(
+            text(f"DELETE FROM {TABELA} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )
+    for ids in _em_lotes(alterados - removidos):
+        conexao.execute(
+            text(_SQL_DOCUMENTOS + " WHERE r.id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )
+
+
+def termos_da_consulta(texto):
+    """'Bolo de fub' -> '"bolo"* "de"* "fub"*' (cada palavra vira um prefixo)."""
+    palavras = re.findall(r"\w+", texto.lower())
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
+def consulta_de_busca(texto, limite=20):
+    """(sql, parâmetros) do ranking bm25, ou None se o texto não tem termos."""
+    termos = termos_da_consulta(texto)
+    if not termos:
+        return None
+    sql = text(f"""
+        SELECT rowid, bm25({TABELA}, {', '.join(map(str, PESOS))}) AS rank
+          FROM {TABELA}
+         WHERE {TABELA} MATCH :termos
+         ORDER BY rank
+         LIMIT :limite
+    """)
+    return sql, {"termos": termos, "limite": limite}
+
+
+def buscar(texto, limite=20):
+    """Devolve [(receita_id, rank)] ordenado pela relevância (bm25)."""
+    consulta = consulta_de_busca(texto, limite)
+    if consulta is None or not disponivel(db.session.connection()):
+        return []
+    return [tuple(linha) for linha in db.session.execute(*consulta)]
+
+# ----------------- SINCRONIZAÇÃO -----------------
+# Cada flush anota quais receitas mudaram; no commit o índice é atualizado na
+# mesma transação (inclusive associações inseridas via Core depois do flush),
+# ou, com TAREFAS_ASSINCRONAS, vira uma tarefa da fila (tarefas.py).
+
+@event.listens_for(db.session, "after_flush")
+def _anotar_alteracoes(session, flush_context):
+    alterados = session.info.setdefault("busca_alterados", set())
+    removidos = session.info.setdefault("busca_removidos", set())
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Receita):
+            alterados.add(obj.id)
+        elif isinstance(obj, ReceitaIngrediente) and obj.receita_id:
+            alterados.add(obj.receita_id)
+    for obj in session.deleted:
+        if isinstance(obj, Receita):
+            removidos.add(obj.id)
+        elif isinstance(obj, ReceitaIngrediente) and obj.receita_id:
+            alterados.add(obj.receita_id)
+
+
+def marcar_alteradas(session, receita_ids):
+    """Para escritas feitas via Core (sem objetos na sessão): indexa no commit."""
+    session.info.setdefault("busca_alterados", set()).update(receita_ids)
+
+
+def marcar_removidas(session, receita_ids):
+    """Receitas apagadas pelo banco (ON DELETE CASCADE): saem do índice no commit."""
+    session.info.setdefault("busca_removidos", set()).update(receita_ids)
+
+
+@event.listens_for(db.session, "before_commit")
+def _sincronizar(session):
+    session.flush()
+    alterados = session.info.pop("busca_alterados", set())
+    removidos = session.info.pop("busca_removidos", set())
+    if not (alterados or removidos):
+        return
+    conexao = session.connection()
+    if not disponivel(conexao):
+        return
+    if tarefas.adiar():
+        tarefas.enfileirar(conexao, "busca.atualizar", {"ids": sorted(alterados | removidos)})
+    else:
+        _atualizar(conexao, alterados, removidos)
+
+
+@tarefas.tarefa("busca.atualizar")
+def _atualizar_adiado(dados):
+    # refaz cada receita a partir do estado atual do banco (as que não
+    # existem mais só saem): a ordem entre tarefas não importa
+    conexao = db.session.connection()
+    if disponivel(conexao):
+        _atualizar(conexao, set(dados["ids"]), set())
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _descartar(session, previous_transaction):
+    session.info.pop("busca_alterados", None)
+    session.info.pop("busca_removidos", None)
@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import OrderedDict
+
+# ----------------- CACHE LRU EM MEMÓRIA -----------------
+# Cache pequeno e local ao processo: guarda no máximo `tamanho` itens,
+# descarta o menos usado quando enche e (opcionalmente) expira após `ttl`
+# segundos. Com vários workers cada um tem o seu; o TTL limita o quanto um
+# worker pode ficar desatualizado em relação a escritas feitas em outro.
+
+
+class CacheLRU:
+    def __init__(self, tamanho=1024, ttl=None):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = OrderedDict()  # chave -> (expira_em, valor)
+        self._trava = threading.Lock()
+
+    def get(self, chave, padrao=None):
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None:
+                expira_em, valor = item
+                if expira_em is None or expira_em > time.monotonic():
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return valor
+                del self._itens[chave]
+            self.falhas += 1
+            return padrao
+
+    def set(self, chave, valor):
+        expira_em = time.monotonic() + self.ttl if self.ttl else None
+        with self._trava:
+            self._itens[chave] = (expira_em, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+
+    def delete(self, chave):
+        with self._trava:
+            self._itens.pop(chave, None)
+
+    def clear(self):
+        with self._trava:
+            self._itens.clear()
+
+    def estatisticas(self):
+        with self._trava:
+            return {"itens": len(self._itens), "acertos": self.acertos, "falhas": self.falhas}
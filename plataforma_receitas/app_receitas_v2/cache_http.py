@@ -0,0 +1,79 @@
+import hashlib
+import json
+from datetime import timezone
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+
+from auth import current_user
+from compartilhado.estaticos import estaticos
+
+# ----------------- GET CONDICIONAL (ETag / Last-Modified) -----------------
+# A view declara de quais versões a página depende; se o navegador (ou o
+# proxy) já tem essa versão, respondemos 304 sem consultar as receitas nem
+# renderizar o template. ETag fraco: a página é "equivalente", não
+# necessariamente igual byte a byte.
+# O ETag também leva a versão do app: deploy que muda template ou CSS muda a
+# página sem mudar dado nenhum, e o 304 devolveria o HTML antigo.
+
+
+def versao_app(app):
+    """VERSAO_APP, ou hash dos templates e do manifesto dos estáticos (uma vez por processo)."""
+    versao = app.config.get("VERSAO_APP") or app.extensions.get("versao_app")
+    if versao:
+        return versao
+    resumo = hashlib.blake2b(digest_size=8)
+    ambiente = app.jinja_env
+    for nome in sorted(ambiente.list_templates()):
+        fonte = ambiente.loader.get_source(ambiente, nome)[0]
+        resumo.update(nome.encode() + b"\0" + fonte.encode() + b"\0")
+    resumo.update(json.dumps(estaticos.manifesto, sort_keys=True).encode())
+    versao = app.extensions["versao_app"] = resumo.hexdigest()
+    return versao
+
+
+def _gerar_etag(partes):
+    usuario = current_user.usuario if current_user else ""
+    bruto = repr((versao_app(current_app), request.endpoint, partes, usuario,
+                  sorted(request.args.items(multi=True))))
+    return hashlib.blake2b(bruto.encode(), digest_size=12).hexdigest()
+
+
+def _nao_mudou(etag, ultima_modificacao):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and ultima_modificacao:
+        return ultima_modificacao <= request.if_modified_since
+    return False
+
+
+def _preencher(resposta, etag, ultima_modificacao):
+    resposta.set_etag(etag, weak=True)
+    if ultima_modificacao:
+        resposta.last_modified = ultima_modificacao
+    # private: a página depende do usuário; no-cache: sempre revalidar
+    resposta.headers["Cache-Control"] = "private, no-cache"
+    return resposta
+
+
+def condicional(calcular):
+    """`calcular(**kwargs_da_view)` devolve (partes_do_etag, ultima_modificacao)."""
+    def decorador(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            partes, ultima_modificacao = calcular(**kwargs)
+            if ultima_modificacao:
+                # gravado em UTC sem fuso; o HTTP só tem precisão de segundos
+                ultima_modificacao = ultima_modificacao.replace(microsecond=0, tzinfo=timezone.utc)
+            etag = _gerar_etag(partes)
+
+            # Mensagens flash pendentes só aparecem se a página for renderizada
+            if not session.get("_flashes") and _nao_mudou(etag, ultima_modificacao):
+                return _preencher(current_app.response_class(status=304), etag, ultima_modificacao)
+
+            resposta = make_response(current_app.ensure_sync(view)(*args, **kwargs))
+            if resposta.status_code == 200:
+                _preencher(resposta, etag, ultima_modificacao)
+            return resposta
+        return wrapper
+    return decorador
@@ -0,0 +1,89 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from sqlalchemy import select
+
+from models import db, Chef, PerfilChef, Receita
+from auth import login_required
+from paginacao import paginar
+import consultas
+import versoes
+import exclusao  # noqa: F401  (hooks da exclusão em cascata)
+from cache_http import condicional
+from fragmentos import fragmentos
+
+bp = Blueprint('chefs', __name__)
+
+# ----------------- ROTAS CHEFS -----------------
+def _versao_listagem_chefs():
+    versao, quando = versoes.versoes('chefs')['chefs']
+    return versao, quando
+
+def _versao_chef(chef_id):
+    linha = db.session.execute(
+        select(Chef.versao, Chef.atualizado_em).where(Chef.id == chef_id)
+    ).first()
+    return (chef_id, linha.versao if linha else None), (linha.atualizado_em if linha else None)
+
+@bp.route('/chefs')
+@login_required
+@condicional(_versao_listagem_chefs)
+def listar_chefs():
+    chefs = paginar(consultas.chefs_com_perfil(), Chef.id)
+    return render_template('chefs.html', chefs=chefs)
+
+@bp.route('/chef/novo', methods=['GET', 'POST'])
+@login_required
+def criar_chef():
+    if request.method == 'POST':
+        nome = request.form['nome']
+        especialidade = request.form['especialidade']
+        anos_experiencia = request.form['anos_experiencia']
+
+        # chef e perfil no mesmo commit (um INSERT de cada, uma transação)
+        novo_chef = Chef(nome=nome)
+        novo_chef.perfil = PerfilChef(
+            especialidade=especialidade,
+            anos_experiencia=anos_experiencia,
+        )
+        db.session.add(novo_chef)
+        db.session.commit()
+
+        flash("Chef cadastrado com sucesso!", "success")
+        return redirect(url_for('chefs.listar_chefs'))
+
+    return render_template('criar_chef.html')
+
+@bp.route('/chef/editar/<int:chef_id>', methods=['GET', 'POST'])
+@login_required
+def editar_chef(chef_id):
+    chef = consultas.chefs_com_perfil().get_or_404(chef_id)
+    if request.method == 'POST':
+        chef.nome = request.form['nome']
+        chef.perfil.especialidade = request.form['especialidade']
+        chef.perfil.anos_experiencia = request.form['anos_experiencia']
+        db.session.commit()
+        fragmentos.invalidar('chef', chef_id)
+        flash("Chef atualizado com sucesso!", "success")
+        return redirect(url_for('chefs.listar_chefs'))
+    return render_template('editar_chef.html', chef=chef)
+
+@bp.route('/chef/excluir/<int:chef_id>', methods=['POST'])
+@login_required
+def excluir_chef(chef_id):
+    chef = Chef.query.get_or_404(chef_id)
+    # só os ids (para os fragmentos): as receitas o banco apaga em cascata
+    receita_ids = db.session.execute(select(Receita.id).where(Receita.chef_id == chef_id)).scalars().all()
+    db.session.delete(chef)
+    db.session.commit()
+    fragmentos.invalidar('chef', chef_id)
+    for receita_id in receita_ids:
+        fragmentos.invalidar('receita', receita_id)
+    flash("Chef excluído com sucesso!", "danger")
+    return redirect(url_for('chefs.listar_chefs'))
+
+@bp.route('/chef/<int:chef_id>')
+@login_required
+@condicional(_versao_chef)
+def detalhes_chef(chef_id):
+    chef = consultas.chefs_com_perfil().filter(Chef.id == chef_id).first_or_404()
+    receitas = paginar(consultas.receitas_do_chef(chef_id), Receita.id)
+    return render_template('detalhes_chef.html', chef=chef, receitas=receitas)
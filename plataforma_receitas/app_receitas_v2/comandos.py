@@ -0,0 +1,329 @@
+import json
+import time
+
+import click
+from flask import Blueprint, current_app
+
+from models import db, Usuario, Chef, PerfilChef, Receita, Ingrediente, ReceitaIngrediente
+from aquecimento import aquecimento
+from compartilhado.estaticos import estaticos
+
+# cli_group=None: os comandos ficam na raiz (flask init-db, não flask comandos init-db)
+# Os módulos de cada comando (busca, exportacao, tarefas...) são importados
+# dentro da função: o blueprint é registrado em todo create_app, e worker/teste
+# não devem pagar pelo import de código que só a CLI usa.
+bp = Blueprint('comandos', __name__, cli_group=None)
+
+# ----------------- CLI -----------------
+@bp.cli.command("init-db")
+def init_db_command():
+    """Cria as tabelas e popula com dados de exemplo."""
+    import busca
+    import migracoes
+    db.drop_all()
+    db.create_all()
+
+    # Usuário admin
+    admin = Usuario(usuario="admin")
+    admin.set_password("admin")
+    db.session.add(admin)
+
+    # Criando Chefs
+    chef1 = Chef(nome='Ana Maria')
+    perfil1 = PerfilChef(especialidade='Culinária Brasileira', anos_experiencia=25, chef=chef1)
+
+    chef2 = Chef(nome='Érick Jacquin')
+    perfil2 = PerfilChef(especialidade='Culinária Francesa', anos_experiencia=30, chef=chef2)
+
+    db.session.add_all([chef1, chef2, perfil1, perfil2])
+
+    # Criando Ingredientes
+    ingredientes = {
+        'tomate': Ingrediente(nome='tomate'),
+        'cebola': Ingrediente(nome='cebola'),
+        'farinha': Ingrediente(nome='farinha'),
+        'ovo': Ingrediente(nome='ovo'),
+        'manteiga': Ingrediente(nome='manteiga')
+    }
+    db.session.add_all(ingredientes.values())
+
+    # Criando Receitas
+    receita1 = Receita(titulo='Molho de Tomate Clássico', instrucoes='Corte tomates e cozinhe...', chef=chef1)
+    receita2 = Receita(titulo='Bolo Simples', instrucoes='Misture farinha, ovos e manteiga...', chef=chef1)
+    receita3 = Receita(titulo='Petit Gâteau', instrucoes='Prepare a massa com chocolate e asse rapidamente...', chef=chef2)
+
+    db.session.add_all([receita1, receita2, receita3])
+
+    # Ligando Ingredientes às Receitas
+    db.session.add_all([
+        ReceitaIngrediente(receita=receita1, ingrediente=ingredientes['tomate'], quantidade='5 unidades'),
+        ReceitaIngrediente(receita=receita1, ingrediente=ingredientes['cebola'], quantidade='1 unidade'),
+        ReceitaIngrediente(receita=receita2, ingrediente=ingredientes['farinha'], quantidade='2 xícaras'),
+        ReceitaIngrediente(receita=receita2, ingrediente=ingredientes['ovo'], quantidade='3 unidades'),
+        ReceitaIngrediente(receita=receita3, ingrediente=ingredientes['manteiga'], quantidade='150g'),
+    ])
+
+    # create_all já criou o esquema final: nenhuma migração a aplicar
+    migracoes.marcar_todas(db.session.connection())
+    db.session.commit()
+    busca.reconstruir_indice()
+    click.echo("✅ Banco de dados inicializado com sucesso! Usuário admin criado (admin/admins)")
+
+@bp.cli.command("migrar")
+@click.option("--listar", is_flag=True, help="Só mostra o estado de cada migração.")
+def migrar_command(listar):
+    """Aplica as migrações de esquema pendentes (sem apagar dados)."""
+    import migracoes
+    if listar:
+        feitas = migracoes.aplicadas(db.session.connection())
+        for m in migracoes.MIGRACOES:
+            click.echo(f"{'✔' if m.id in feitas else '·'} {m.id}  {m.descricao}")
+        return
+    db.session.remove()  # a migração usa uma conexão própria (BEGIN/COMMIT explícitos)
+
+    def ao_aplicar(migracao, segundos):
+        click.echo(f"  {migracao.id} ({segundos:.2f}s)", err=True)
+
+    aplicadas = migracoes.migrar(ao_aplicar=ao_aplicar)
+    click.echo(f"🧱 {len(aplicadas)} migrações aplicadas." if aplicadas else "🧱 Banco já está atualizado.", err=True)
+
+@bp.cli.command("verificar-planos")
+@click.option("--usuario", default="admin", show_default=True, help="Usuário da sessão nas rotas com login.")
+def verificar_planos_command(usuario):
+    """Falha (código 1) se faltar índice em chave estrangeira ou se uma rota quente varrer tabela."""
+    import planos
+    try:
+        analisadas, problemas = planos.verificar(current_app._get_current_object(), usuario=usuario)
+    except RuntimeError as erro:
+        raise click.ClickException(str(erro))
+    for problema in problemas:
+        click.echo(f"✗ {problema.origem}: {problema.detalhe}", err=True)
+        if problema.consulta:
+            click.echo(f"    {' '.join(problema.consulta.split())}", err=True)
+    if problemas:
+        raise SystemExit(1)
+    click.echo(f"🔎 {analisadas} consultas verificadas, nenhuma varredura de tabela.", err=True)
+
+@bp.cli.command("warmup")
+def warmup_command():
+    """Pré-compila os templates (bytecode cache em disco), configura os mappers e checa o banco.
+
+    Sai com código 1 se o banco não respondeu ou há migração pendente (o /pronto daria 503).
+    """
+    db.session.remove()
+    detalhes = aquecimento.aquecer(current_app._get_current_object())
+    pasta = getattr(current_app.jinja_env.bytecode_cache, "directory", None)
+    click.echo(f"🔥 {detalhes['templates']} templates em {detalhes['templates_ms']} ms "
+               f"(cache: {pasta or 'desligado'}), mappers em {detalhes['mappers_ms']} ms, "
+               f"consultas em {detalhes['consultas_ms']} ms", err=True)
+    for nome, erro in detalhes.get("templates_com_erro", {}).items():
+        click.echo(f"✗ {nome}: {erro}", err=True)
+    if "erro" in detalhes:
+        raise click.ClickException(f"banco: {detalhes['erro']}")
+    if aquecimento.pendentes:
+        raise click.ClickException(f"migrações pendentes: {', '.join(aquecimento.pendentes)} (rode `flask migrar`)")
+
+@bp.cli.command("construir-estaticos")
+def construir_estaticos_command():
+    """Minifica, versiona (hash no nome) e pré-comprime (gzip/brotli) os arquivos de static/."""
+    manifesto, com_brotli = estaticos.construir(current_app.static_folder)
+    for original, final in sorted(manifesto.items()):
+        click.echo(f"  {original} -> {final}", err=True)
+    click.echo(f"📦 {len(manifesto)} arquivos em {estaticos.pasta}"
+               + ("" if com_brotli else " (sem .br: `pip install brotli`)"), err=True)
+
+@bp.cli.command("reindexar-busca")
+def reindexar_busca_command():
+    """Recria o índice de busca (FTS5) a partir das receitas existentes."""
+    import busca
+    total = busca.reconstruir_indice()
+    click.echo(f"🔎 Índice de busca reconstruído: {total} receitas.")
+
+@bp.cli.command("reconciliar-contadores")
+@click.option("--verificar", is_flag=True, help="Só conta as divergências (sai com 1 se houver).")
+def reconciliar_contadores_command(verificar):
+    """Recalcula chefs/ingredientes.total_receitas e receitas.total_ingredientes."""
+    import contadores
+    conexao = db.session.connection()
+    pendentes = contadores.adiados_pendentes(conexao)
+    if pendentes:
+        raise click.ClickException(
+            f"{pendentes} tarefas de contadores na fila: rode `flask trabalhador --drenar` antes")
+    if verificar:
+        divergentes = contadores.divergentes(conexao)
+        for alvo, n in divergentes.items():
+            click.echo(f"{alvo}: {n} contadores divergentes")
+        raise SystemExit(1 if any(divergentes.values()) else 0)
+    corrigidos = contadores.reconciliar(conexao)
+    db.session.commit()
+    for alvo, n in corrigidos.items():
+        click.echo(f"🔢 {alvo}: {n} contadores corrigidos")
+
+@bp.cli.command("trabalhador")
+@click.option("--processos", type=click.IntRange(min=1), help="Padrão: TAREFAS_PROCESSOS.")
+@click.option("--drenar", is_flag=True, help="Executa aqui o que estiver vencido na fila e sai.")
+def trabalhador_command(processos, drenar):
+    """Executa a fila de tarefas (busca, contadores, notificações)."""
+    import tarefas
+    app = current_app._get_current_object()
+    if drenar:
+        total = tarefas.drenar()
+        click.echo(f"📬 {total} tarefas executadas.", err=True)
+        return
+    processos = processos or app.config.get("TAREFAS_PROCESSOS", 2)
+    db.session.remove()
+    db.engine.dispose()  # os filhos abrem as próprias conexões
+    click.echo(f"📬 {processos} trabalhadores (Ctrl+C para parar)...", err=True)
+    tarefas.rodar_pool(
+        app, processos,
+        ao_reiniciar=lambda filho: click.echo(f"trabalhador {filho.pid} saiu ({filho.exitcode}); reiniciando", err=True),
+    )
+
+@bp.cli.command("tarefas")
+@click.option("--reenfileirar", is_flag=True, help="Devolve as que falharam para a fila.")
+@click.option("--limpar", is_flag=True, help="Apaga as concluídas há mais de TAREFAS_RETENCAO_DIAS.")
+def tarefas_command(reenfileirar, limpar):
+    """Resumo da fila de tarefas por tipo e estado."""
+    import tarefas
+    conexao = db.session.connection()
+    if reenfileirar:
+        click.echo(f"↩ {tarefas.reenfileirar_falhas(conexao)} tarefas de volta à fila", err=True)
+    if limpar:
+        dias = current_app.config.get("TAREFAS_RETENCAO_DIAS", 7)
+        click.echo(f"🧹 {tarefas.limpar(conexao, dias)} tarefas concluídas apagadas", err=True)
+    db.session.commit()
+    for (tipo, estado), n in sorted(tarefas.resumo(db.session.connection()).items()):
+        click.echo(f"{tipo:<22} {estado:<11} {n}")
+
+@bp.cli.command("export-receitas")
+@click.option("--formato", type=click.Choice(["csv", "ndjson", "parquet"]), default="ndjson", show_default=True)
+@click.option("--saida", "-o", type=click.Path(dir_okay=False, allow_dash=True), default="-",
+              help="Arquivo de destino ('-' = saída padrão; parquet exige arquivo).")
+@click.option("--lote", type=click.IntRange(min=1),
+              help="Receitas lidas do banco por vez (padrão: exportacao.LOTE).")
+def export_receitas_command(formato, saida, lote):
+    """Exporta todas as receitas (chef, perfil e ingredientes) em streaming."""
+    import exportacao
+    contador = {"receitas": 0}
+    lotes = exportacao.contar(exportacao.lotes_de_receitas(lote or exportacao.LOTE), contador)
+    inicio = time.perf_counter()
+
+    if formato == "parquet":
+        if saida == "-":
+            raise click.UsageError("parquet precisa de --saida arquivo.parquet")
+        try:
+            exportacao.escrever_parquet(lotes, saida)
+        except RuntimeError as erro:
+            raise click.ClickException(str(erro))
+    else:
+        gerar = exportacao.gerar_csv if formato == "csv" else exportacao.gerar_ndjson
+        with click.open_file(saida, "w", encoding="utf-8") as arquivo:
+            for pedaco in gerar(lotes):
+                arquivo.write(pedaco)
+
+    duracao = time.perf_counter() - inicio
+    taxa = contador["receitas"] / duracao if duracao else 0
+    click.echo(f"📦 {contador['receitas']} receitas exportadas em {duracao:.2f}s ({taxa:.0f} receitas/s).", err=True)
+
+@bp.cli.command("import-receitas")
+@click.argument("arquivo", type=click.Path(exists=True, dir_okay=False))
+@click.option("--formato", type=click.Choice(["csv", "ndjson"]),
+              help="Padrão: pela extensão do arquivo (.csv ou ndjson).")
+@click.option("--lote", type=click.IntRange(min=1),
+              help="Receitas por INSERT (executemany; padrão: importacao.LOTE).")
+@click.option("--lotes-por-commit", type=click.IntRange(min=1),
+              help="Lotes em cada transação (padrão: importacao.LOTES_POR_COMMIT).")
+@click.option("--do-inicio", is_flag=True, help="Ignora o checkpoint e lê o arquivo desde o começo.")
+def import_receitas_command(arquivo, formato, lote, lotes_por_commit, do_inicio):
+    """Importa receitas de um CSV/NDJSON (mesmo formato do export-receitas)."""
+    import importacao
+    lote = lote or importacao.LOTE
+    lotes_por_commit = lotes_por_commit or importacao.LOTES_POR_COMMIT
+    ja_lidos = 0 if do_inicio else importacao.ler_checkpoint(arquivo)
+    if ja_lidos:
+        click.echo(f"↪️  Retomando do checkpoint: {ja_lidos} registros já importados.", err=True)
+
+    def progresso(importador, lidos, segundos):
+        taxa = (lidos - ja_lidos) / segundos if segundos else 0
+        click.echo(f"  {lidos} registros lidos, {importador.receitas} receitas gravadas ({taxa:.0f} registros/s)", err=True)
+
+    inicio = time.perf_counter()
+    try:
+        importador = importacao.importar_arquivo(
+            arquivo, formato=formato, lote=lote, lotes_por_commit=lotes_por_commit,
+            retomar=not do_inicio, progresso=progresso,
+        )
+    except RuntimeError as erro:  # banco sem as migrações
+        raise click.ClickException(str(erro))
+    duracao = time.perf_counter() - inicio
+    taxa = importador.receitas / duracao if duracao else 0
+    click.echo(
+        f"📥 {importador.receitas} receitas importadas em {duracao:.2f}s ({taxa:.0f} receitas/s); "
+        f"{importador.chefs_novos} chefs novos, {importador.ignorados} registros ignorados.",
+        err=True,
+    )
+
+@bp.cli.command("gerar-dados")
+@click.option("--chefs", type=click.IntRange(min=1), default=100, show_default=True)
+@click.option("--receitas", type=click.IntRange(min=0), default=1000, show_default=True)
+@click.option("--ingredientes", type=click.IntRange(min=2), default=500, show_default=True)
+@click.option("--semente", type=int, default=42, show_default=True, help="Mesma semente = mesmos dados.")
+@click.option("--saida", "-o", type=click.Path(dir_okay=False, allow_dash=True),
+              help="Grava NDJSON (para o import-receitas) em vez de inserir no banco.")
+@click.option("--lote", type=click.IntRange(min=1), help="Padrão: importacao.LOTE.")
+def gerar_dados_command(chefs, receitas, ingredientes, semente, saida, lote):
+    """Gera chefs, perfis, receitas e ingredientes sintéticos (determinísticos)."""
+    import dados_sinteticos
+    import importacao
+    registros = dados_sinteticos.gerar_receitas(semente, chefs, receitas, ingredientes)
+    inicio = time.perf_counter()
+
+    if saida:
+        with click.open_file(saida, "w", encoding="utf-8") as arquivo:
+            for registro in registros:
+                arquivo.write(json.dumps(dados_sinteticos.para_ndjson(registro), ensure_ascii=False) + "\n")
+        click.echo(f"🧪 {receitas} receitas geradas em {time.perf_counter() - inicio:.2f}s.", err=True)
+        return
+
+    importador = importacao.Importador(lote=lote or importacao.LOTE)
+    importador.importar(registros)
+    duracao = time.perf_counter() - inicio
+    click.echo(
+        f"🧪 {importador.receitas} receitas e {importador.chefs_novos} chefs gerados em {duracao:.2f}s "
+        f"({importador.receitas / duracao if duracao else 0:.0f} receitas/s).",
+        err=True,
+    )
+
+
+@bp.cli.command("mesclar-perfis")
+@click.argument("arquivos", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option("--saida", "-o", type=click.Path(dir_okay=False, allow_dash=True), default="-", show_default=True)
+def mesclar_perfis_command(arquivos, saida):
+    """Soma vários .folded (workers, dias, máquinas) num só."""
+    import perfilador
+    total = perfilador.mesclar(arquivos)
+    with click.open_file(saida, "w", encoding="utf-8") as arquivo:
+        perfilador.escrever_colapsado(total, arquivo)
+    click.echo(f"🔥 {len(arquivos)} arquivos, {sum(total.values())} amostras, {len(total)} pilhas.", err=True)
+
+
+@bp.cli.command("comparar-perfis")
+@click.argument("antes", type=click.Path(exists=True, dir_okay=False))
+@click.argument("depois", type=click.Path(exists=True, dir_okay=False))
+@click.option("--top", type=click.IntRange(min=1), default=20, show_default=True)
+@click.option("--saida", "-o", type=click.Path(dir_okay=False, allow_dash=True),
+              help="Grava 'pilha antes depois' (formato do difffolded.pl, para flamegraph diferencial).")
+def comparar_perfis_command(antes, depois, top, saida):
+    """Compara dois perfis (ex.: release anterior x atual) por tempo próprio de cada função."""
+    import perfilador
+    pilhas_antes = perfilador.ler_colapsado(antes)
+    pilhas_depois = perfilador.ler_colapsado(depois)
+    click.echo(f"amostras: {sum(pilhas_antes.values())} -> {sum(pilhas_depois.values())}")
+    click.echo(f"{'antes':>8}{'depois':>8}{'diferença':>11}  função")
+    for funcao, fracao_antes, fracao_depois in perfilador.diferenca(pilhas_antes, pilhas_depois)[:top]:
+        click.echo(f"{fracao_antes:>8.1%}{fracao_depois:>8.1%}{fracao_depois - fracao_antes:>+11.1%}  {funcao}")
+
+    if saida:
+        with click.open_file(saida, "w", encoding="utf-8") as arquivo:
+            for pilha in sorted(set(pilhas_antes) | set(pilhas_depois)):
+                arquivo.write(f"{pilha} {pilhas_antes[pilha]} {pilhas_depois[pilha]}\n")
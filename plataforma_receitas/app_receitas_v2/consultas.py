@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload, selectinload
+
+from models import db, Chef, Receita, ReceitaIngrediente
+
+# ----------------- CARREGAMENTO -----------------
+# Cada view declara aqui o "grafo" de objetos que o template vai ler.
+# Relações muitos-para-um / um-para-um usam JOIN (joinedload) e coleções
+# usam um SELECT ... WHERE id IN (...) extra (selectinload). Assim o número
+# de consultas por página é fixo e não cresce com a quantidade de linhas.
+
+def receitas_com_chef():
+    """Receitas + chef (index.html lê receita.chef.nome): 1 consulta."""
+    return Receita.query.options(joinedload(Receita.chef)).order_by(Receita.id)
+
+
+def receita_completa():
+    """Receita + chef + ingredientes com nome: 2 consultas."""
+    return Receita.query.options(
+        joinedload(Receita.chef),
+        selectinload(Receita.ingredientes).joinedload(ReceitaIngrediente.ingrediente),
+    )
+
+
+def chefs_com_perfil():
+    """Chefs + perfil (chefs.html / editar_chef.html): 1 consulta."""
+    return Chef.query.options(joinedload(Chef.perfil)).order_by(Chef.id)
+
+
+def receitas_do_chef(chef_id):
+    """Receitas de um chef (detalhes_chef.html, paginadas por id): 1 consulta."""
+    return Receita.query.filter(Receita.chef_id == chef_id)
+
+
+def chefs_para_escolher(termo="", limite=50):
+    """Chefs do <select> do formulário, por nome; `limite` + 1 para saber se há mais."""
+    query = Chef.query.order_by(Chef.nome, Chef.id)
+    if termo:
+        query = query.filter(Chef.nome.ilike(f"%{termo}%"))
+    return query.limit(limite + 1)
+
+# ----------------- CONTAGEM DE CONSULTAS -----------------
+class ContadorConsultas:
+    def __init__(self):
+        self.sqls = []
+
+    @property
+    def total(self):
+        return len(self.sqls)
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.sqls.append(statement)
+
+
+@contextmanager
+def contar_consultas():
+    """Conta os SELECT/INSERT/... enviados ao banco dentro do bloco."""
+    contador = ContadorConsultas()
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", contador._registrar)
+    try:
+        yield contador
+    finally:
+        event.remove(engine, "before_cursor_execute", contador._registrar)
+
+
+@contextmanager
+def limite_de_consultas(maximo):
+    """Falha (AssertionError) se o bloco fizer mais de `maximo` consultas.
+
+    Uso em testes:
+        with app.app_context(), limite_de_consultas(2):
+            client.get('/')
+    """
+    with contar_consultas() as contador:
+        yield contador
+    if contador.total > maximo:
+        raise AssertionError(
+            f"Esperado no máximo {maximo} consultas, executadas {contador.total}:\n"
+            + "\n".join(contador.sqls)
+        )
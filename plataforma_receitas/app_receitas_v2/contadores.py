@@ -0,0 +1,166 @@
+from collections import Counter
+
+from sqlalchemy import bindparam, event, func, inspect, select, update
+
+from models import db, agora, Chef, Ingrediente, Receita, ReceitaIngrediente
+import tarefas
+import versoes
+
+# ----------------- CONTADORES DESNORMALIZADOS -----------------
+# Colunas mantidas na mesma transação da escrita, para as telas/painéis lerem
+# totais sem COUNT(*) em receitas / receitas_ingredientes:
+#   chefs.total_receitas            receitas do chef
+#   ingredientes.total_receitas     receitas que usam o ingrediente
+#   receitas.total_ingredientes     ingredientes da receita
+# Escritas pelo ORM são contadas no after_flush (novos, excluídos e troca de
+# chef/ingrediente); escritas via Core (associar_ingredientes, importação)
+# chamam `aplicar` com os deltas. Sempre "coluna = coluna + delta" no banco,
+# nunca ler-somar-gravar. Se algo escapar (SQL manual, banco antigo), o
+# `flask reconciliar-contadores` recalcula tudo a partir das tabelas.
+# Com TAREFAS_ASSINCRONAS, os deltas de um request viram uma tarefa da fila
+# (somada uma vez só: a tarefa é concluída na mesma transação do UPDATE).
+
+ALVOS = {
+    "chefs": Chef.__table__.c.total_receitas,
+    "ingredientes": Ingrediente.__table__.c.total_receitas,
+    "receitas": Receita.__table__.c.total_ingredientes,
+}
+
+
+def _deltas(chefs, ingredientes, receitas):
+    todos = {"chefs": chefs, "ingredientes": ingredientes, "receitas": receitas}
+    return {
+        nome: {i: n for i, n in (deltas or {}).items() if i is not None and n}
+        for nome, deltas in todos.items()
+    }
+
+
+def aplicar(conexao, chefs=None, ingredientes=None, receitas=None):
+    """Soma os deltas {id: n} nos contadores (um executemany por tabela)."""
+    deltas = _deltas(chefs, ingredientes, receitas)
+    if tarefas.adiar():
+        if any(deltas.values()):
+            tarefas.enfileirar(conexao, "contadores.aplicar", {
+                nome: [[i, n] for i, n in valores.items()] for nome, valores in deltas.items()
+            })
+        return
+    _somar(conexao, deltas)
+
+
+def _somar(conexao, deltas):
+    for nome, valores in deltas.items():
+        linhas = [{"_id": i, "_delta": n} for i, n in valores.items()]
+        if not linhas:
+            continue
+        coluna = ALVOS[nome]
+        tabela = coluna.table
+        conexao.execute(
+            update(tabela)
+            .where(tabela.c.id == bindparam("_id"))
+            .values({coluna.name: coluna + bindparam("_delta")}),
+            linhas,
+        )
+
+
+def _trocas(obj, atributo, deltas):
+    """Atributo alterado num objeto "dirty": -1 no valor antigo, +1 no novo."""
+    historico = inspect(obj).attrs[atributo].history
+    if historico.deleted or historico.added:
+        for antigo in historico.deleted:
+            deltas[antigo] -= 1
+        for novo in historico.added:
+            deltas[novo] += 1
+
+
+@event.listens_for(db.session, "after_flush")
+def _contar(session, flush_context):
+    chefs, ingredientes, receitas = Counter(), Counter(), Counter()
+
+    for obj in session.new:
+        if isinstance(obj, Receita):
+            chefs[obj.chef_id] += 1
+        elif isinstance(obj, ReceitaIngrediente):
+            receitas[obj.receita_id] += 1
+            ingredientes[obj.ingrediente_id] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Receita):
+            chefs[obj.chef_id] -= 1
+        elif isinstance(obj, ReceitaIngrediente):
+            receitas[obj.receita_id] -= 1
+            ingredientes[obj.ingrediente_id] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Receita):
+            _trocas(obj, "chef_id", chefs)
+        elif isinstance(obj, ReceitaIngrediente):
+            _trocas(obj, "receita_id", receitas)
+            _trocas(obj, "ingrediente_id", ingredientes)
+
+    if chefs or ingredientes or receitas:
+        aplicar(session.connection(), chefs, ingredientes, receitas)
+
+
+
+@tarefas.tarefa("contadores.aplicar")
+def _aplicar_adiado(dados):
+    deltas = {nome: dict(pares) for nome, pares in dados.items()}
+    conexao = db.session.connection()
+    _somar(conexao, deltas)
+    # o request versionou as páginas antes da soma: versiona de novo para o
+    # ETag/fragmento refletir o total novo
+    if deltas.get("chefs"):
+        versoes.incrementar_chefs(conexao, deltas["chefs"])
+        versoes.incrementar(conexao, {"chefs"})
+    if deltas.get("receitas"):
+        versoes.incrementar(conexao, {"receitas"})
+
+
+def adiados_pendentes(conexao):
+    """Tarefas de contadores ainda na fila (reconciliar agora contaria em dobro)."""
+    return sum(n for (tipo, estado), n in tarefas.resumo(conexao).items()
+               if tipo == "contadores.aplicar" and estado in ("pendente", "executando"))
+
+# ----------------- RECONCILIAÇÃO -----------------
+def _contagens():
+    """{alvo: (coluna, subconsulta correlacionada com o valor verdadeiro)}."""
+    receitas = Receita.__table__
+    associacoes = ReceitaIngrediente.__table__
+    return {
+        "chefs": select(func.count()).where(receitas.c.chef_id == Chef.__table__.c.id)
+                                     .scalar_subquery(),
+        "ingredientes": select(func.count()).where(associacoes.c.ingrediente_id == Ingrediente.__table__.c.id)
+                                            .scalar_subquery(),
+        "receitas": select(func.count()).where(associacoes.c.receita_id == receitas.c.id)
+                                        .scalar_subquery(),
+    }
+
+
+def divergentes(conexao):
+    """{alvo: quantas linhas estão com o contador errado} (não altera nada)."""
+    resultado = {}
+    for nome, verdadeiro in _contagens().items():
+        coluna = ALVOS[nome]
+        resultado[nome] = conexao.execute(
+            select(func.count()).select_from(coluna.table).where(coluna != verdadeiro)
+        ).scalar()
+    return resultado
+
+
+def reconciliar(conexao):
+    """Recalcula os contadores errados; devolve {alvo: linhas corrigidas}.
+
+    Linhas corrigidas de chefs/receitas ganham versão nova (e a tabela em
+    `versoes`), senão ETag e fragmentos continuariam servindo o total antigo.
+    """
+    momento = agora()
+    resultado = {}
+    for nome, verdadeiro in _contagens().items():
+        coluna = ALVOS[nome]
+        tabela = coluna.table
+        valores = {coluna.name: verdadeiro}
+        if "versao" in tabela.c:
+            valores.update(versao=tabela.c.versao + 1, atualizado_em=momento)
+        resultado[nome] = conexao.execute(
+            update(tabela).where(coluna != verdadeiro).values(valores)
+        ).rowcount
+    versoes.incrementar(conexao, {nome for nome in ("chefs", "receitas") if resultado[nome]}, momento)
+    return resultado
@@ -0,0 +1,130 @@
+import random
+from itertools import accumulate
+
+# ----------------- DADOS SINTÉTICOS -----------------
+# Gera chefs, perfis, receitas e ingredientes "parecidos com produção", de
+# forma determinística: a mesma semente produz exatamente os mesmos dados.
+# As distribuições imitam um catálogo real:
+#   - poucos chefs publicam muito e a maioria publica pouco (Zipf), mas
+#     todo chef tem pelo menos uma receita;
+#   - sal, cebola, alho... aparecem em quase tudo, o resto é cauda longa (Zipf);
+#   - cada receita tem em geral 4 a 12 ingredientes (normal truncada);
+#   - instruções com tamanho variável (de 2 a 12 passos).
+# Os registros saem no mesmo formato do import-receitas (importacao.py), então
+# podem ir direto para o banco ou para um arquivo NDJSON.
+
+ESPECIALIDADES = [
+    "Culinária Brasileira", "Culinária Francesa", "Culinária Italiana", "Culinária Japonesa",
+    "Confeitaria", "Panificação", "Culinária Vegana", "Churrasco", "Frutos do Mar",
+    "Culinária Mexicana", "Culinária Árabe", "Culinária Nordestina",
+]
+NOMES = [
+    "Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Hugo", "Isabela", "João",
+    "Karina", "Lucas", "Mariana", "Nelson", "Olívia", "Paulo", "Rafaela", "Sérgio", "Tatiana", "Vítor",
+]
+SOBRENOMES = [
+    "Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Almeida", "Ferreira",
+    "Rodrigues", "Gomes", "Martins", "Araújo", "Barbosa", "Ribeiro", "Carvalho", "Rocha",
+]
+# em ordem de popularidade (os primeiros recebem mais peso no Zipf)
+INGREDIENTES_BASE = [
+    "sal", "cebola", "alho", "azeite", "pimenta-do-reino", "manteiga", "ovo", "farinha de trigo",
+    "açúcar", "leite", "tomate", "salsinha", "limão", "batata", "cenoura", "arroz", "frango",
+    "creme de leite", "queijo parmesão", "carne moída", "feijão", "pimentão", "cebolinha",
+    "fermento", "chocolate", "coentro", "milho", "abobrinha", "bacon", "camarão", "orégano",
+    "mandioca", "leite de coco", "gengibre", "canela", "mel", "iogurte", "espinafre", "cogumelo",
+    "peixe", "linguiça", "ervilha", "azeitona", "brócolis", "berinjela", "abóbora", "amendoim",
+]
+PRATOS = ["Bolo", "Torta", "Risoto", "Sopa", "Salada", "Molho", "Assado", "Refogado", "Escondidinho",
+          "Creme", "Pão", "Moqueca", "Farofa", "Suflê", "Omelete", "Quiche", "Ensopado", "Purê"]
+ESTILOS = ["da Vovó", "Rápido", "Cremoso", "Crocante", "Light", "de Domingo", "Caseiro", "Especial",
+           "ao Forno", "na Pressão", "Simples", "Gourmet"]
+UNIDADES = ["g", "kg", "ml", "xícara", "colher de sopa", "colher de chá", "unidade", "pitada", "a gosto"]
+PASSOS = ["Pique", "Misture", "Refogue", "Tempere", "Asse", "Cozinhe", "Bata", "Reserve", "Doure",
+          "Acrescente", "Leve à geladeira", "Sirva"]
+
+
+def _pesos_zipf(n, s=1.1):
+    """Pesos cumulativos de uma Zipf(s) para usar com random.choices(cum_weights=...)."""
+    return list(accumulate(1 / (posicao ** s) for posicao in range(1, n + 1)))
+
+
+def nomes_de_ingredientes(quantidade):
+    """Os comuns primeiro, depois "cauda longa" (ingrediente 48, 49, ...)."""
+    nomes = INGREDIENTES_BASE[:quantidade]
+    nomes += [f"ingrediente {n}" for n in range(len(nomes) + 1, quantidade + 1)]
+    return nomes
+
+
+def gerar_chefs(aleatorio, quantidade):
+    chefs = []
+    vistos = set()
+    for n in range(quantidade):
+        nome = f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)}"
+        if nome in vistos:
+            nome = f"{nome} {n}"  # o importador deduplica chefs pelo nome
+        vistos.add(nome)
+        chefs.append({
+            "nome": nome,
+            "especialidade": aleatorio.choice(ESPECIALIDADES),
+            "anos_experiencia": aleatorio.randint(1, 40),
+        })
+    return chefs
+
+
+def _quantidade(aleatorio):
+    unidade = aleatorio.choice(UNIDADES)
+    if unidade in ("a gosto", "pitada"):
+        return unidade
+    return f"{aleatorio.choice([1, 2, 3, 4, 5, 10, 50, 100, 200, 250, 500])} {unidade}"
+
+
+def gerar_receitas(semente=42, chefs=100, receitas=1000, ingredientes=500):
+    """Gera `receitas` registros (dicts no formato de importacao._normalizar)."""
+    aleatorio = random.Random(semente)
+    lista_chefs = gerar_chefs(aleatorio, chefs)
+    lista_ingredientes = nomes_de_ingredientes(ingredientes)
+    pesos_chefs = _pesos_zipf(len(lista_chefs), s=0.9)
+    pesos_ingredientes = _pesos_zipf(len(lista_ingredientes))
+    indices_chefs = range(len(lista_chefs))
+    indices_ingredientes = range(len(lista_ingredientes))
+
+    for n in range(receitas):
+        if n < len(lista_chefs):
+            chef = lista_chefs[n]  # todo chef tem ao menos uma receita
+        else:
+            chef = lista_chefs[aleatorio.choices(indices_chefs, cum_weights=pesos_chefs)[0]]
+        total = max(2, min(len(lista_ingredientes), round(aleatorio.gauss(8, 2.5))))
+        escolhidos = {}
+        while len(escolhidos) < total:
+            indice = aleatorio.choices(indices_ingredientes, cum_weights=pesos_ingredientes)[0]
+            escolhidos.setdefault(indice, _quantidade(aleatorio))
+        # o título leva o ingrediente menos comum ("Bolo de cenoura", não "de sal")
+        principal = lista_ingredientes[max(escolhidos)]
+        escolhidos = {lista_ingredientes[i]: qtd for i, qtd in escolhidos.items()}
+        passos = aleatorio.randint(2, 12)
+        yield {
+            "titulo": f"{aleatorio.choice(PRATOS)} de {principal} {aleatorio.choice(ESTILOS)} #{n + 1}",
+            "instrucoes": " ".join(
+                f"{i}. {aleatorio.choice(PASSOS)} {aleatorio.choice(list(escolhidos))}."
+                for i in range(1, passos + 1)
+            ),
+            "chef": chef["nome"],
+            "especialidade": chef["especialidade"],
+            "anos_experiencia": chef["anos_experiencia"],
+            "ingredientes": list(escolhidos.items()),
+        }
+
+
+def para_ndjson(registro):
+    """Registro gerado -> objeto no formato do export-receitas (NDJSON)."""
+    return {
+        "titulo": registro["titulo"],
+        "instrucoes": registro["instrucoes"],
+        "chef": {
+            "nome": registro["chef"],
+            "especialidade": registro["especialidade"],
+            "anos_experiencia": registro["anos_experiencia"],
+        },
+        "ingredientes": [{"nome": nome, "quantidade": qtd} for nome, qtd in registro["ingredientes"]],
+    }
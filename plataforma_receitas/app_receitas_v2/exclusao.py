@@ -0,0 +1,53 @@
+from sqlalchemy import event, func, or_, select
+
+from models import db, Chef, Receita, ReceitaIngrediente
+import busca
+import contadores
+import indice_ingredientes
+import versoes
+
+# ----------------- EXCLUSÃO EM CASCATA PELO BANCO -----------------
+# Chef -> perfil/receitas -> associações usam ON DELETE CASCADE com
+# passive_deletes: excluir um chef com 10 mil receitas é um único DELETE, sem
+# o ORM carregar (e apagar uma a uma) receitas e associações.
+# O que o banco apaga sozinho não passa pelos eventos do ORM, então antes do
+# flush este módulo resolve, com poucas consultas por conjunto:
+#   - receitas que vão sumir junto com os chefs excluídos -> índice de busca,
+#     índice de ingredientes e versão da tabela "receitas";
+#   - associações que vão sumir -> ingredientes.total_receitas.
+# Objetos que o ORM já tinha carregado e apaga ele mesmo continuam sendo
+# contados pelos hooks de cada módulo (e ficam fora das contas daqui).
+
+
+@event.listens_for(db.session, "before_flush")
+def _antes_da_cascata(session, flush_context, instances):
+    chef_ids = [obj.id for obj in session.deleted if isinstance(obj, Chef)]
+    receita_ids = [obj.id for obj in session.deleted if isinstance(obj, Receita)]
+    if not (chef_ids or receita_ids):
+        return
+
+    receitas = Receita.__table__
+    associacoes = ReceitaIngrediente.__table__
+    conexao = session.connection()
+
+    condicoes = []
+    if chef_ids:
+        dos_chefs = select(receitas.c.id).where(receitas.c.chef_id.in_(chef_ids))
+        cascata = set(conexao.execute(dos_chefs).scalars()) - set(receita_ids)
+        if cascata:
+            busca.marcar_removidas(session, cascata)
+            indice_ingredientes.marcar_removidas(session, cascata)
+            versoes.incrementar(conexao, {"receitas"})
+        condicoes.append(associacoes.c.receita_id.in_(dos_chefs))
+    if receita_ids:
+        condicoes.append(associacoes.c.receita_id.in_(receita_ids))
+
+    consulta = (
+        select(associacoes.c.ingrediente_id, func.count())
+        .where(or_(*condicoes))
+        .group_by(associacoes.c.ingrediente_id)
+    )
+    ja_no_orm = [obj.id for obj in session.deleted if isinstance(obj, ReceitaIngrediente) and obj.id]
+    if ja_no_orm:
+        consulta = consulta.where(associacoes.c.id.not_in(ja_no_orm))
+    contadores.aplicar(conexao, ingredientes={i: -n for i, n in conexao.execute(consulta)})
@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from models import db, Chef, PerfilChef, Receita, Ingrediente, ReceitaIngrediente
+
+# ----------------- EXPORTAÇÃO DO CATÁLOGO -----------------
+# Exporta todas as receitas (com chef, perfil e ingredientes) sem carregar a
+# tabela inteira na memória:
+#   - as receitas vêm de um cursor no servidor (yield_per/stream_results),
+#     LOTE linhas por vez, já com chef e perfil no mesmo SELECT (JOIN);
+#   - para cada lote, 1 SELECT ... WHERE receita_id IN (...) traz os
+#     ingredientes;
+#   - cada lote é escrito e descartado antes do próximo.
+# A memória usada depende do LOTE, não do tamanho do catálogo.
+# Formatos: csv, ndjson e parquet (colunar; precisa de `pip install pyarrow`).
+
+LOTE = 1000
+FORMATOS = ("csv", "ndjson", "parquet")
+TIPOS_MIME = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+COLUNAS_CSV = [
+    "id", "titulo", "instrucoes", "atualizado_em",
+    "chef_id", "chef_nome", "chef_especialidade", "chef_anos_experiencia",
+    "ingredientes",
+]
+
+
+def _ingredientes_do_lote(ids):
+    linhas = db.session.execute(
+        select(ReceitaIngrediente.receita_id, Ingrediente.nome, ReceitaIngrediente.quantidade)
+        .join(Ingrediente, ReceitaIngrediente.ingrediente_id == Ingrediente.id)
+        .where(ReceitaIngrediente.receita_id.in_(ids))
+        .order_by(ReceitaIngrediente.id)
+    )
+    por_receita = defaultdict(list)
+    for receita_id, nome, quantidade in linhas:
+        por_receita[receita_id].append({"nome": nome, "quantidade": quantidade})
+    return por_receita
+
+
+def lotes_de_receitas(lote=LOTE):
+    """Gera listas de até `lote` receitas (dicts), em ordem de id."""
+    consulta = (
+        select(
+            Receita.id, Receita.titulo, Receita.instrucoes, Receita.atualizado_em,
+            Chef.id.label("chef_id"), Chef.nome.label("chef_nome"),
+            PerfilChef.especialidade, PerfilChef.anos_experiencia,
+        )
+        .join(Chef, Receita.chef_id == Chef.id)
+        .outerjoin(PerfilChef, PerfilChef.chef_id == Chef.id)
+        .order_by(Receita.id)
+        .execution_options(yield_per=lote)
+    )
+    for linhas in db.session.execute(consulta).partitions():
+        ingredientes = _ingredientes_do_lote([linha.id for linha in linhas])
+        yield [
+            {
+                "id": linha.id,
+                "titulo": linha.titulo,
+                "instrucoes": linha.instrucoes,
+                "atualizado_em": linha.atualizado_em.isoformat() if linha.atualizado_em else None,
+                "chef": {
+                    "id": linha.chef_id,
+                    "nome": linha.chef_nome,
+                    "especialidade": linha.especialidade,
+                    "anos_experiencia": linha.anos_experiencia,
+                },
+                "ingredientes": ingredientes.get(linha.id, []),
+            }
+            for linha in linhas
+        ]
+
+# ----------------- FORMATOS -----------------
+def _linha_csv(receita):
+    chef = receita["chef"]
+    # mesmo formato do formulário ("nome:quantidade, ..."), para reimportar
+    ingredientes = ", ".join(f"{i['nome']}:{i['quantidade'] or ''}" for i in receita["ingredientes"])
+    return [
+        receita["id"], receita["titulo"], receita["instrucoes"], receita["atualizado_em"],
+        chef["id"], chef["nome"], chef["especialidade"], chef["anos_experiencia"],
+        ingredientes,
+    ]
+
+
+def gerar_csv(lotes):
+    """Gera o CSV em pedaços de texto (um por lote)."""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUNAS_CSV)
+    for receitas in lotes:
+        escritor.writerows(_linha_csv(r) for r in receitas)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gerar_ndjson(lotes):
+    """Gera o NDJSON em pedaços de texto (um por lote)."""
+    for receitas in lotes:
+        yield "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in receitas)
+
+
+def escrever_parquet(lotes, destino):
+    """Um row group por lote; `destino` é um caminho ou arquivo binário."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Exportar em parquet requer o pacote pyarrow (pip install pyarrow).")
+
+    esquema = pa.schema([
+        ("id", pa.int64()),
+        ("titulo", pa.string()),
+        ("instrucoes", pa.string()),
+        ("atualizado_em", pa.string()),
+        ("chef", pa.struct([
+            ("id", pa.int64()), ("nome", pa.string()),
+            ("especialidade", pa.string()), ("anos_experiencia", pa.int64()),
+        ])),
+        ("ingredientes", pa.list_(pa.struct([("nome", pa.string()), ("quantidade", pa.string())]))),
+    ])
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for receitas in lotes:
+            escritor.write_table(pa.Table.from_pylist(receitas, schema=esquema))
+
+
+def contar(lotes, contador):
+    """Repassa os lotes somando o número de receitas em contador["receitas"]."""
+    for receitas in lotes:
+        contador["receitas"] += len(receitas)
+        yield receitas
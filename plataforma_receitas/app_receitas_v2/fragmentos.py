@@ -0,0 +1,114 @@
+import json
+import threading
+
+from markupsafe import Markup
+
+from cache import CacheLRU
+
+# ----------------- CACHE DE FRAGMENTOS -----------------
+# Guarda o HTML já renderizado de cada card (receita/chef), com a versão da
+# entidade. No template:
+#     {% call fragmento('receita', receita.id, receita.versao, receita.chef.versao) %}
+#         ... card ...
+#     {% endcall %}
+# Se a versão guardada for a mesma, o corpo do bloco nem é executado.
+#   FRAGMENTOS_BACKEND  "memoria" (LRU por processo) ou "redis://host:6379/0"
+#   FRAGMENTOS_TAMANHO  itens no LRU em memória
+#   FRAGMENTOS_TTL      segundos até expirar (None = sem expiração)
+
+
+class BackendMemoria:
+    def __init__(self, tamanho=5000, ttl=None):
+        self._lru = CacheLRU(tamanho=tamanho, ttl=ttl)
+
+    def get(self, chave):
+        return self._lru.get(chave)
+
+    def set(self, chave, versao, html):
+        self._lru.set(chave, (versao, html))
+
+    def delete(self, chave):
+        self._lru.delete(chave)
+
+    def clear(self):
+        self._lru.clear()
+
+
+class BackendRedis:
+    """Compartilhado entre workers/máquinas. Requer `pip install redis`."""
+
+    def __init__(self, url, ttl=None, prefixo="fragmento:"):
+        import redis  # opcional: só quem usa o backend precisa do pacote
+
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = ttl
+        self._prefixo = prefixo
+
+    def get(self, chave):
+        bruto = self._redis.get(self._prefixo + chave)
+        if bruto is None:
+            return None
+        versao, html = json.loads(bruto)
+        return tuple(versao), html
+
+    def set(self, chave, versao, html):
+        self._redis.set(self._prefixo + chave, json.dumps([list(versao), html]), ex=self._ttl)
+
+    def delete(self, chave):
+        self._redis.delete(self._prefixo + chave)
+
+    def clear(self):
+        for chave in self._redis.scan_iter(self._prefixo + "*"):
+            self._redis.delete(chave)
+
+
+class CacheFragmentos:
+    def __init__(self):
+        self.backend = BackendMemoria()
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+
+    def init_app(self, app):
+        destino = app.config.get("FRAGMENTOS_BACKEND", "memoria")
+        ttl = app.config.get("FRAGMENTOS_TTL")
+        if destino.startswith("redis://"):
+            self.backend = BackendRedis(destino, ttl=ttl)
+        else:
+            self.backend = BackendMemoria(app.config.get("FRAGMENTOS_TAMANHO", 5000), ttl)
+        app.jinja_env.globals["fragmento"] = self.fragmento
+
+    def _contar(self, acerto):
+        with self._trava:
+            if acerto:
+                self.acertos += 1
+            else:
+                self.falhas += 1
+
+    def fragmento(self, tipo, entidade_id, *versao, caller):
+        chave = f"{tipo}:{entidade_id}"
+        guardado = self.backend.get(chave)
+        if guardado is not None and guardado[0] == versao:
+            self._contar(True)
+            return Markup(guardado[1])
+
+        self._contar(False)
+        html = str(caller())
+        self.backend.set(chave, versao, html)
+        return Markup(html)
+
+    def invalidar(self, tipo, entidade_id):
+        self.backend.delete(f"{tipo}:{entidade_id}")
+
+    def estatisticas(self):
+        with self._trava:
+            total = self.acertos + self.falhas
+            return {
+                "backend": type(self.backend).__name__,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / total, 3) if total else None,
+            }
+
+
+fragmentos = CacheFragmentos()
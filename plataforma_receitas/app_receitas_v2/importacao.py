@@ -0,0 +1,272 @@
+import contextlib
+import csv
+import json
+import os
+import time
+from collections import Counter
+from itertools import islice
+
+from sqlalchemy import insert, select
+
+from models import db, agora, Chef, PerfilChef, Receita, ReceitaIngrediente
+from ingredientes import ids_dos_ingredientes
+from compartilhado.ingredientes import interpretar_ingredientes, sem_repetidos
+import busca
+import contadores
+import indice_ingredientes
+import migracoes
+import versoes
+
+# ----------------- IMPORTAÇÃO EM MASSA -----------------
+# Lê um CSV/NDJSON de receitas (o mesmo formato do export-receitas) e grava
+# em lotes, sem criar objetos do ORM:
+#   - chefs e ingredientes ficam num dicionário nome -> id na memória, então
+#     cada nome é procurado/criado uma vez só no arquivo inteiro;
+#   - cada lote vira poucos INSERTs com executemany (receitas, perfis,
+#     associações) e a transação é confirmada a cada `lotes_por_commit`;
+#   - depois de cada commit o número de registros lidos vai para um arquivo
+#     de checkpoint; se o processo cair, a próxima execução continua dali.
+# Versões (ETag), contadores, índice de busca e índice de ingredientes são atualizados
+# no mesmo commit de cada lote.
+
+LOTE = 5000
+LOTES_POR_COMMIT = 1
+
+
+def detectar_formato(caminho):
+    return "csv" if caminho.lower().endswith(".csv") else "ndjson"
+
+# ----------------- LEITURA -----------------
+def _inteiro(valor):
+    try:
+        return int(valor) if valor not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalizar(bruto):
+    """Registro do CSV (colunas chef_*) ou do NDJSON (objeto chef) -> dict."""
+    chef = bruto.get("chef")
+    if isinstance(chef, dict):
+        chef_nome = chef.get("nome")
+        especialidade = chef.get("especialidade")
+        anos = chef.get("anos_experiencia")
+    else:
+        chef_nome = bruto.get("chef_nome") or chef
+        especialidade = bruto.get("chef_especialidade")
+        anos = bruto.get("chef_anos_experiencia")
+
+    ingredientes = bruto.get("ingredientes") or ""
+    if isinstance(ingredientes, list):
+        pares = [((i.get("nome") or "").strip().lower(), i.get("quantidade") or "")
+                 for i in ingredientes]
+        pares = sem_repetidos((nome, qtd) for nome, qtd in pares if nome)
+    else:
+        pares = interpretar_ingredientes(ingredientes)
+
+    titulo = (bruto.get("titulo") or "").strip()
+    chef_nome = (chef_nome or "").strip()
+    if not titulo or not chef_nome:
+        return None
+    return {
+        "titulo": titulo,
+        "instrucoes": bruto.get("instrucoes") or "",
+        "chef": chef_nome,
+        "especialidade": especialidade or None,
+        "anos_experiencia": _inteiro(anos),
+        "ingredientes": pares,
+    }
+
+
+def ler_registros(arquivo, formato):
+    """Gera um dict normalizado por registro (None = registro inválido)."""
+    if formato == "csv":
+        for bruto in csv.DictReader(arquivo):
+            yield _normalizar(bruto)
+    else:
+        for linha in arquivo:
+            if not linha.strip():
+                continue
+            try:
+                bruto = json.loads(linha)
+            except ValueError:
+                yield None
+                continue
+            yield _normalizar(bruto) if isinstance(bruto, dict) else None
+
+# ----------------- CHECKPOINT -----------------
+def caminho_checkpoint(caminho):
+    return caminho + ".checkpoint"
+
+
+def ler_checkpoint(caminho):
+    """Quantos registros do arquivo já foram confirmados (0 se nenhum)."""
+    try:
+        with open(caminho_checkpoint(caminho), encoding="utf-8") as arquivo:
+            return int(json.load(arquivo)["registros"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0
+
+
+def gravar_checkpoint(caminho, registros):
+    temporario = caminho_checkpoint(caminho) + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump({"registros": registros}, arquivo)
+    os.replace(temporario, caminho_checkpoint(caminho))  # atômico
+
+# ----------------- GRAVAÇÃO -----------------
+class Importador:
+    def __init__(self, lote=LOTE, lotes_por_commit=LOTES_POR_COMMIT):
+        self.lote = lote
+        self.lotes_por_commit = lotes_por_commit
+        self.chefs = {}          # nome -> id
+        self.ingredientes = {}   # nome -> id
+        self.receitas = 0
+        self.chefs_novos = 0
+        self.ignorados = 0
+
+    def carregar_chefs(self):
+        # nome do chef não é único no banco: fica o de menor id
+        for chef_id, nome in db.session.execute(select(Chef.id, Chef.nome).order_by(Chef.id.desc())):
+            self.chefs[nome] = chef_id
+
+    def _inserir_retornando_ids(self, tabela, linhas):
+        if not linhas:
+            return []
+        resultado = db.session.execute(
+            insert(tabela).returning(tabela.c.id, sort_by_parameter_order=True), linhas
+        )
+        return resultado.scalars().all()
+
+    def _resolver_chefs(self, registros):
+        novos = {}
+        for r in registros:
+            if r["chef"] not in self.chefs and r["chef"] not in novos:
+                novos[r["chef"]] = r
+        if not novos:
+            return 0
+        momento = agora()
+        ids = self._inserir_retornando_ids(
+            Chef.__table__,
+            [{"nome": nome, "versao": 1, "atualizado_em": momento} for nome in novos],
+        )
+        db.session.execute(insert(PerfilChef.__table__), [
+            {"chef_id": chef_id, "especialidade": r["especialidade"],
+             "anos_experiencia": r["anos_experiencia"]}
+            for chef_id, r in zip(ids, novos.values())
+        ])
+        self.chefs.update(zip(novos, ids))
+        self.chefs_novos += len(ids)
+        return len(ids)
+
+    def _resolver_ingredientes(self, registros):
+        faltando = {nome for r in registros for nome, _ in r["ingredientes"]
+                    if nome not in self.ingredientes}
+        if faltando:
+            self.ingredientes.update(ids_dos_ingredientes(sorted(faltando)))
+
+    def gravar_lote(self, registros):
+        """INSERT das receitas do lote e das associações (sem commit)."""
+        chefs_novos = self._resolver_chefs(registros)
+        self._resolver_ingredientes(registros)
+
+        momento = agora()
+        receita_ids = self._inserir_retornando_ids(Receita.__table__, [
+            {"titulo": r["titulo"], "instrucoes": r["instrucoes"],
+             "chef_id": self.chefs[r["chef"]], "versao": 1, "atualizado_em": momento,
+             "total_ingredientes": len(r["ingredientes"])}
+            for r in registros
+        ])
+        associacoes = [
+            {"receita_id": receita_id, "ingrediente_id": self.ingredientes[nome],
+             "quantidade": quantidade}
+            for receita_id, r in zip(receita_ids, registros)
+            for nome, quantidade in r["ingredientes"]
+        ]
+        if associacoes:
+            db.session.execute(insert(ReceitaIngrediente.__table__), associacoes)
+
+        # Escritas via Core não passam pelos eventos do ORM: avisa quem depende
+        conexao = db.session.connection()
+        contadores.aplicar(
+            conexao,
+            chefs=Counter(self.chefs[r["chef"]] for r in registros),
+            ingredientes=Counter(a["ingrediente_id"] for a in associacoes),
+        )
+        versoes.incrementar_chefs(conexao, {self.chefs[r["chef"]] for r in registros}, momento)
+        versoes.incrementar(conexao, {"receitas", "chefs"} if chefs_novos else {"receitas"}, momento)
+        busca.marcar_alteradas(db.session, receita_ids)
+        indice_ingredientes.marcar_alteradas(db.session, receita_ids)
+        self.receitas += len(receita_ids)
+
+    def importar(self, registros, ja_lidos=0, ao_confirmar=None):
+        """Consome `registros` (a partir do registro `ja_lidos`) em lotes.
+
+        `ao_confirmar(lidos)` é chamado depois de cada commit com o total de
+        registros do arquivo já processados (para o checkpoint/progresso).
+        """
+        self.carregar_chefs()
+        registros = iter(registros)
+        lidos = confirmados = ja_lidos
+        lotes_pendentes = 0
+        while True:
+            bloco = list(islice(registros, self.lote))
+            if not bloco:
+                break
+            lidos += len(bloco)
+            validos = [r for r in bloco if r is not None]
+            self.ignorados += len(bloco) - len(validos)
+            if validos:
+                self.gravar_lote(validos)
+                lotes_pendentes += 1
+            if lotes_pendentes >= self.lotes_por_commit:
+                self._confirmar(lidos, ao_confirmar)
+                confirmados, lotes_pendentes = lidos, 0
+        if lidos != confirmados:
+            self._confirmar(lidos, ao_confirmar)
+        return lidos
+
+    def _confirmar(self, lidos, ao_confirmar):
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # o commit desfeito pode ter criado chefs/ingredientes: esquece o cache
+            self.chefs.clear()
+            self.ingredientes.clear()
+            raise
+        if ao_confirmar:
+            ao_confirmar(lidos)
+
+
+def importar_arquivo(caminho, formato=None, lote=LOTE, lotes_por_commit=LOTES_POR_COMMIT,
+                     retomar=True, progresso=None):
+    """Importa `caminho` e devolve o Importador (com os contadores).
+
+    `progresso(importador, lidos, segundos)` é chamado a cada commit.
+    """
+    formato = formato or detectar_formato(caminho)
+    # sem os índices/UNIQUE das migrações, indexar a busca de cada lote varre
+    # a tabela inteira (e o executemany das associações pode falhar no meio)
+    faltando = migracoes.pendentes(db.session.connection())
+    if faltando:
+        raise RuntimeError(
+            f"banco desatualizado ({', '.join(m.id for m in faltando)}): rode `flask migrar` antes de importar"
+        )
+    ja_lidos = ler_checkpoint(caminho) if retomar else 0
+    importador = Importador(lote=lote, lotes_por_commit=lotes_por_commit)
+    inicio = time.perf_counter()
+
+    def ao_confirmar(lidos):
+        gravar_checkpoint(caminho, lidos)
+        if progresso:
+            progresso(importador, lidos, time.perf_counter() - inicio)
+
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        registros = islice(ler_registros(arquivo, formato), ja_lidos, None)
+        importador.importar(registros, ja_lidos=ja_lidos, ao_confirmar=ao_confirmar)
+
+    # terminou: a próxima execução com o mesmo arquivo começa do zero
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(caminho_checkpoint(caminho))
+    return importador
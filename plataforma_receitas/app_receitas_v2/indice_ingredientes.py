@@ -0,0 +1,99 @@
+from sqlalchemy import event, select
+
+from models import db, Ingrediente, Receita, ReceitaIngrediente, VersaoTabela
+from compartilhado.indice_ingredientes import IndiceInvertido
+
+# ----------------- ÍNDICE INVERTIDO DE INGREDIENTES -----------------
+# Estrutura (bitsets por ingrediente) em compartilhado/indice_ingredientes.py.
+# O índice vive na memória de cada processo: é carregado na primeira consulta
+# e atualizado a cada commit deste processo que mexe em receitas/associações.
+# Escritas de outros processos (outros workers, `flask import-receitas`,
+# worker da fila) não passam por esses hooks: o índice guarda a versão da
+# tabela "receitas" (versoes.py) com que está em dia e cada consulta confere
+# essa versão (uma leitura por chave primária); mudou fora daqui, recarrega.
+
+
+indice = IndiceInvertido()
+
+
+def _pares(receita_ids=None):
+    sql = select(ReceitaIngrediente.receita_id, ReceitaIngrediente.ingrediente_id) \
+        .where(ReceitaIngrediente.receita_id.is_not(None),
+               ReceitaIngrediente.ingrediente_id.is_not(None))
+    if receita_ids is not None:
+        sql = sql.where(ReceitaIngrediente.receita_id.in_(receita_ids))
+    return db.session.execute(sql)
+
+
+def _versao(session):
+    t = VersaoTabela.__table__
+    return session.execute(select(t.c.versao).where(t.c.nome == "receitas")).scalar() or 0
+
+
+def obter_indice():
+    versao = _versao(db.session)  # antes dos pares: escrita no meio só força outra recarga
+    if not indice.carregado or indice.versao != versao:
+        indice.carregar(_pares(), versao)
+    return indice
+
+
+def receitas_com_ingredientes(nomes, limite=20):
+    """Recebe nomes de ingredientes e devolve [(receita_id, cobertos)]."""
+    nomes = {nome.strip().lower() for nome in nomes if nome.strip()}
+    if not nomes:
+        return []
+    ids = db.session.execute(
+        select(Ingrediente.id).where(Ingrediente.nome.in_(nomes))
+    ).scalars().all()
+    return obter_indice().consultar(ids, limite=limite)
+
+# ----------------- MANUTENÇÃO INCREMENTAL -----------------
+
+@event.listens_for(db.session, "after_flush")
+def _anotar_alteracoes(session, flush_context):
+    alterados = session.info.setdefault("indice_alterados", set())
+    removidos = session.info.setdefault("indice_removidos", set())
+    deletados = session.deleted  # cada acesso monta um conjunto novo
+    for obj in session.new | session.dirty | deletados:
+        if isinstance(obj, Receita):
+            (removidos if obj in deletados else alterados).add(obj.id)
+        elif isinstance(obj, ReceitaIngrediente) and obj.receita_id:
+            alterados.add(obj.receita_id)
+
+
+def marcar_alteradas(session, receita_ids):
+    """Para escritas feitas via Core (sem objetos na sessão): atualiza no commit."""
+    session.info.setdefault("indice_alterados", set()).update(receita_ids)
+
+
+def marcar_removidas(session, receita_ids):
+    """Receitas apagadas pelo banco (ON DELETE CASCADE): saem do índice no commit."""
+    session.info.setdefault("indice_removidos", set()).update(receita_ids)
+
+
+@event.listens_for(db.session, "before_commit")
+def _coletar(session):
+    session.flush()
+    alterados = session.info.pop("indice_alterados", set())
+    removidos = session.info.pop("indice_removidos", set())
+    if not indice.carregado or not (alterados or removidos):
+        return
+    alterados -= removidos
+    novos = {receita_id: set() for receita_id in alterados}
+    if alterados:
+        for receita_id, ingrediente_id in _pares(alterados):
+            novos[receita_id].add(ingrediente_id)
+    session.info["indice_pendente"] = (novos, removidos, _versao(session))
+
+
+@event.listens_for(db.session, "after_commit")
+def _aplicar(session):
+    pendente = session.info.pop("indice_pendente", None)
+    if pendente:
+        indice.atualizar(*pendente)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _descartar(session, previous_transaction):
+    for chave in ("indice_alterados", "indice_removidos", "indice_pendente"):
+        session.info.pop(chave, None)
@@ -0,0 +1,52 @@
+from collections import Counter
+
+from sqlalchemy import insert, select
+
+from models import db, Ingrediente, ReceitaIngrediente
+from compartilhado.ingredientes import inserir_ignorando_duplicados, resolver_ingredientes
+import contadores
+
+# ----------------- INGREDIENTES EM LOTE -----------------
+# Busca/criação em lote e a leitura do formulário ficam em
+# compartilhado/ingredientes.py (iguais no v1). Aqui: a versão só com ids
+# para a importação em massa e a associação com a receita, que no v2 também
+# atualiza os contadores.
+
+
+def ids_dos_ingredientes(nomes, lote=500):
+    """Como resolver_ingredientes, mas só {nome: id} via Core (importação em massa)."""
+    nomes = list(dict.fromkeys(nomes))
+    tabela = Ingrediente.__table__
+    ids = {}
+    for inicio in range(0, len(nomes), lote):
+        parte = nomes[inicio:inicio + lote]
+        consulta = select(tabela.c.nome, tabela.c.id).where(tabela.c.nome.in_(parte))
+        ids.update(db.session.execute(consulta).all())
+        faltando = [nome for nome in parte if nome not in ids]
+        if faltando:
+            inserir_ignorando_duplicados(db.session, tabela, faltando)
+            consulta = select(tabela.c.nome, tabela.c.id).where(tabela.c.nome.in_(faltando))
+            ids.update(db.session.execute(consulta).all())
+    return ids
+
+
+def associar_ingredientes(receita, pares):
+    """Cria as linhas de receitas_ingredientes de `receita` num só INSERT."""
+    if not pares:
+        return
+    ingredientes = resolver_ingredientes(db.session, Ingrediente, (nome for nome, _ in pares))
+    db.session.flush()  # garante receita.id
+    db.session.execute(insert(ReceitaIngrediente), [
+        {
+            "receita_id": receita.id,
+            "ingrediente_id": ingredientes[nome].id,
+            "quantidade": quantidade,
+        }
+        for nome, quantidade in pares
+    ])
+    # INSERT via Core não passa pelo after_flush dos contadores
+    contadores.aplicar(
+        db.session.connection(),
+        receitas={receita.id: len(pares)},
+        ingredientes=Counter(ingredientes[nome].id for nome, _ in pares),
+    )
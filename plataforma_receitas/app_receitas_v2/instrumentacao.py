@@ -0,0 +1,230 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+from models import db
+
+# ----------------- INSTRUMENTAÇÃO POR REQUEST -----------------
+# Opcional (INSTRUMENTACAO=1). Para cada request mede:
+#   - quantas consultas SQL foram feitas e quanto tempo passaram no banco;
+#   - as consultas mais lentas e a consulta mais repetida (N+1 aparece como
+#     o mesmo SELECT repetido dezenas de vezes);
+#   - tempo de render dos templates e tamanho da resposta.
+# E publica em três lugares:
+#   - cabeçalho Server-Timing (aparece no DevTools do navegador, aba Timing);
+#   - uma linha de log JSON por request (logger "receitas.metricas");
+#   - /admin/metrics, agregado por endpoint no formato texto do Prometheus.
+# Os agregados são por processo (cada worker do gunicorn tem os seus).
+# Respostas em streaming: o que roda enquanto o corpo é gerado não é contado.
+#   INSTRUMENTACAO_LIMITE_SQL   acima disso o log sai como WARNING (N+1?)
+#   INSTRUMENTACAO_REPETICOES   mesma consulta N vezes no request = suspeita de N+1
+#   INSTRUMENTACAO_LENTAS       quantas consultas lentas vão para o log
+
+logger = logging.getLogger("receitas.metricas")
+
+BALDES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Agregado:
+    def __init__(self):
+        self.requests = Counter()                   # (endpoint, metodo, status) -> n
+        self.baldes = defaultdict(lambda: [0] * len(BALDES))
+        self.duracao = Counter()                    # endpoint -> segundos
+        self.contagem = Counter()                   # endpoint -> requests
+        self.sql = Counter()                        # endpoint -> consultas
+        self.sql_segundos = Counter()
+        self.sql_maximo = Counter()                 # endpoint -> maior nº de consultas num request
+        self.template_segundos = Counter()
+        self.bytes = Counter()
+
+
+class Instrumentacao:
+    def __init__(self):
+        self.ativa = False
+        self.limite_sql = 30
+        self.repeticoes = 5
+        self.lentas = 3
+        self._agregado = _Agregado()
+        self._trava = threading.Lock()
+
+    def init_app(self, app):
+        self.ativa = app.config.get("INSTRUMENTACAO", False)
+        if not self.ativa:
+            return
+        self.limite_sql = app.config.get("INSTRUMENTACAO_LIMITE_SQL", 30)
+        self.repeticoes = app.config.get("INSTRUMENTACAO_REPETICOES", 5)
+        self.lentas = app.config.get("INSTRUMENTACAO_LENTAS", 3)
+
+        if not logger.handlers:
+            # uma linha JSON por request no stderr (o gunicorn já coleta)
+            manipulador = logging.StreamHandler()
+            manipulador.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(manipulador)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", self._antes_consulta)
+        event.listen(engine, "after_cursor_execute", self._depois_consulta)
+        before_render_template.connect(self._antes_template, app)
+        template_rendered.connect(self._depois_template, app)
+        app.before_request(self._iniciar)
+        app.after_request(self._finalizar)
+
+    # ----------------- COLETA -----------------
+    def _iniciar(self):
+        g.metricas = {
+            "inicio": time.perf_counter(),
+            "sql": 0,
+            "sql_segundos": 0.0,
+            "consultas": [],        # (segundos, sql)
+            "template_segundos": 0.0,
+            "templates": [],        # pilha de inícios (templates aninhados)
+        }
+
+    def _metricas(self):
+        return g.get("metricas") if has_request_context() else None
+
+    def _antes_consulta(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("instrumentacao_inicio", []).append(time.perf_counter())
+
+    def _depois_consulta(self, conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["instrumentacao_inicio"].pop()
+        metricas = self._metricas()
+        if metricas is None:
+            return
+        decorrido = time.perf_counter() - inicio
+        metricas["sql"] += 1
+        metricas["sql_segundos"] += decorrido
+        metricas["consultas"].append((decorrido, statement))
+
+    def _antes_template(self, app, template, context, **extra):
+        metricas = self._metricas()
+        if metricas is not None:
+            metricas["templates"].append(time.perf_counter())
+
+    def _depois_template(self, app, template, context, **extra):
+        metricas = self._metricas()
+        if metricas is not None and metricas["templates"]:
+            decorrido = time.perf_counter() - metricas["templates"].pop()
+            if not metricas["templates"]:  # só o de fora (o de dentro já está contido)
+                metricas["template_segundos"] += decorrido
+
+    # ----------------- PUBLICAÇÃO -----------------
+    def _finalizar(self, resposta):
+        metricas = g.pop("metricas", None)
+        if metricas is None:
+            return resposta
+        total = time.perf_counter() - metricas["inicio"]
+        tamanho = resposta.calculate_content_length()
+        endpoint = request.endpoint or "sem_rota"
+
+        resposta.headers.add(
+            "Server-Timing",
+            f'db;dur={metricas["sql_segundos"] * 1000:.1f};desc="{metricas["sql"]} consultas", '
+            f'tpl;dur={metricas["template_segundos"] * 1000:.1f}, '
+            f'app;dur={total * 1000:.1f}',
+        )
+
+        consultas = metricas["consultas"]
+        mais_lentas = sorted(consultas, key=lambda c: c[0], reverse=True)[:self.lentas]
+        repetida, vezes = Counter(sql for _, sql in consultas).most_common(1)[0] if consultas else (None, 0)
+        suspeita_n_mais_1 = vezes >= self.repeticoes
+        linha = {
+            "metodo": request.method,
+            "caminho": request.path,
+            "endpoint": endpoint,
+            "status": resposta.status_code,
+            "ms": round(total * 1000, 2),
+            "sql": metricas["sql"],
+            "sql_ms": round(metricas["sql_segundos"] * 1000, 2),
+            "template_ms": round(metricas["template_segundos"] * 1000, 2),
+            "bytes": tamanho,
+            "mais_lentas": [{"ms": round(s * 1000, 2), "sql": " ".join(sql.split())[:200]}
+                            for s, sql in mais_lentas],
+        }
+        if suspeita_n_mais_1:
+            linha["n_mais_1"] = {"vezes": vezes, "sql": " ".join(repetida.split())[:200]}
+        nivel = logging.WARNING if suspeita_n_mais_1 or metricas["sql"] > self.limite_sql else logging.INFO
+        logger.log(nivel, json.dumps(linha, ensure_ascii=False))
+
+        self._agregar(endpoint, request.method, resposta.status_code, total, metricas, tamanho)
+        return resposta
+
+    def _agregar(self, endpoint, metodo, status, total, metricas, tamanho):
+        with self._trava:
+            a = self._agregado
+            a.requests[(endpoint, metodo, str(status))] += 1
+            baldes = a.baldes[endpoint]
+            for i, limite in enumerate(BALDES):
+                if total <= limite:
+                    baldes[i] += 1
+            a.duracao[endpoint] += total
+            a.contagem[endpoint] += 1
+            a.sql[endpoint] += metricas["sql"]
+            a.sql_segundos[endpoint] += metricas["sql_segundos"]
+            a.sql_maximo[endpoint] = max(a.sql_maximo[endpoint], metricas["sql"])
+            a.template_segundos[endpoint] += metricas["template_segundos"]
+            a.bytes[endpoint] += tamanho or 0
+
+    def prometheus(self):
+        """Agregados no formato texto do Prometheus (version=0.0.4)."""
+        linhas = []
+
+        def metrica(nome, tipo, ajuda, valores):
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            for rotulos, valor in valores:
+                texto = ",".join(f'{chave}="{_escapar(v)}"' for chave, v in rotulos)
+                linhas.append(f"{nome}{{{texto}}} {_numero(valor)}" if texto else f"{nome} {_numero(valor)}")
+
+        with self._trava:
+            a = self._agregado
+            endpoints = sorted(a.contagem)
+            metrica("receitas_requests_total", "counter", "Requests por endpoint, método e status.",
+                    [((("endpoint", e), ("metodo", m), ("status", s)), n)
+                     for (e, m, s), n in sorted(a.requests.items())])
+
+            linhas.append("# HELP receitas_request_duracao_segundos Tempo total do request.")
+            linhas.append("# TYPE receitas_request_duracao_segundos histogram")
+            for e in endpoints:
+                for limite, n in zip(BALDES, a.baldes[e]):
+                    linhas.append(f'receitas_request_duracao_segundos_bucket{{endpoint="{_escapar(e)}",le="{limite}"}} {n}')
+                linhas.append(f'receitas_request_duracao_segundos_bucket{{endpoint="{_escapar(e)}",le="+Inf"}} {a.contagem[e]}')
+                linhas.append(f'receitas_request_duracao_segundos_sum{{endpoint="{_escapar(e)}"}} {_numero(a.duracao[e])}')
+                linhas.append(f'receitas_request_duracao_segundos_count{{endpoint="{_escapar(e)}"}} {a.contagem[e]}')
+
+            por_endpoint = lambda contador: [((("endpoint", e),), contador[e]) for e in endpoints]  # noqa: E731
+            metrica("receitas_sql_consultas_total", "counter", "Consultas SQL feitas pelos requests.",
+                    por_endpoint(a.sql))
+            metrica("receitas_sql_duracao_segundos_total", "counter", "Tempo gasto no banco.",
+                    por_endpoint(a.sql_segundos))
+            metrica("receitas_sql_consultas_por_request_max", "gauge",
+                    "Maior número de consultas num único request (N+1 aparece aqui).",
+                    por_endpoint(a.sql_maximo))
+            metrica("receitas_template_duracao_segundos_total", "counter", "Tempo renderizando templates.",
+                    por_endpoint(a.template_segundos))
+            metrica("receitas_resposta_bytes_total", "counter", "Bytes enviados no corpo das respostas.",
+                    por_endpoint(a.bytes))
+        return "\n".join(linhas) + "\n"
+
+    def limpar(self):
+        with self._trava:
+            self._agregado = _Agregado()
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _numero(valor):
+    return repr(round(valor, 6)) if isinstance(valor, float) else str(valor)
+
+
+instrumentacao = Instrumentacao()
@@ -0,0 +1,233 @@
+import re
+import time
+from collections import namedtuple
+
+from sqlalchemy import inspect, insert, select
+from sqlalchemy.schema import CreateTable
+
+from models import (
+    db, agora, Chef, Ingrediente, MigracaoAplicada, PerfilChef, Receita, ReceitaIngrediente, Tarefa,
+    VersaoTabela,
+)
+import contadores
+
+# ----------------- MIGRAÇÕES DE ESQUEMA -----------------
+# `flask init-db` apaga tudo (drop_all); para bancos com dados, as mudanças
+# de esquema viram migrações numeradas, aplicadas em ordem com `flask migrar`:
+#   - cada migração roda na sua própria transação e só é anotada em
+#     schema_migracoes se terminar inteira;
+#   - toda migração é idempotente (confere o que já existe antes de mudar),
+#     então um banco criado por create_all numa versão intermediária também
+#     pode rodar todas;
+#   - bancos novos (init-db) já nascem com o esquema final e todas marcadas.
+# O SQLite não altera chaves estrangeiras de uma tabela existente: nesses
+# casos a tabela é recriada (CREATE nova, copia, DROP, RENAME) com as chaves
+# desligadas e um PRAGMA foreign_key_check antes do COMMIT.
+
+Migracao = namedtuple("Migracao", "id descricao funcao recria_tabelas")
+
+MIGRACOES = []
+
+
+def migracao(identificador, recria_tabelas=False):
+    def registrar(funcao):
+        MIGRACOES.append(Migracao(identificador, (funcao.__doc__ or "").strip(), funcao, recria_tabelas))
+        return funcao
+    return registrar
+
+# ----------------- AUXILIARES -----------------
+def _colunas(conexao, tabela):
+    return {coluna["name"] for coluna in inspect(conexao).get_columns(tabela)}
+
+
+def _indices(conexao, tabela):
+    return {indice["name"] for indice in inspect(conexao).get_indexes(tabela)}
+
+
+def _criar_indices(conexao, tabela):
+    existentes = _indices(conexao, tabela.name)
+    for indice in tabela.indexes:
+        if indice.name not in existentes:
+            indice.create(conexao)
+
+
+def _adicionar_coluna(conexao, coluna, padrao=None):
+    """ALTER TABLE ... ADD COLUMN a partir da coluna do modelo (com o server_default).
+
+    `padrao`: literal SQL para o DEFAULT quando o modelo só tem default em
+    Python (NOT NULL sem DEFAULT não pode ser adicionada a tabela com linhas).
+    """
+    if coluna.name in _colunas(conexao, coluna.table.name):
+        return
+    definicao = f"{coluna.name} {coluna.type.compile(conexao.dialect)}"
+    if padrao is not None:
+        definicao += f" DEFAULT {padrao}"
+    elif coluna.server_default is not None:
+        definicao += f" DEFAULT {coluna.server_default.arg}"
+    if not coluna.nullable:
+        definicao += " NOT NULL"
+    conexao.exec_driver_sql(f"ALTER TABLE {coluna.table.name} ADD COLUMN {definicao}")
+
+
+def _sem_cascata(conexao, tabela):
+    """Chaves estrangeiras da tabela no banco que ainda não têm ON DELETE CASCADE."""
+    return [
+        chave for chave in inspect(conexao).get_foreign_keys(tabela.name)
+        if (chave.get("options", {}).get("ondelete") or "").upper() != "CASCADE"
+    ]
+
+
+def _valor_padrao(coluna):
+    """Valor para preencher `coluna` nas linhas antigas (server_default ou default do modelo)."""
+    if coluna.server_default is not None:
+        return str(coluna.server_default.arg)
+    if coluna.default is not None:
+        return coluna.default.arg(None) if coluna.default.is_callable else coluna.default.arg
+    return None
+
+
+def _recriar_tabela_sqlite(conexao, tabela):
+    """Recria `tabela` com a definição atual do modelo, mantendo os dados."""
+    nova = f"{tabela.name}__nova"
+    ddl = str(CreateTable(tabela).compile(dialect=conexao.dialect))
+    ddl = re.sub(rf"CREATE TABLE {tabela.name}\b", f"CREATE TABLE {nova}", ddl, count=1)
+    existentes = _colunas(conexao, tabela.name)
+    copiadas = [c.name for c in tabela.columns if c.name in existentes]
+    # colunas NOT NULL que o banco antigo não tem entram com o valor padrão
+    faltando = [c for c in tabela.columns if c.name not in existentes and not c.nullable]
+    destino = ", ".join(copiadas + [c.name for c in faltando])
+    origem = ", ".join(copiadas + ["?"] * len(faltando))
+    conexao.exec_driver_sql(ddl)
+    conexao.exec_driver_sql(f"INSERT INTO {nova} ({destino}) SELECT {origem} FROM {tabela.name}",
+                            tuple(_valor_padrao(c) for c in faltando))
+    conexao.exec_driver_sql(f"DROP TABLE {tabela.name}")
+    conexao.exec_driver_sql(f"ALTER TABLE {nova} RENAME TO {tabela.name}")
+    _criar_indices(conexao, tabela)
+
+# ----------------- MIGRAÇÕES -----------------
+@migracao("0000_versoes")
+def _versoes(conexao):
+    """Colunas versao/atualizado_em em receitas e chefs e a tabela `versoes` (ETags, versoes.py)."""
+    momento = f"'{agora().isoformat(sep=' ')}'"
+    for tabela in (Receita.__table__, Chef.__table__):
+        _adicionar_coluna(conexao, tabela.c.versao)
+        _adicionar_coluna(conexao, tabela.c.atualizado_em, padrao=momento)
+    VersaoTabela.__table__.create(conexao, checkfirst=True)
+
+
+@migracao("0001_associacoes_unicas")
+def _associacoes_unicas(conexao):
+    """Remove associações repetidas/órfãs e cria UNIQUE(receita_id, ingrediente_id)."""
+    conexao.exec_driver_sql("""
+        DELETE FROM receitas_ingredientes
+         WHERE receita_id IS NULL OR ingrediente_id IS NULL
+            OR receita_id NOT IN (SELECT id FROM receitas)
+            OR ingrediente_id NOT IN (SELECT id FROM ingredientes)
+            OR id NOT IN (SELECT min(id) FROM receitas_ingredientes GROUP BY receita_id, ingrediente_id)
+    """)
+    # o índice só em receita_id vira prefixo do UNIQUE (receita_id, ingrediente_id)
+    conexao.exec_driver_sql("DROP INDEX IF EXISTS ix_receitas_ingredientes_receita_id")
+    _criar_indices(conexao, ReceitaIngrediente.__table__)
+
+
+@migracao("0002_indices_chaves_estrangeiras")
+def _indices_chaves_estrangeiras(conexao):
+    """Índices em receitas.chef_id e perfis_chefs.chef_id (detalhes do chef, exclusão em cascata)."""
+    _criar_indices(conexao, Receita.__table__)
+    _criar_indices(conexao, PerfilChef.__table__)
+
+
+@migracao("0003_contadores")
+def _contadores(conexao):
+    """Colunas de contadores (contadores.py), preenchidas a partir das tabelas."""
+    _adicionar_coluna(conexao, Chef.__table__.c.total_receitas)
+    _adicionar_coluna(conexao, Ingrediente.__table__.c.total_receitas)
+    _adicionar_coluna(conexao, Receita.__table__.c.total_ingredientes)
+    _criar_indices(conexao, Chef.__table__)
+    _criar_indices(conexao, Ingrediente.__table__)
+    contadores.reconciliar(conexao)
+
+
+@migracao("0004_exclusao_em_cascata", recria_tabelas=True)
+def _exclusao_em_cascata(conexao):
+    """ON DELETE CASCADE em perfis_chefs, receitas e receitas_ingredientes."""
+    for tabela in (PerfilChef.__table__, Receita.__table__, ReceitaIngrediente.__table__):
+        chaves = _sem_cascata(conexao, tabela)
+        if not chaves:
+            continue
+        if conexao.dialect.name == "sqlite":
+            _recriar_tabela_sqlite(conexao, tabela)
+            continue
+        for chave in chaves:
+            colunas = ", ".join(chave["constrained_columns"])
+            referencia = f"{chave['referred_table']} ({', '.join(chave['referred_columns'])})"
+            conexao.exec_driver_sql(f"ALTER TABLE {tabela.name} DROP CONSTRAINT {chave['name']}")
+            conexao.exec_driver_sql(
+                f"ALTER TABLE {tabela.name} ADD CONSTRAINT {chave['name']} "
+                f"FOREIGN KEY ({colunas}) REFERENCES {referencia} ON DELETE CASCADE"
+            )
+
+
+@migracao("0005_fila_de_tarefas")
+def _fila_de_tarefas(conexao):
+    """Tabela `tarefas` da fila de trabalho adiado (tarefas.py)."""
+    Tarefa.__table__.create(conexao, checkfirst=True)
+    _criar_indices(conexao, Tarefa.__table__)
+
+# ----------------- EXECUÇÃO -----------------
+def aplicadas(conexao):
+    if MigracaoAplicada.__tablename__ not in inspect(conexao).get_table_names():
+        return set()
+    return set(conexao.execute(select(MigracaoAplicada.id)).scalars())
+
+
+def pendentes(conexao):
+    feitas = aplicadas(conexao)
+    return [m for m in MIGRACOES if m.id not in feitas]
+
+
+def marcar_todas(conexao):
+    """Banco recém-criado com create_all: o esquema já é o final."""
+    feitas = aplicadas(conexao)
+    linhas = [{"id": m.id, "aplicada_em": agora()} for m in MIGRACOES if m.id not in feitas]
+    if linhas:
+        conexao.execute(insert(MigracaoAplicada.__table__), linhas)
+
+
+def migrar(engine=None, ao_aplicar=None):
+    """Aplica as migrações pendentes, uma transação por migração.
+
+    `ao_aplicar(migracao, segundos)` é chamado depois de cada COMMIT.
+    Devolve a lista de migrações aplicadas.
+    """
+    engine = engine or db.engine
+    feitas = []
+    # AUTOCOMMIT: BEGIN/COMMIT explícitos, para o PRAGMA foreign_keys (que
+    # não muda dentro de uma transação) poder ser trocado entre elas
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        MigracaoAplicada.__table__.create(conexao, checkfirst=True)
+        sqlite = conexao.dialect.name == "sqlite"
+        for m in pendentes(conexao):
+            inicio = time.perf_counter()
+            desligar_chaves = sqlite and m.recria_tabelas
+            if desligar_chaves:
+                conexao.exec_driver_sql("PRAGMA foreign_keys = OFF")
+            conexao.exec_driver_sql("BEGIN IMMEDIATE" if sqlite else "BEGIN")
+            try:
+                m.funcao(conexao)
+                if desligar_chaves:
+                    problemas = conexao.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+                    if problemas:
+                        raise RuntimeError(f"{m.id}: {len(problemas)} chaves estrangeiras inválidas")
+                conexao.execute(insert(MigracaoAplicada.__table__).values(id=m.id, aplicada_em=agora()))
+                conexao.exec_driver_sql("COMMIT")
+            except Exception:
+                conexao.exec_driver_sql("ROLLBACK")
+                raise
+            finally:
+                if desligar_chaves:
+                    conexao.exec_driver_sql("PRAGMA foreign_keys = ON")
+            feitas.append(m)
+            if ao_aplicar:
+                ao_aplicar(m, time.perf_counter() - inicio)
+    return feitas
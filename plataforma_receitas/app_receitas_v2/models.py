@@ -1,61 +1,137 @@
-from app import db
+from datetime import datetime, timezone
+
+from flask_sqlalchemy import SQLAlchemy
+
+import senhas
+
+# Instância central do SQLAlchemy (ligada ao app com db.init_app)
+db = SQLAlchemy()
+
+
+
+def agora():
+    """Data/hora atual em UTC (sem fuso, como o SQLite guarda)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+# ----------------- MODELOS -----------------
+class Usuario(db.Model):
+    __tablename__ = "usuarios"
+    id = db.Column(db.Integer, primary_key=True)
+    usuario = db.Column(db.String(50), unique=True, nullable=False)
+    senha_hash = db.Column(db.String(200), nullable=False)
+
+    def set_password(self, senha):
+        self.senha_hash = senhas.gerar_hash(senha)
+
+    def check_password(self, senha):
+        return senhas.verificar(self.senha_hash, senha)
+
+    def precisa_rehash(self):
+        return senhas.precisa_rehash(self.senha_hash)
+
 
-# 1. O "Association Object" para a relação M:M
-class ReceitaIngrediente(db.Model):
-    __tablename__ = 'receita_ingredientes'
-    receita_id = db.Column(db.Integer, db.ForeignKey('receita.id'),
-                           primary_key=True)
-    ingrediente_id = db.Column(db.Integer, db.ForeignKey('ingrediente.id'),
-                               primary_key=True)
-    quantidade = db.Column(db.String(50), nullable=False)
-
-    # Relações de volta para Receita e Ingrediente
-    ingrediente = db.relationship("Ingrediente",
-                                  back_populates="receitas_associadas")
-    receita = db.relationship("Receita",
-                              back_populates="ingredientes_associados")
-
-# 2. Modelo Chef (O "Um" de One-to-One e One-to-Many)
 class Chef(db.Model):
+    __tablename__ = "chefs"
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(100), nullable=False)
-    
-    # Relação 1:1 com PerfilChef
-    perfil = db.relationship('PerfilChef', back_populates='chef',
-                             uselist=False, cascade="all, delete-orphan")
-    
-    # Relação 1:M com Receita
-    receitas = db.relationship('Receita', back_populates='chef')
-
-# 3. Modelo PerfilChef (O outro "Um" de One-to-One)
+    # versão/data da última escrita (mantidas por versoes.py; usadas no ETag)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    atualizado_em = db.Column(db.DateTime, nullable=False, default=agora)
+    # contadores desnormalizados (mantidos por contadores.py)
+    total_receitas = db.Column(db.Integer, nullable=False, default=0, server_default="0", index=True)
+
+    # passive_deletes: o banco apaga perfil/receitas/associações (ON DELETE
+    # CASCADE) sem o ORM carregar cada linha; exclusao.py cuida do resto
+    perfil = db.relationship("PerfilChef", back_populates="chef", uselist=False,
+                             cascade="all, delete", passive_deletes=True)
+    receitas = db.relationship("Receita", back_populates="chef", cascade="all, delete", passive_deletes=True)
+
+
 class PerfilChef(db.Model):
+    __tablename__ = "perfis_chefs"
     id = db.Column(db.Integer, primary_key=True)
     especialidade = db.Column(db.String(100))
     anos_experiencia = db.Column(db.Integer)
-    chef_id = db.Column(db.Integer, db.ForeignKey('chef.id'), 
-                        nullable=False, unique=True)
-    
-    chef = db.relationship('Chef', back_populates='perfil')
 
-# 4. Modelo Receita (O "Muitos" de One-to-Many e parte do M:M)
+    chef_id = db.Column(db.Integer, db.ForeignKey("chefs.id", ondelete="CASCADE"), index=True)
+    chef = db.relationship("Chef", back_populates="perfil")
+
+
 class Receita(db.Model):
+    __tablename__ = "receitas"
     id = db.Column(db.Integer, primary_key=True)
     titulo = db.Column(db.String(200), nullable=False)
     instrucoes = db.Column(db.Text, nullable=False)
-    chef_id = db.Column(db.Integer, db.ForeignKey('chef.id'), nullable=False)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    atualizado_em = db.Column(db.DateTime, nullable=False, default=agora)
+    total_ingredientes = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    chef_id = db.Column(db.Integer, db.ForeignKey("chefs.id", ondelete="CASCADE"), nullable=False, index=True)
+    chef = db.relationship("Chef", back_populates="receitas")
 
-    chef = db.relationship('Chef', back_populates='receitas')
+    ingredientes = db.relationship("ReceitaIngrediente", back_populates="receita",
+                                   cascade="all, delete", passive_deletes=True)
 
-    # Relação com o "Association Object"
-    ingredientes_associados = \
-        db.relationship('ReceitaIngrediente', 
-                        back_populates='receita', cascade="all, delete-orphan")
 
-# 5. Modelo Ingrediente (A outra parte do M:M)
 class Ingrediente(db.Model):
+    __tablename__ = "ingredientes"
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), unique=True, nullable=False)
+    total_receitas = db.Column(db.Integer, nullable=False, default=0, server_default="0", index=True)
+
+    receitas = db.relationship("ReceitaIngrediente", back_populates="ingrediente", cascade="all, delete")
+
+
+class ReceitaIngrediente(db.Model):
+    __tablename__ = "receitas_ingredientes"
+    __table_args__ = (
+        # um ingrediente aparece uma vez por receita; o índice também serve
+        # a busca/exportação/importação, que leem as associações por receita
+        db.Index("uq_receitas_ingredientes_receita_ingrediente", "receita_id", "ingrediente_id", unique=True),
+        # "receitas com tomate": responde só com o índice (coberto)
+        db.Index("ix_receitas_ingredientes_ingrediente_receita", "ingrediente_id", "receita_id"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    quantidade = db.Column(db.String(50))
+
+    receita_id = db.Column(db.Integer, db.ForeignKey("receitas.id", ondelete="CASCADE"))
+    ingrediente_id = db.Column(db.Integer, db.ForeignKey("ingredientes.id", ondelete="CASCADE"))
+
+    receita = db.relationship("Receita", back_populates="ingredientes")
+    ingrediente = db.relationship("Ingrediente", back_populates="receitas")
+
+
+class VersaoTabela(db.Model):
+    """Contador de escritas por tabela: ETag das listagens sem varrer nada."""
+    __tablename__ = "versoes"
+    nome = db.Column(db.String(50), primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+    atualizado_em = db.Column(db.DateTime, nullable=False, default=agora)
+
+
+class MigracaoAplicada(db.Model):
+    """Migrações de esquema já aplicadas neste banco (ver migracoes.py)."""
+    __tablename__ = "schema_migracoes"
+    id = db.Column(db.String(100), primary_key=True)
+    aplicada_em = db.Column(db.DateTime, nullable=False, default=agora)
+
+
+class Tarefa(db.Model):
+    """Fila de tarefas adiadas (ver tarefas.py)."""
+    __tablename__ = "tarefas"
     id = db.Column(db.Integer, primary_key=True)
-    nome = db.Column(db.String(100), nullable=False, unique=True)
+    tipo = db.Column(db.String(100), nullable=False)
+    dados = db.Column(db.Text, nullable=False, default="{}")
+    chave = db.Column(db.String(200), unique=True)  # idempotência: mesma chave = mesma tarefa
+    estado = db.Column(db.String(20), nullable=False, default="pendente")
+    tentativas = db.Column(db.Integer, nullable=False, default=0)
+    max_tentativas = db.Column(db.Integer, nullable=False, default=5)
+    executar_em = db.Column(db.DateTime, nullable=False, default=agora)  # ou fim da reserva
+    dono = db.Column(db.String(100))
+    erro = db.Column(db.Text)
+    criada_em = db.Column(db.DateTime, nullable=False, default=agora)
+    concluida_em = db.Column(db.DateTime)
 
-    receitas_associadas = \
-        db.relationship('ReceitaIngrediente',
-                        back_populates='ingrediente', cascade="all, delete-orphan")
\ No newline at end of file
+    __table_args__ = (
+        db.Index("ix_tarefas_estado_executar_em", "estado", "executar_em"),
+    )
@@ -0,0 +1,36 @@
+import json
+import urllib.request
+
+from flask import current_app
+
+import tarefas
+
+# ----------------- NOTIFICAÇÕES -----------------
+# Eventos do app (usuário registrado, receita criada) vão como POST JSON para
+# NOTIFICACOES_URL (webhook). Sempre pela fila: o request nunca espera a rede
+# e, se o destino estiver fora do ar, a tarefa tenta de novo com backoff.
+# A chave de idempotência da tarefa vai no cabeçalho Idempotency-Key, para o
+# destino descartar o repetido quando uma tentativa entregou mas não chegou a
+# marcar a tarefa como concluída. Sem NOTIFICACOES_URL nada é enfileirado.
+
+
+def notificar(conexao, evento, dados, chave):
+    """Enfileira o evento na transação de `conexao` (chave única por evento)."""
+    if not current_app.config.get("NOTIFICACOES_URL"):
+        return
+    tarefas.enfileirar(conexao, "notificar", {"evento": evento, "dados": dados, "chave": chave}, chave=chave)
+
+
+@tarefas.tarefa("notificar", max_tentativas=8)
+def _enviar(dados):
+    url = current_app.config.get("NOTIFICACOES_URL")
+    if not url:
+        return  # desligado depois de enfileirar
+    corpo = json.dumps({"evento": dados["evento"], "dados": dados["dados"]}, ensure_ascii=False)
+    pedido = urllib.request.Request(url, data=corpo.encode(), method="POST", headers={
+        "Content-Type": "application/json",
+        "Idempotency-Key": dados["chave"],
+    })
+    # 4xx/5xx levantam HTTPError: conta como falha e volta para a fila
+    with urllib.request.urlopen(pedido, timeout=current_app.config.get("NOTIFICACOES_TIMEOUT", 5)) as resposta:
+        resposta.read()
@@ -0,0 +1,107 @@
+import base64
+import binascii
+import json
+
+from flask import abort, current_app, request
+
+# ----------------- PAGINAÇÃO POR CURSOR -----------------
+# Paginação "keyset": em vez de OFFSET (que lê e descarta todas as linhas
+# anteriores), cada página continua a partir do último id visto:
+#   WHERE id > :ultimo_id ORDER BY id LIMIT :tamanho
+# O custo de qualquer página é o mesmo, seja a 1ª ou a 100.000ª.
+
+TAMANHO_PADRAO = 24
+TAMANHO_MAXIMO = 100
+
+
+def codificar_cursor(direcao, ultimo_id):
+    """Gera o cursor opaco usado na URL (?cursor=...)."""
+    dados = json.dumps({"d": direcao, "id": ultimo_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor):
+    """Devolve (direcao, id) ou aborta com 400 se o cursor for inválido."""
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        dados = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+        direcao, ultimo_id = dados["d"], dados["id"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        abort(400)
+    # só inteiro do tamanho de um BIGINT: 1e400, 10**30, "7" ou true não
+    # chegam ao banco (o driver estouraria com OverflowError -> 500)
+    if direcao not in ("n", "p") or type(ultimo_id) is not int or not 0 <= ultimo_id < 2**63:
+        abort(400)
+    return direcao, ultimo_id
+
+
+class Pagina:
+    def __init__(self, itens, proximo=None, anterior=None, tamanho=TAMANHO_PADRAO):
+        self.itens = itens
+        self.proximo = proximo
+        self.anterior = anterior
+        self.tamanho = tamanho
+
+    def __iter__(self):
+        return iter(self.itens)
+
+    def __len__(self):
+        return len(self.itens)
+
+
+def tamanho_da_pagina(valor=None):
+    """Lê ?tamanho= e limita entre 1 e PAGINA_TAMANHO_MAXIMO."""
+    padrao = current_app.config.get("PAGINA_TAMANHO_PADRAO", TAMANHO_PADRAO)
+    maximo = current_app.config.get("PAGINA_TAMANHO_MAXIMO", TAMANHO_MAXIMO)
+    if valor is None:
+        valor = request.args.get("tamanho", padrao, type=int)
+    return max(1, min(valor, maximo))
+
+
+def paginar(query, coluna, cursor=None, tamanho=None):
+    """Aplica a paginação keyset em `query` usando `coluna` (ex.: Receita.id).
+
+    Se `cursor`/`tamanho` não forem passados, são lidos da query string.
+    """
+    query, estado = preparar_pagina(query, coluna, cursor, tamanho)
+    return montar_pagina(query.all(), estado)
+
+
+def preparar_pagina(query, coluna, cursor=None, tamanho=None):
+    """Metade "SQL" do `paginar`: a consulta limitada e o estado para `montar_pagina`.
+
+    Separada para quem executa a consulta por outro caminho (rotas_assincronas.py).
+    """
+    if cursor is None:
+        cursor = request.args.get("cursor")
+    tamanho = tamanho_da_pagina(tamanho)
+
+    query = query.order_by(None)
+    if not cursor:
+        direcao, ultimo_id = "n", None
+    else:
+        direcao, ultimo_id = decodificar_cursor(cursor)
+
+    # Busca uma linha a mais só para saber se existe outra página
+    if direcao == "n":
+        if ultimo_id is not None:
+            query = query.filter(coluna > ultimo_id)
+        query = query.order_by(coluna.asc()).limit(tamanho + 1)
+    else:
+        query = query.filter(coluna < ultimo_id).order_by(coluna.desc()).limit(tamanho + 1)
+    return query, (direcao, ultimo_id, tamanho)
+
+
+def montar_pagina(linhas, estado):
+    direcao, ultimo_id, tamanho = estado
+    tem_mais = len(linhas) > tamanho
+    if direcao == "n":
+        itens = linhas[:tamanho]
+        proximo = codificar_cursor("n", itens[-1].id) if tem_mais else None
+        anterior = codificar_cursor("p", itens[0].id) if itens and ultimo_id is not None else None
+    else:
+        itens = list(reversed(linhas[:tamanho]))
+        proximo = codificar_cursor("n", itens[-1].id) if itens else None
+        anterior = codificar_cursor("p", itens[0].id) if tem_mais else None
+
+    return Pagina(itens, proximo=proximo, anterior=anterior, tamanho=tamanho)
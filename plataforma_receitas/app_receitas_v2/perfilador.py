@@ -0,0 +1,234 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import request
+
+# ----------------- PERFILADOR POR AMOSTRAGEM -----------------
+# Liga/desliga em produção pelo admin (POST /admin/perfilador), sem reiniciar:
+#   - escolhe os endpoints (padrão: criar_receita, index e login) e a
+#     porcentagem dos requests desses endpoints que será perfilada;
+#   - enquanto um request perfilado roda, uma thread única acorda a cada
+#     `intervalo` ms e anota a pilha de chamadas da thread do request
+#     (sys._current_frames). Custo ~ nulo para os requests não sorteados;
+#   - ao fim do request as pilhas são acrescentadas em
+#     PERFILADOR_PASTA/<endpoint>.folded no formato "colapsado"
+#     (a;b;c 12), que flamegraph.pl / speedscope / inferno abrem direto.
+# O liga/desliga vale para todos os workers: o admin grava o estado em
+# PERFILADOR_PASTA/controle.json (os.replace, atômico) e cada worker relê
+# o arquivo no máximo uma vez por VERIFICAR_A_CADA segundos, antes de
+# sortear o request. Enquanto não houver controle.json vale o
+# PERFILADOR_PORCENTAGEM da config. Com mais de uma máquina a pasta precisa
+# ser compartilhada (ou ligue em cada uma e some com `flask mesclar-perfis`).
+
+ENDPOINTS_PADRAO = ("receitas.criar_receita", "receitas.index", "auth.login")
+
+
+def _colapsar(frame, raiz):
+    pilha = []
+    while frame is not None:
+        codigo = frame.f_code
+        modulo = frame.f_globals.get("__name__", "?")
+        pilha.append(f"{modulo}:{codigo.co_name}")
+        frame = frame.f_back
+    pilha.append(raiz)
+    return ";".join(reversed(pilha))
+
+
+class Perfilador:
+    VERIFICAR_A_CADA = 1.0  # segundos entre duas leituras do controle.json
+
+    def __init__(self):
+        self.endpoints = set()
+        self.porcentagem = 0.0
+        self.intervalo = 0.005
+        self.pasta = None
+        self._ativos = {}              # thread id -> (endpoint, Counter de pilhas)
+        self._trava = threading.Lock()
+        self._acordar = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._verificado_em = float("-inf")
+        self._controle = None          # último estado lido/gravado no controle.json
+
+    def init_app(self, app):
+        self.pasta = app.config.get("PERFILADOR_PASTA") or os.path.join(app.instance_path, "perfis")
+        self.intervalo = app.config.get("PERFILADOR_INTERVALO_MS", 5) / 1000
+        if app.config.get("PERFILADOR_PORCENTAGEM"):
+            endpoints = app.config.get("PERFILADOR_ENDPOINTS") or ",".join(ENDPOINTS_PADRAO)
+            self._aplicar([e.strip() for e in endpoints.split(",") if e.strip()],
+                          app.config["PERFILADOR_PORCENTAGEM"])
+        app.before_request(self._iniciar)
+        app.teardown_request(self._terminar)
+
+    # ----------------- CONTROLE -----------------
+    @property
+    def ligado(self):
+        return bool(self.endpoints) and self.porcentagem > 0
+
+    @property
+    def caminho_controle(self):
+        return os.path.join(self.pasta, "controle.json")
+
+    def configurar(self, endpoints=ENDPOINTS_PADRAO, porcentagem=100.0, intervalo_ms=None):
+        """Liga em todos os workers que usam a mesma pasta."""
+        self._aplicar(endpoints, porcentagem, intervalo_ms)
+        self._gravar_controle()
+
+    def desligar(self):
+        self._aplicar((), 0)
+        self._gravar_controle()
+
+    def _aplicar(self, endpoints, porcentagem, intervalo_ms=None):
+        self.endpoints = set(endpoints)
+        self.porcentagem = max(0.0, min(100.0, float(porcentagem)))
+        if intervalo_ms:
+            self.intervalo = max(1, float(intervalo_ms)) / 1000
+
+    def _gravar_controle(self):
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = f"{self.caminho_controle}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._controle = {
+            "endpoints": sorted(self.endpoints),
+            "porcentagem": self.porcentagem,
+            "intervalo_ms": self.intervalo * 1000,
+        }
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(self._controle, arquivo)
+        os.replace(temporario, self.caminho_controle)
+
+    def sincronizar(self, forcar=False):
+        """Relê o controle.json se ele mudou (outro worker ligou/desligou)."""
+        agora = time.monotonic()
+        if not forcar and agora - self._verificado_em < self.VERIFICAR_A_CADA:
+            return
+        self._verificado_em = agora
+        try:
+            # o arquivo é pequeno: ler é mais seguro que confiar no mtime
+            # (resolução de 1 s em alguns sistemas de arquivos)
+            with open(self.caminho_controle, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+            if dados != self._controle:
+                self._aplicar(dados["endpoints"], dados["porcentagem"], dados.get("intervalo_ms"))
+                self._controle = dados
+        except (OSError, ValueError, KeyError, TypeError):
+            return  # sem controle.json: vale a config
+
+    def estado(self):
+        self.sincronizar(forcar=True)
+        arquivos = {}
+        if self.pasta and os.path.isdir(self.pasta):
+            for nome in sorted(os.listdir(self.pasta)):
+                if nome.endswith(".folded"):
+                    arquivos[nome] = os.path.getsize(os.path.join(self.pasta, nome))
+        return {
+            "ligado": self.ligado,
+            "endpoints": sorted(self.endpoints),
+            "porcentagem": self.porcentagem,
+            "intervalo_ms": self.intervalo * 1000,
+            "pasta": self.pasta,
+            "controle": self.caminho_controle,  # compartilhado pelos workers desta pasta
+            "arquivos": arquivos,
+        }
+
+    # ----------------- AMOSTRAGEM -----------------
+    def _garantir_thread(self):
+        # depois de um fork (gunicorn) a thread do processo pai não existe
+        if self._thread is None or self._pid != os.getpid():
+            self._thread = threading.Thread(target=self._amostrar, name="perfilador", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _amostrar(self):
+        while True:
+            self._acordar.wait()
+            time.sleep(self.intervalo)
+            quadros = sys._current_frames()
+            with self._trava:
+                for thread_id, (endpoint, pilhas) in self._ativos.items():
+                    quadro = quadros.get(thread_id)
+                    if quadro is not None:
+                        pilhas[_colapsar(quadro, endpoint)] += 1
+                if not self._ativos:
+                    self._acordar.clear()
+
+    def _iniciar(self):
+        self.sincronizar()
+        if not self.ligado or request.endpoint not in self.endpoints:
+            return
+        if random.random() * 100 >= self.porcentagem:
+            return
+        with self._trava:
+            self._garantir_thread()
+            self._ativos[threading.get_ident()] = (request.endpoint, Counter())
+            self._acordar.set()
+
+    def _terminar(self, erro=None):
+        with self._trava:
+            ativo = self._ativos.pop(threading.get_ident(), None)
+        if ativo:
+            endpoint, pilhas = ativo
+            if pilhas:
+                self.salvar(endpoint, pilhas)
+
+    def salvar(self, endpoint, pilhas):
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = os.path.join(self.pasta, f"{endpoint}.folded")
+        texto = "".join(f"{pilha} {n}\n" for pilha, n in pilhas.items())
+        # um write só em modo append: requests de threads/workers não se misturam
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+
+# ----------------- ARQUIVOS .folded -----------------
+def ler_colapsado(caminho):
+    """Soma as linhas "pilha N" de um arquivo .folded num Counter."""
+    pilhas = Counter()
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            pilha, _, n = linha.rstrip("\n").rpartition(" ")
+            if pilha and n.isdigit():
+                pilhas[pilha] += int(n)
+    return pilhas
+
+
+def escrever_colapsado(pilhas, arquivo):
+    for pilha, n in sorted(pilhas.items()):
+        arquivo.write(f"{pilha} {n}\n")
+
+
+def mesclar(caminhos):
+    total = Counter()
+    for caminho in caminhos:
+        total.update(ler_colapsado(caminho))
+    return total
+
+
+def tempo_proprio(pilhas):
+    """Amostras em que cada função estava no topo da pilha (tempo "self")."""
+    proprio = Counter()
+    for pilha, n in pilhas.items():
+        proprio[pilha.rsplit(";", 1)[-1]] += n
+    return proprio
+
+
+def diferenca(antes, depois):
+    """Compara dois perfis normalizados (fração do total de amostras).
+
+    Devolve [(funcao, fracao_antes, fracao_depois)] ordenado pela maior piora.
+    """
+    total_antes = sum(antes.values()) or 1
+    total_depois = sum(depois.values()) or 1
+    proprio_antes = tempo_proprio(antes)
+    proprio_depois = tempo_proprio(depois)
+    linhas = [
+        (funcao, proprio_antes[funcao] / total_antes, proprio_depois[funcao] / total_depois)
+        for funcao in set(proprio_antes) | set(proprio_depois)
+    ]
+    return sorted(linhas, key=lambda linha: linha[2] - linha[1], reverse=True)
+
+
+perfilador = Perfilador()
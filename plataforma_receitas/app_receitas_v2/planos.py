@@ -0,0 +1,179 @@
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+from sqlalchemy import event, inspect, select
+
+from models import db, Chef, Ingrediente, Receita
+import contadores
+import migracoes
+
+# ----------------- VERIFICAÇÃO DE PLANOS DE CONSULTA -----------------
+# `flask verificar-planos` (sai com código 1 se algo falhar):
+#   1. toda chave estrangeira precisa de um índice que comece por ela
+#      (senão cada busca por chef/receita/ingrediente e cada ON DELETE
+#      CASCADE varre a tabela filha inteira);
+#   2. as rotas mais usadas são chamadas com o test client, todo SELECT que
+#      elas fazem é capturado e passa por EXPLAIN QUERY PLAN. Falha se:
+#        - o plano varre uma tabela (SCAN) — exceto consultas com LIMIT que
+#          já saem na ordem certa (sem TEMP B-TREE), como a paginação por
+#          id, e tabelas virtuais (FTS);
+#        - o SQLite precisou criar um índice automático (falta um índice).
+# Varreduras que são o próprio objetivo da consulta ficam em
+# VARREDURAS_ESPERADAS (padrão do SQL -> tabelas que podem ser varridas).
+# Só faz sentido com dados: rode depois de `flask gerar-dados` ou de uma
+# importação; os planos do SQLite não dependem do volume (sem ANALYZE).
+
+Problema = namedtuple("Problema", "origem consulta detalhe")
+
+VARREDURAS_ESPERADAS = [
+    # carga completa do índice invertido de ingredientes (uma vez por processo)
+    (r"^SELECT receitas_ingredientes\.receita_id, receitas_ingredientes\.ingrediente_id\s+"
+     r"FROM receitas_ingredientes\s+WHERE [^()]*$", {"receitas_ingredientes"}),
+    # contadores.divergentes: confere todas as linhas de propósito
+    (r"^SELECT count\(\*\) AS count_1\s+FROM (chefs|ingredientes|receitas)\s+"
+     r"WHERE \1\.total_\w+ != \(SELECT count", {"chefs", "ingredientes", "receitas"}),
+]
+
+
+def _varreduras_permitidas(sql):
+    permitidas = set()
+    for padrao, tabelas in VARREDURAS_ESPERADAS:
+        if re.search(padrao, sql, re.S):
+            permitidas |= tabelas
+    return permitidas
+
+
+# ----------------- ÍNDICES DAS CHAVES ESTRANGEIRAS -----------------
+def chaves_sem_indice(conexao):
+    """[(tabela, coluna)] de chaves estrangeiras sem índice que comece por elas."""
+    inspetor = inspect(conexao)
+    faltando = []
+    for tabela in inspetor.get_table_names():
+        primeiras = {indice["column_names"][0] for indice in inspetor.get_indexes(tabela)}
+        primeiras |= {u["column_names"][0] for u in inspetor.get_unique_constraints(tabela)}
+        chave_primaria = inspetor.get_pk_constraint(tabela)["constrained_columns"]
+        if chave_primaria:
+            primeiras.add(chave_primaria[0])
+        for chave in inspetor.get_foreign_keys(tabela):
+            coluna = chave["constrained_columns"][0]
+            if coluna not in primeiras:
+                faltando.append((tabela, coluna))
+    return faltando
+
+
+# ----------------- CAPTURA E EXPLAIN -----------------
+@contextmanager
+def capturar_selects(engine):
+    """Junta (sql, parâmetros) de cada SELECT executado no engine."""
+    capturadas = []
+
+    def _anotar(conexao, cursor, sql, parametros, contexto, executemany):
+        if not executemany and sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            capturadas.append((sql, parametros))
+
+    event.listen(engine, "before_cursor_execute", _anotar)
+    try:
+        yield capturadas
+    finally:
+        event.remove(engine, "before_cursor_execute", _anotar)
+
+
+def problemas_do_plano(conexao, sql, parametros):
+    """Lista de trechos problemáticos do EXPLAIN QUERY PLAN de `sql`."""
+    linhas = conexao.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, parametros).all()
+    detalhes = [linha[-1] for linha in linhas]
+    ordenada_com_limite = re.search(r"\bLIMIT\b", sql, re.I) and not any(
+        "TEMP B-TREE" in d for d in detalhes)
+    permitidas = _varreduras_permitidas(sql)
+    problemas = []
+    for detalhe in detalhes:
+        if "AUTOMATIC" in detalhe:
+            problemas.append(detalhe)
+            continue
+        varredura = re.match(r"SCAN (\w+)", detalhe)
+        if not varredura or "VIRTUAL TABLE" in detalhe or detalhe.startswith("SCAN CONSTANT"):
+            continue
+        if varredura.group(1).startswith("sqlite_"):  # catálogo (ex.: busca checando a FTS)
+            continue
+        if varredura.group(1) in permitidas or ordenada_com_limite:
+            continue
+        problemas.append(detalhe)
+    return problemas
+
+
+# ----------------- ROTAS QUENTES -----------------
+def _rotas(conexao):
+    """URLs das rotas mais usadas, montadas com ids e termos que existem no banco."""
+    receita = conexao.execute(
+        select(Receita.id, Receita.titulo).order_by(Receita.total_ingredientes.desc()).limit(1)
+    ).first()
+    chef_id = conexao.execute(select(Chef.id).order_by(Chef.total_receitas.desc()).limit(1)).scalar()
+    nomes = conexao.execute(
+        select(Ingrediente.nome).order_by(Ingrediente.total_receitas.desc()).limit(3)
+    ).scalars().all()
+    if receita is None or chef_id is None:
+        return None
+    termo = receita.titulo.split()[0]
+    return [
+        "/",
+        "/chefs",
+        f"/chef/{chef_id}",
+        f"/receita/editar/{receita.id}",
+        f"/busca?q={termo}",
+        f"/api/busca?q={termo}",
+        f"/api/receitas/com-ingredientes?ingredientes={','.join(nomes)}",
+        "/api/estatisticas/catalogo",
+        "/api/v1/receitas?include=ingredientes",
+        f"/api/v1/receitas/{receita.id}?include=ingredientes",
+        "/api/v1/chefs?include=receitas",
+        f"/api/v1/chefs/{chef_id}?include=receitas",
+        "/api/v1/ingredientes?fields=id,nome,total_receitas",
+    ]
+
+
+def verificar(app, usuario="admin"):
+    """Roda as duas verificações. Devolve (consultas analisadas, [Problema])."""
+    problemas = []
+    with app.app_context():
+        conexao = db.session.connection()
+        faltam = migracoes.pendentes(conexao)
+        if faltam:
+            raise RuntimeError(
+                f"banco desatualizado ({', '.join(m.id for m in faltam)}): rode `flask migrar` antes"
+            )
+        for tabela, coluna in chaves_sem_indice(conexao):
+            problemas.append(Problema("esquema", f"{tabela}.{coluna}", "chave estrangeira sem índice"))
+        rotas = _rotas(conexao)
+        db.session.remove()
+    if rotas is None:
+        raise RuntimeError("banco sem receitas/chefs: rode `flask gerar-dados` antes")
+
+    cliente = app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao["usuario"] = usuario
+
+    analisadas = 0
+    with app.app_context():
+        engine = db.engine
+        for origem in rotas:
+            with capturar_selects(engine) as capturadas:
+                resposta = cliente.get(origem)
+            if resposta.status_code != 200:
+                problemas.append(Problema(origem, "", f"HTTP {resposta.status_code}"))
+            analisadas += _analisar(origem, capturadas, problemas)
+
+        with capturar_selects(engine) as capturadas:
+            contadores.divergentes(db.session.connection())
+        analisadas += _analisar("contadores.divergentes", capturadas, problemas)
+        db.session.remove()
+    return analisadas, problemas
+
+
+def _analisar(origem, capturadas, problemas):
+    unicas = list({sql: (sql, parametros) for sql, parametros in capturadas}.values())
+    with db.engine.connect() as conexao:
+        for sql, parametros in unicas:
+            for detalhe in problemas_do_plano(conexao, sql, parametros):
+                problemas.append(Problema(origem, sql, detalhe))
+    return len(unicas)
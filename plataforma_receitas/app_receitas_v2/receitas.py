@@ -0,0 +1,123 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+
+from models import db, Receita
+from auth import login_required
+from paginacao import paginar, tamanho_da_pagina
+from ingredientes import associar_ingredientes
+from compartilhado.ingredientes import interpretar_ingredientes
+from indice_ingredientes import receitas_com_ingredientes
+import consultas
+import busca
+import notificacoes
+import versoes
+import exclusao  # noqa: F401  (hooks da exclusão em cascata)
+from cache_http import condicional
+from fragmentos import fragmentos
+
+bp = Blueprint('receitas', __name__)
+
+CHEFS_NO_FORMULARIO = 50
+
+# ----------------- ROTAS RECEITAS -----------------
+def _versao_listagem_receitas():
+    v = versoes.versoes('receitas', 'chefs')
+    datas = [quando for _, quando in v.values() if quando]
+    return (v['receitas'][0], v['chefs'][0]), max(datas, default=None)
+
+@bp.route('/')
+@login_required
+@condicional(_versao_listagem_receitas)
+def index():
+    receitas = paginar(consultas.receitas_com_chef(), Receita.id)
+    return render_template('index.html', receitas=receitas)
+
+@bp.route('/receita/nova', methods=['GET', 'POST'])
+@login_required
+def criar_receita():
+    if request.method == 'POST':
+        titulo = request.form['titulo']
+        instrucoes = request.form['instrucoes']
+        chef_id = request.form['chef_id']
+
+        nova_receita = Receita(titulo=titulo, instrucoes=instrucoes, chef_id=chef_id)
+        db.session.add(nova_receita)
+
+        pares = interpretar_ingredientes(request.form['ingredientes'])
+        associar_ingredientes(nova_receita, pares)
+        db.session.flush()  # id da receita (sem ingredientes nada deu flush ainda)
+        notificacoes.notificar(
+            db.session.connection(), "receita.criada",
+            {"id": nova_receita.id, "titulo": titulo, "chef_id": int(chef_id)},
+            chave=f"receita-criada:{nova_receita.id}",
+        )
+        db.session.commit()
+        flash("Receita criada com sucesso!", "success")
+        return redirect(url_for('receitas.index'))
+
+    # o <select> leva no máximo CHEFS_NO_FORMULARIO chefs; os outros, pela busca (?chef=)
+    termo_chef = request.args.get('chef', '').strip()
+    chefs = consultas.chefs_para_escolher(termo_chef, CHEFS_NO_FORMULARIO).all()
+    return render_template('criar_receita.html', chefs=chefs[:CHEFS_NO_FORMULARIO],
+                           mais_chefs=len(chefs) > CHEFS_NO_FORMULARIO, termo_chef=termo_chef)
+
+@bp.route('/receita/editar/<int:receita_id>', methods=['GET', 'POST'])
+@login_required
+def editar_receita(receita_id):
+    receita = Receita.query.get_or_404(receita_id)
+    if request.method == 'POST':
+        receita.titulo = request.form['titulo']
+        receita.instrucoes = request.form['instrucoes']
+        db.session.commit()
+        fragmentos.invalidar('receita', receita_id)
+        flash("Receita atualizada com sucesso!", "success")
+        return redirect(url_for('receitas.index'))
+    return render_template('editar_receita.html', receita=receita)
+
+@bp.route('/receita/excluir/<int:receita_id>', methods=['POST'])
+@login_required
+def excluir_receita(receita_id):
+    receita = Receita.query.get_or_404(receita_id)
+    db.session.delete(receita)
+    db.session.commit()
+    fragmentos.invalidar('receita', receita_id)
+    flash("Receita excluída com sucesso!", "danger")
+    return redirect(url_for('receitas.index'))
+
+# ----------------- BUSCA -----------------
+def _resultados_busca(termo):
+    ranking = busca.buscar(termo, limite=tamanho_da_pagina())
+    if not ranking:
+        return []
+    ids = [receita_id for receita_id, _ in ranking]
+    por_id = {r.id: r for r in consultas.receitas_com_chef().filter(Receita.id.in_(ids))}
+    return [por_id[i] for i in ids if i in por_id]
+
+@bp.route('/busca')
+@login_required
+def buscar_receitas():
+    termo = request.args.get('q', '').strip()
+    receitas = _resultados_busca(termo) if termo else []
+    return render_template('busca.html', termo=termo, receitas=receitas)
+
+@bp.route('/api/busca')
+@login_required
+def api_buscar_receitas():
+    termo = request.args.get('q', '').strip()
+    return jsonify([
+        {"id": r.id, "titulo": r.titulo, "chef": r.chef.nome}
+        for r in _resultados_busca(termo)
+    ])
+
+@bp.route('/api/receitas/com-ingredientes')
+@login_required
+def api_receitas_com_ingredientes():
+    """?ingredientes=tomate,cebola,ovo -> receitas que mais usam esses itens."""
+    nomes = request.args.get('ingredientes', '').split(',')
+    ranking = receitas_com_ingredientes(nomes, limite=tamanho_da_pagina())
+    ids = [receita_id for receita_id, _ in ranking]
+    por_id = {r.id: r for r in consultas.receitas_com_chef().filter(Receita.id.in_(ids))}
+    return jsonify([
+        {"id": receita_id, "titulo": por_id[receita_id].titulo,
+         "chef": por_id[receita_id].chef.nome, "ingredientes_cobertos": cobertos}
+        for receita_id, cobertos in ranking if receita_id in por_id
+    ])
@@ -0,0 +1,301 @@
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import abort, current_app, jsonify, render_template, request
+
+from models import Chef, Receita
+from auth import login_required
+from banco_assincrono import banco_assincrono
+from cache_http import condicional
+from paginacao import preparar_pagina, montar_pagina, tamanho_da_pagina
+import api
+import busca
+import chefs
+import consultas
+import receitas
+
+# ----------------- MODO ASGI (OPCIONAL) -----------------
+# `uvicorn asgi:app` (ver asgi.py) troca as views de leitura mais usadas por
+# versões `async def` que leem pelo engine assíncrono (banco_assincrono.py).
+# As URLs, o login, o ETag (cache_http.condicional), os templates e o JSON
+# continuam os mesmos; escrita, formulários e o resto do app seguem
+# síncronos. A consulta é a mesma das views síncronas (consultas.py,
+# paginacao.preparar_pagina, api.RECURSOS), só executada de outro jeito.
+#
+# O que muda de verdade: consultas independentes de um request rodam em
+# paralelo (detalhes do chef, includes da API) e o servidor ASGI segura
+# muitas conexões abertas com poucos processos. O Flask não vira um
+# framework assíncrono: cada request ainda ocupa uma thread enquanto roda
+# (ASGI_THREADS por processo). Compare com benchmarks/asgi_wsgi.py antes de
+# trocar o gunicorn por isso.
+
+# ----------------- RECEITAS / CHEFS (HTML) -----------------
+async def _pagina(query, coluna):
+    consulta, estado = preparar_pagina(query, coluna)
+    return montar_pagina(await banco_assincrono.todas(consulta, escalares=True), estado)
+
+
+@login_required
+@condicional(receitas._versao_listagem_receitas)
+async def index():
+    pagina = await _pagina(consultas.receitas_com_chef(), Receita.id)
+    return render_template('index.html', receitas=pagina)
+
+
+@login_required
+@condicional(chefs._versao_listagem_chefs)
+async def listar_chefs():
+    pagina = await _pagina(consultas.chefs_com_perfil(), Chef.id)
+    return render_template('chefs.html', chefs=pagina)
+
+
+@login_required
+@condicional(chefs._versao_chef)
+async def detalhes_chef(chef_id):
+    # chef + perfil e a página de receitas ao mesmo tempo, em conexões
+    # separadas (a versão síncrona faz as duas consultas em sequência)
+    chef, receitas = await asyncio.gather(
+        banco_assincrono.todas(consultas.chefs_com_perfil().filter(Chef.id == chef_id), escalares=True),
+        _pagina(consultas.receitas_do_chef(chef_id), Receita.id),
+    )
+    if not chef:
+        abort(404)
+    return render_template('detalhes_chef.html', chef=chef[0], receitas=receitas)
+
+# ----------------- BUSCA -----------------
+async def _resultados_busca(termo):
+    consulta = busca.consulta_de_busca(termo, limite=tamanho_da_pagina())
+    if consulta is None:
+        return []
+
+    async def ler(sessao):
+        if not await sessao.run_sync(lambda s: busca.disponivel(s.connection())):
+            return []
+        ids = [receita_id for receita_id, _ in await sessao.execute(*consulta)]
+        if not ids:
+            return []
+        resultado = await sessao.execute(consultas.receitas_com_chef().filter(Receita.id.in_(ids)).statement)
+        por_id = {r.id: r for r in resultado.scalars()}
+        return [por_id[i] for i in ids if i in por_id]
+
+    return await banco_assincrono.executar(ler)
+
+
+@login_required
+async def buscar_receitas():
+    termo = request.args.get('q', '').strip()
+    resultados = await _resultados_busca(termo) if termo else []
+    return render_template('busca.html', termo=termo, receitas=resultados)
+
+
+@login_required
+async def api_buscar_receitas():
+    termo = request.args.get('q', '').strip()
+    return jsonify([
+        {"id": r.id, "titulo": r.titulo, "chef": r.chef.nome}
+        for r in await _resultados_busca(termo)
+    ])
+
+# ----------------- API JSON (v1) -----------------
+# O login da API continua no before_request do blueprint (401 em JSON).
+
+async def _serializar(recurso, linhas, campos, includes):
+    itens = [api._montar(linha, campos) for linha in linhas]
+    if includes and linhas:
+        ids = [linha.id for linha in linhas]
+        grupos = await asyncio.gather(*(
+            banco_assincrono.todas(recurso.includes[nome](ids)) for nome in includes
+        ))
+        for nome, linhas_do_include in zip(includes, grupos):
+            api.anexar(linhas, itens, nome, api.agrupar(linhas_do_include))
+    return itens
+
+
+async def _colecao(nome):
+    recurso = api.RECURSOS[nome]
+    campos = api._campos(recurso)
+    includes = api._includes(recurso)
+    consulta, estado = preparar_pagina(recurso.consulta(campos), recurso.modelo.id)
+    pagina = montar_pagina(await banco_assincrono.todas(consulta), estado)
+    return jsonify(
+        itens=await _serializar(recurso, pagina.itens, campos, includes),
+        proximo=pagina.proximo,
+        anterior=pagina.anterior,
+        tamanho=pagina.tamanho,
+    )
+
+
+async def _item(nome, item_id):
+    recurso = api.RECURSOS[nome]
+    campos = api._campos(recurso)
+    consulta = recurso.consulta(campos).filter(recurso.modelo.id == item_id).limit(1)
+    linhas = await banco_assincrono.todas(consulta)
+    if not linhas:
+        abort(404, description="Não encontrado")
+    return jsonify((await _serializar(recurso, linhas, campos, api._includes(recurso)))[0])
+
+
+def _colecao_ou_stream(nome, view_sincrona):
+    """NDJSON continua pela view síncrona: o stream_with_context precisa do
+    contexto do request na thread que itera a resposta, e a view async roda
+    em outro contexto."""
+    def view():
+        if api._quer_ndjson():
+            return view_sincrona()
+        return current_app.ensure_sync(_colecao)(nome)
+    view.__name__ = view_sincrona.__name__
+    return view
+
+
+api_listar_receitas = _colecao_ou_stream("receitas", api.listar_receitas)
+
+
+async def api_obter_receita(receita_id):
+    return await _item("receitas", receita_id)
+
+
+api_listar_chefs = _colecao_ou_stream("chefs", api.listar_chefs)
+
+
+async def api_obter_chef(chef_id):
+    return await _item("chefs", chef_id)
+
+
+api_listar_ingredientes = _colecao_ou_stream("ingredientes", api.listar_ingredientes)
+
+
+ROTAS = {
+    "receitas.index": index,
+    "receitas.buscar_receitas": buscar_receitas,
+    "receitas.api_buscar_receitas": api_buscar_receitas,
+    "chefs.listar_chefs": listar_chefs,
+    "chefs.detalhes_chef": detalhes_chef,
+    "api.listar_receitas": api_listar_receitas,
+    "api.obter_receita": api_obter_receita,
+    "api.listar_chefs": api_listar_chefs,
+    "api.obter_chef": api_obter_chef,
+    "api.listar_ingredientes": api_listar_ingredientes,
+}
+
+# ----------------- ATIVAÇÃO -----------------
+def ativar(app):
+    """Troca as views de ROTAS pelas versões assíncronas (mesmas URLs)."""
+    try:
+        import asgiref  # noqa: F401  (o Flask precisa dele para views async)
+    except ImportError:
+        raise RuntimeError('Views assíncronas requerem `pip install "flask[async]"`.')
+    banco_assincrono.init_app(app)
+    for endpoint, view in ROTAS.items():
+        app.view_functions[endpoint] = view
+    return app
+
+
+def criar_asgi(app):
+    """Ativa as rotas assíncronas e devolve o app ASGI (WSGI dentro de um pool de threads)."""
+    ativar(app)
+    executor = ThreadPoolExecutor(max_workers=app.config.get("ASGI_THREADS", 32), thread_name_prefix="asgi")
+    return AdaptadorASGI(app, executor)
+
+
+# ----------------- ADAPTADOR WSGI -> ASGI -----------------
+# O asgiref.wsgi.WsgiToAsgi roda o app com thread_sensitive=True (todos os
+# requests do processo numa única thread) e não tem como trocar isso sem
+# mexer em detalhes internos dele. Este adaptador usa só a API pública do
+# asgiref.sync: SyncToAsync(thread_sensitive=False, executor=...) leva cada
+# request para o pool, e AsyncToSync(send) manda a resposta de volta ao loop.
+class AdaptadorASGI:
+    def __init__(self, wsgi_app, executor):
+        from asgiref.sync import SyncToAsync
+
+        self.wsgi_app = wsgi_app
+        self._rodar = SyncToAsync(self._rodar_wsgi, thread_sensitive=False, executor=executor)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":  # nada a iniciar/encerrar
+            while True:
+                mensagem = await receive()
+                if mensagem["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif mensagem["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            raise ValueError(f"escopo ASGI não suportado: {scope['type']}")
+
+        corpo = io.BytesIO()
+        while True:
+            mensagem = await receive()
+            if mensagem["type"] == "http.disconnect":
+                return
+            corpo.write(mensagem.get("body", b""))
+            if not mensagem.get("more_body"):
+                break
+        corpo.seek(0)
+        await self._rodar(_environ(scope, corpo), send)
+
+    def _rodar_wsgi(self, environ, send):
+        from asgiref.sync import AsyncToSync
+
+        enviar = AsyncToSync(send)
+        inicio = {}
+
+        def start_response(status, cabecalhos, exc_info=None):
+            if exc_info and inicio.get("enviado"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            inicio["mensagem"] = {
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [(nome.lower().encode("ascii"), valor.encode("latin1"))
+                            for nome, valor in cabecalhos],
+            }
+
+        resposta = self.wsgi_app(environ, start_response)
+        try:
+            for pedaco in resposta:
+                if not pedaco:
+                    continue
+                if not inicio.get("enviado"):
+                    enviar(inicio["mensagem"])
+                    inicio["enviado"] = True
+                enviar({"type": "http.response.body", "body": pedaco, "more_body": True})
+        finally:
+            if hasattr(resposta, "close"):
+                resposta.close()
+        if not inicio.get("enviado"):
+            enviar(inicio["mensagem"])
+        enviar({"type": "http.response.body"})
+
+
+def _environ(scope, corpo):
+    """Monta o environ WSGI (PEP 3333) a partir do escopo HTTP do ASGI."""
+    raiz = scope.get("root_path", "")
+    caminho = scope["path"]
+    if raiz and caminho.startswith(raiz):
+        caminho = caminho[len(raiz):]
+    servidor = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": raiz.encode("utf8").decode("latin1"),
+        "PATH_INFO": caminho.encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_NAME": servidor[0],
+        "SERVER_PORT": str(servidor[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": corpo,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"], environ["REMOTE_PORT"] = scope["client"][0], str(scope["client"][1])
+    for nome, valor in scope.get("headers", []):
+        nome = nome.decode("latin1").upper().replace("-", "_")
+        chave = nome if nome in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{nome}"
+        valor = valor.decode("latin1")
+        environ[chave] = f"{environ[chave]},{valor}" if chave in environ else valor
+    return environ
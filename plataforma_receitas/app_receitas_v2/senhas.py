@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TempoEsgotado
+from functools import lru_cache
+
+from flask import abort, current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# ----------------- HASH DE SENHAS -----------------
+# scrypt/pbkdf2 são lentos de propósito (centenas de ms de CPU). Rodando
+# dentro do worker, uma rajada de logins trava o worker inteiro. Aqui o cálculo
+# vai para um pool de processos de tamanho fixo:
+#   SENHA_METODO         método do werkzeug, ex.: "scrypt:32768:8:1" ou "pbkdf2:sha256:600000"
+#   SENHA_PROCESSOS      processos no pool (0 = calcula no próprio worker)
+#   SENHA_MAX_PENDENTES  hashes na fila ou rodando antes de responder 503
+#   SENHA_TIMEOUT        segundos esperando o resultado
+#   SENHA_MP_CONTEXTO    "forkserver"/"spawn" (padrão) ou "fork"
+# A vaga é devolvida quando o processo filho termina (add_done_callback), não
+# quando o request desiste de esperar: um hash que estourou o timeout continua
+# ocupando a vaga até acabar, então SENHA_MAX_PENDENTES limita o trabalho de
+# verdade. Sem vaga livre responde 503 na hora, sem prender a thread do request.
+# Quando o método/custo muda, o hash antigo é refeito no próximo login.
+
+_trava = threading.Lock()
+_executor = None
+_vagas = None
+_pid = None
+
+
+def _contexto_padrao():
+    metodos = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in metodos else "spawn"
+
+
+def _pool():
+    global _executor, _vagas, _pid
+    processos = current_app.config.get("SENHA_PROCESSOS", 0)
+    if not processos:
+        return None, None
+    with _trava:
+        # Depois de um fork (gunicorn) o pool do processo pai não serve
+        if _executor is None or _pid != os.getpid():
+            # fork copiaria as threads/conexões abertas do worker para o filho
+            contexto = multiprocessing.get_context(
+                current_app.config.get("SENHA_MP_CONTEXTO") or _contexto_padrao())
+            _executor = ProcessPoolExecutor(max_workers=processos, mp_context=contexto)
+            _vagas = threading.BoundedSemaphore(
+                current_app.config.get("SENHA_MAX_PENDENTES", processos * 4))
+            _pid = os.getpid()
+    return _executor, _vagas
+
+
+def _executar(funcao, *args):
+    executor, vagas = _pool()
+    if executor is None:
+        return funcao(*args)
+
+    if not vagas.acquire(blocking=False):
+        abort(503)
+    try:
+        futuro = executor.submit(funcao, *args)
+    except Exception:
+        vagas.release()
+        raise
+    futuro.add_done_callback(lambda _: vagas.release())
+    try:
+        return futuro.result(timeout=current_app.config.get("SENHA_TIMEOUT", 10))
+    except TempoEsgotado:
+        futuro.cancel()  # ainda na fila: sai dela e devolve a vaga
+        abort(503)
+
+
+def metodo_configurado():
+    return current_app.config.get("SENHA_METODO", "scrypt")
+
+
+@lru_cache(maxsize=8)
+def _prefixo(metodo):
+    """'scrypt' -> 'scrypt:32768:8:1' (o cabeçalho que o werkzeug grava no hash)."""
+    return generate_password_hash("", metodo).split("$", 1)[0]
+
+
+def gerar_hash(senha):
+    return _executar(generate_password_hash, senha, metodo_configurado())
+
+
+def verificar(senha_hash, senha):
+    return _executar(check_password_hash, senha_hash, senha)
+
+
+def precisa_rehash(senha_hash):
+    """True se o hash foi gerado com outro método/custo que o configurado."""
+    return senha_hash.split("$", 1)[0] != _prefixo(metodo_configurado())
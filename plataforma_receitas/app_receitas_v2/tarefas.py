@@ -0,0 +1,254 @@
+import json
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+from collections import Counter, namedtuple
+from datetime import timedelta
+
+from flask import current_app, has_request_context
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from models import db, agora, Tarefa
+
+# ----------------- FILA DE TAREFAS -----------------
+# Trabalho que não precisa acontecer antes do redirect (índice de busca,
+# contadores, notificações) vira uma linha em `tarefas`, inserida NA MESMA
+# transação da escrita: se o request der rollback a tarefa some junto, e se
+# ele der commit a tarefa com certeza existe.
+#
+# `flask trabalhador` sobe um pool de processos que:
+#   - reserva tarefas vencidas com um UPDATE condicional por tarefa (quem
+#     mudou a linha primeiro ganhou; funciona com vários processos/máquinas);
+#   - executa a função do tipo e marca "concluida" na mesma transação das
+#     escritas da tarefa (o efeito no banco acontece uma vez só);
+#   - se der erro, tenta de novo com backoff exponencial (com jitter) até
+#     `max_tentativas`, depois marca "falhou" (`flask tarefas --reenfileirar`);
+#   - reserva expirada (processo morreu no meio) volta para a fila sozinha.
+# Chave de idempotência: enfileirar duas vezes a mesma `chave` cria uma
+# tarefa só (UNIQUE + ON CONFLICT DO NOTHING), enquanto a linha existir
+# (concluídas são apagadas depois de TAREFAS_RETENCAO_DIAS).
+#
+#   TAREFAS_ASSINCRONAS     liga o adiamento nos requests (sem ele, tudo
+#                           continua síncrono, como antes)
+#   TAREFAS_PROCESSOS       processos no pool do `flask trabalhador`
+#   TAREFAS_LOTE            tarefas reservadas por vez, por processo
+#   TAREFAS_INTERVALO_MS    espera quando a fila está vazia
+#   TAREFAS_RESERVA         segundos até uma reserva expirar
+#   TAREFAS_BACKOFF_BASE / TAREFAS_BACKOFF_MAXIMO   segundos
+
+logger = logging.getLogger("receitas.tarefas")
+
+TipoTarefa = namedtuple("TipoTarefa", "funcao max_tentativas")
+
+TIPOS = {}
+
+
+def tarefa(tipo, max_tentativas=5):
+    """Registra `funcao(dados)` como executora das tarefas de `tipo`."""
+    def registrar(funcao):
+        TIPOS[tipo] = TipoTarefa(funcao, max_tentativas)
+        return funcao
+    return registrar
+
+
+def adiar():
+    """True se a escrita atual deve deixar o trabalho pesado para a fila."""
+    return has_request_context() and current_app.config.get("TAREFAS_ASSINCRONAS", False)
+
+# ----------------- ENFILEIRAR -----------------
+def enfileirar(conexao, tipo, dados=None, chave=None, atraso=0):
+    """Insere a tarefa na transação de `conexao`. Chave já existente: não faz nada."""
+    if tipo not in TIPOS:
+        raise ValueError(f"tipo de tarefa desconhecido: {tipo}")
+    tabela = Tarefa.__table__
+    linha = {
+        "tipo": tipo,
+        "dados": json.dumps(dados or {}, ensure_ascii=False, separators=(",", ":")),
+        "chave": chave,
+        "max_tentativas": TIPOS[tipo].max_tentativas,
+        "executar_em": agora() + timedelta(seconds=atraso),
+    }
+    dialeto = conexao.dialect.name
+    if chave is None:
+        conexao.execute(insert(tabela), [linha])
+        return
+    if dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+    elif dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+    else:
+        try:
+            with conexao.begin_nested():
+                conexao.execute(insert(tabela), [linha])
+        except IntegrityError:
+            pass
+        return
+    conexao.execute(insert_dialeto(tabela).on_conflict_do_nothing(index_elements=["chave"]), [linha])
+
+# ----------------- RESERVA E EXECUÇÃO -----------------
+def _backoff(tentativas, config):
+    base = config.get("TAREFAS_BACKOFF_BASE", 2)
+    maximo = config.get("TAREFAS_BACKOFF_MAXIMO", 600)
+    return min(maximo, base * 2 ** (tentativas - 1)) * random.uniform(0.5, 1.0)
+
+
+def reservar(engine, dono, limite, reserva):
+    """Ids das tarefas que `dono` conseguiu reservar (até `limite`)."""
+    t = Tarefa.__table__
+    momento = agora()
+    with engine.begin() as conexao:
+        candidatas = conexao.execute(
+            select(t.c.id, t.c.estado, t.c.executar_em)
+            .where(t.c.estado.in_(("pendente", "executando")), t.c.executar_em <= momento)
+            .order_by(t.c.executar_em)
+            .limit(limite)
+        ).all()
+    reservadas = []
+    for tarefa_id, estado, executar_em in candidatas:
+        # uma transação curta por tarefa, começando já pela escrita
+        with engine.begin() as conexao:
+            ganhou = conexao.execute(
+                update(t)
+                .where(t.c.id == tarefa_id, t.c.estado == estado, t.c.executar_em == executar_em)
+                .values(estado="executando", dono=dono, tentativas=t.c.tentativas + 1,
+                        executar_em=momento + timedelta(seconds=reserva))
+            ).rowcount
+        if ganhou:
+            reservadas.append(tarefa_id)
+    return reservadas
+
+
+def _executar(tarefa_id, dono):
+    t = Tarefa.__table__
+    linha = db.session.execute(
+        select(t.c.tipo, t.c.dados, t.c.tentativas, t.c.max_tentativas).where(t.c.id == tarefa_id)
+    ).one()
+    minha = (t.c.id == tarefa_id) & (t.c.dono == dono) & (t.c.estado == "executando")
+    try:
+        if linha.tipo not in TIPOS:
+            raise LookupError(f"tipo de tarefa desconhecido: {linha.tipo}")
+        TIPOS[linha.tipo].funcao(json.loads(linha.dados))
+        concluida = db.session.execute(
+            update(t).where(minha).values(estado="concluida", concluida_em=agora(), dono=None, erro=None)
+        ).rowcount
+        if not concluida:
+            # a reserva expirou e outro processo pegou a tarefa: o efeito fica com ele
+            db.session.rollback()
+            return False
+        db.session.commit()
+        return True
+    except Exception as erro:
+        db.session.rollback()
+        desistir = linha.tentativas >= linha.max_tentativas
+        valores = {"estado": "falhou" if desistir else "pendente", "dono": None, "erro": repr(erro)[:2000]}
+        if not desistir:
+            valores["executar_em"] = agora() + timedelta(seconds=_backoff(linha.tentativas, current_app.config))
+        db.session.execute(update(t).where(minha).values(**valores))
+        db.session.commit()
+        logger.warning("tarefa %s (%s) falhou na tentativa %s/%s: %r", tarefa_id, linha.tipo,
+                       linha.tentativas, linha.max_tentativas, erro)
+        return False
+
+
+def processar(dono, limite=None):
+    """Reserva e executa um lote; devolve quantas tarefas foram reservadas."""
+    config = current_app.config
+    limite = limite or config.get("TAREFAS_LOTE", 20)
+    ids = reservar(db.engine, dono, limite, config.get("TAREFAS_RESERVA", 60))
+    for tarefa_id in ids:
+        _executar(tarefa_id, dono)
+    return len(ids)
+
+
+def dono_atual():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+# ----------------- POOL DE PROCESSOS -----------------
+# O pai só supervisiona: recria quem morrer e, no SIGINT/SIGTERM, manda
+# SIGTERM para cada filho, que termina a tarefa em andamento e sai. (Nada de
+# Event compartilhado: um filho morto com SIGKILL no meio de um wait() deixa
+# o Event.set() do pai travado para sempre.)
+
+def _trabalhar(app):
+    sinais = []
+    # Ctrl+C chega a todo o grupo de processos: quem decide parar é o pai
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda numero, quadro: sinais.append(numero))
+    pai = os.getppid()
+    with app.app_context():
+        db.engine.dispose(close=False)  # conexões herdadas do fork são do pai
+        intervalo = app.config.get("TAREFAS_INTERVALO_MS", 500) / 1000
+        dono = dono_atual()
+        while not sinais and os.getppid() == pai:
+            try:
+                reservadas = processar(dono)
+            except OperationalError as erro:  # banco ocupado/fora do ar: tenta no próximo ciclo
+                logger.warning("trabalhador %s: %s", dono, erro)
+                reservadas = 0
+            finally:
+                db.session.remove()
+            if not reservadas:
+                time.sleep(intervalo)
+
+
+def rodar_pool(app, processos, ao_reiniciar=None):
+    """Mantém `processos` trabalhadores vivos até SIGINT/SIGTERM."""
+    contexto = multiprocessing.get_context("fork")
+
+    def novo():
+        processo = contexto.Process(target=_trabalhar, args=(app,), name="trabalhador")
+        processo.start()
+        return processo
+
+    sinais = []
+    signal.signal(signal.SIGINT, lambda numero, quadro: sinais.append(numero))
+    signal.signal(signal.SIGTERM, lambda numero, quadro: sinais.append(numero))
+    filhos = [novo() for _ in range(processos)]
+    while not sinais:
+        time.sleep(1)
+        for i, filho in enumerate(filhos):
+            if not filho.is_alive() and not sinais:
+                if ao_reiniciar:
+                    ao_reiniciar(filho)
+                filhos[i] = novo()
+    for filho in filhos:
+        filho.terminate()
+    for filho in filhos:
+        filho.join()
+
+
+def drenar(dono=None):
+    """Executa no próprio processo até não sobrar tarefa vencida."""
+    dono = dono or dono_atual()
+    total = 0
+    while reservadas := processar(dono):
+        total += reservadas
+    return total
+
+# ----------------- MANUTENÇÃO -----------------
+def resumo(conexao):
+    """{(tipo, estado): quantidade}"""
+    t = Tarefa.__table__
+    linhas = conexao.execute(select(t.c.tipo, t.c.estado, func.count()).group_by(t.c.tipo, t.c.estado))
+    return Counter({(tipo, estado): n for tipo, estado, n in linhas})
+
+
+def reenfileirar_falhas(conexao):
+    t = Tarefa.__table__
+    return conexao.execute(
+        update(t).where(t.c.estado == "falhou")
+        .values(estado="pendente", tentativas=0, executar_em=agora(), erro=None)
+    ).rowcount
+
+
+def limpar(conexao, dias):
+    """Apaga as concluídas há mais de `dias` (libera as chaves de idempotência)."""
+    t = Tarefa.__table__
+    return conexao.execute(
+        delete(t).where(t.c.estado == "concluida", t.c.concluida_em < agora() - timedelta(days=dias))
+    ).rowcount
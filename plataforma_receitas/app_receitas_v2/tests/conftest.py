@@ -0,0 +1,39 @@
+"""Fixtures comuns: um app ConfigTeste (banco descartável com o init-db) por módulo.
+
+    cd plataforma_receitas/app_receitas_v2 && python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from auth import cache_usuarios  # noqa: E402
+import indice_ingredientes  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = create_app("teste")
+    resultado = app.test_cli_runner().invoke(args=["init-db"])
+    assert resultado.exit_code == 0, resultado.output
+    # usuários e índice de ingredientes são do processo, e cada módulo tem um
+    # banco novo (com as mesmas versões): sem isso valeria o do módulo anterior
+    cache_usuarios.clear()
+    indice_ingredientes.indice.carregar((), versao=None)
+    return app
+
+
+@pytest.fixture
+def cliente(app):
+    cliente = app.test_client()
+    cliente.post("/login", data={"usuario": "admin", "senha": "admin"})
+    return cliente
+
+
+@pytest.fixture
+def contexto(app):
+    with app.app_context():
+        yield
@@ -0,0 +1,19 @@
+"""Rotas de admin.py: só usuários em ADMINS leem as estatísticas."""
+import pytest
+
+ESTATISTICAS = ["/api/estatisticas/pool", "/api/estatisticas/catalogo", "/api/estatisticas/fragmentos"]
+
+
+@pytest.fixture
+def cliente_comum(app):
+    cliente = app.test_client()
+    cliente.post("/register", data={"usuario": "maria", "senha": "maria"})
+    cliente.post("/login", data={"usuario": "maria", "senha": "maria"})
+    return cliente
+
+
+@pytest.mark.parametrize("url", ESTATISTICAS)
+def test_estatisticas_so_para_admins(app, cliente, cliente_comum, url):
+    assert app.test_client().get(url).status_code == 302  # sem login: vai para /login
+    assert cliente_comum.get(url).status_code == 403
+    assert cliente.get(url).status_code == 200
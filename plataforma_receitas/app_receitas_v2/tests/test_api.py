@@ -0,0 +1,18 @@
+"""API JSON (api.py): só as colunas e os JOINs que os campos pedidos precisam."""
+import api
+
+
+def _sql(recurso, campos):
+    return str(api.RECURSOS[recurso].consulta(campos).statement)
+
+
+def test_join_so_para_campos_da_outra_tabela(contexto):
+    assert "JOIN chefs" not in _sql("receitas", ["id", "titulo", "chef.id"])
+    assert "LEFT OUTER JOIN chefs" in _sql("receitas", ["id", "chef.nome"])
+    assert "JOIN perfis_chefs" not in _sql("chefs", ["id", "nome"])
+    assert "LEFT OUTER JOIN perfis_chefs" in _sql("chefs", ["perfil.especialidade"])
+
+
+def test_fields_com_chef_id_sem_join(cliente):
+    receitas = cliente.get("/api/v1/receitas?fields=id,chef.id").get_json()["itens"]
+    assert receitas and all(set(r) == {"id", "chef"} and set(r["chef"]) == {"id"} for r in receitas)
@@ -0,0 +1,57 @@
+"""Índice FTS5 (busca.py) acompanhando cada commit: criar, editar, excluir, rollback."""
+from models import db, Chef, Receita
+
+
+def _titulos(cliente, termo):
+    return [item["titulo"] for item in cliente.get(f"/api/busca?q={termo}").get_json()]
+
+
+def _nova_receita(cliente, app, titulo, ingredientes="", chef_id=None):
+    with app.app_context():
+        chef_id = chef_id or Chef.query.first().id
+    cliente.post("/receita/nova", data={
+        "titulo": titulo, "instrucoes": "Refogue e sirva.", "chef_id": chef_id, "ingredientes": ingredientes,
+    })
+    with app.app_context():
+        return Receita.query.filter_by(titulo=titulo).one().id
+
+
+def test_receita_nova_entra_no_indice(app, cliente):
+    _nova_receita(cliente, app, "Moqueca Baiana", "dendê:2 colheres, peixe:1 kg")
+    assert _titulos(cliente, "moqueca") == ["Moqueca Baiana"]
+    assert _titulos(cliente, "dende") == ["Moqueca Baiana"]  # ingrediente, sem acento
+
+
+def test_edicao_reindexa(app, cliente):
+    receita_id = _nova_receita(cliente, app, "Caldo Verde")
+    cliente.post(f"/receita/editar/{receita_id}", data={"titulo": "Sopa de Couve", "instrucoes": "Ferva."})
+    assert _titulos(cliente, "caldo") == []
+    assert _titulos(cliente, "couve") == ["Sopa de Couve"]
+
+
+def test_exclusao_remove_do_indice(app, cliente):
+    receita_id = _nova_receita(cliente, app, "Tapioca Recheada")
+    cliente.post(f"/receita/excluir/{receita_id}")
+    assert _titulos(cliente, "tapioca") == []
+
+
+def test_exclusao_do_chef_remove_as_receitas_dele(app, cliente):
+    cliente.post("/chef/novo", data={"nome": "Temporário", "especialidade": "", "anos_experiencia": "1"})
+    with app.app_context():
+        chef_id = Chef.query.filter_by(nome="Temporário").one().id
+    _nova_receita(cliente, app, "Cuscuz Paulista", chef_id=chef_id)
+    assert _titulos(cliente, "cuscuz") == ["Cuscuz Paulista"]
+
+    cliente.post(f"/chef/excluir/{chef_id}")
+    assert _titulos(cliente, "cuscuz") == []
+
+
+def test_rollback_nao_indexa(app, cliente):
+    with app.app_context():
+        db.session.add(Receita(titulo="Pamonha", instrucoes="x", chef_id=Chef.query.first().id))
+        db.session.flush()
+        db.session.rollback()
+        db.session.add(Receita(titulo="Curau", instrucoes="x", chef_id=Chef.query.first().id))
+        db.session.commit()
+    assert _titulos(cliente, "pamonha") == []
+    assert _titulos(cliente, "curau") == ["Curau"]
@@ -0,0 +1,48 @@
+"""GET condicional (cache_http.py): 304 com o mesmo ETag, flash pendente renderiza."""
+import pytest
+
+
+@pytest.fixture
+def cliente(cliente):
+    cliente.get("/chefs")  # consome o flash do login
+    return cliente
+
+
+def test_mesmo_etag_responde_304(cliente):
+    resposta = cliente.get("/chefs")
+    etag = resposta.headers["ETag"]
+    assert resposta.status_code == 200 and etag.startswith('W/"')
+    assert resposta.headers["Cache-Control"] == "private, no-cache"
+
+    repetida = cliente.get("/chefs", headers={"If-None-Match": etag})
+    assert repetida.status_code == 304
+    assert repetida.data == b""
+    assert repetida.headers["ETag"] == etag
+
+
+def test_if_modified_since_responde_304(cliente):
+    ultima_modificacao = cliente.get("/").headers["Last-Modified"]
+    assert cliente.get("/", headers={"If-Modified-Since": ultima_modificacao}).status_code == 304
+
+
+def test_flash_pendente_renderiza_mesmo_com_etag_igual(cliente):
+    etag = cliente.get("/chefs").headers["ETag"]
+    with cliente.session_transaction() as sessao:
+        sessao["_flashes"] = [("info", "Mensagem pendente")]
+
+    resposta = cliente.get("/chefs", headers={"If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert "Mensagem pendente" in resposta.text
+    # a mensagem foi exibida: o próximo pedido volta a ser 304
+    assert cliente.get("/chefs", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_escrita_muda_o_etag(cliente):
+    etag = cliente.get("/chefs").headers["ETag"]
+    cliente.post("/chef/novo", data={"nome": "Paola", "especialidade": "Italiana", "anos_experiencia": "20"})
+    cliente.get("/chefs")  # consome o flash do cadastro
+
+    resposta = cliente.get("/chefs", headers={"If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert resposta.headers["ETag"] != etag
+    assert "Paola" in resposta.text
@@ -0,0 +1,32 @@
+"""Número de consultas por página: não pode crescer com a quantidade de linhas.
+
+    cd plataforma_receitas/app_receitas_v2 && python -m pytest -q tests
+"""
+import pytest
+
+from consultas import limite_de_consultas
+from models import Chef
+
+
+@pytest.fixture
+def cliente(cliente):
+    # a 1ª página ainda busca o usuário da sessão (+1 consulta); depois ele
+    # fica no auth.cache_usuarios e o que sobra é o custo da própria página
+    cliente.get("/")
+    return cliente
+
+
+@pytest.mark.parametrize("url, maximo", [
+    ("/", 2),
+    ("/chefs", 2),
+])
+def test_listagens(app, cliente, url, maximo):
+    with app.app_context(), limite_de_consultas(maximo):
+        assert cliente.get(url).status_code == 200
+
+
+def test_detalhes_chef(app, cliente):
+    with app.app_context():
+        chef_id = Chef.query.first().id
+    with app.app_context(), limite_de_consultas(3):
+        assert cliente.get(f"/chef/{chef_id}").status_code == 200
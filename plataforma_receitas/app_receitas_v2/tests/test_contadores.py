@@ -0,0 +1,45 @@
+"""Contadores desnormalizados (contadores.py): mantidos nas escritas e reconciliados."""
+from sqlalchemy import update
+
+from models import db, Chef, Ingrediente, Receita
+import contadores
+import versoes
+
+
+def test_escritas_mantem_os_contadores(app, cliente):
+    with app.app_context():
+        chef = Chef.query.filter_by(nome="Ana Maria").one()
+        chef_id, total_antes = chef.id, chef.total_receitas
+    cliente.post("/receita/nova", data={
+        "titulo": "Cuscuz", "instrucoes": "x", "chef_id": chef_id, "ingredientes": "tomate:1, milho:2",
+    })
+    with app.app_context():
+        assert db.session.get(Chef, chef_id).total_receitas == total_antes + 1
+        assert Receita.query.filter_by(titulo="Cuscuz").one().total_ingredientes == 2
+        assert Ingrediente.query.filter_by(nome="milho").one().total_receitas == 1
+        assert contadores.divergentes(db.session.connection()) == {"chefs": 0, "ingredientes": 0, "receitas": 0}
+
+
+def test_reconciliar_corrige_e_versiona(app, contexto):
+    chef = Chef.query.filter_by(nome="Érick Jacquin").one()
+    chef_id, versao_chef = chef.id, chef.versao
+    versao_chefs = versoes.versoes("chefs")["chefs"][0]
+    db.session.execute(update(Chef).where(Chef.id == chef_id).values(total_receitas=99))
+    db.session.execute(update(Receita).values(total_ingredientes=0))
+    db.session.commit()
+
+    conexao = db.session.connection()
+    divergentes = contadores.divergentes(conexao)
+    assert divergentes["chefs"] == 1 and divergentes["receitas"] > 0 and divergentes["ingredientes"] == 0
+    resultado = app.test_cli_runner().invoke(args=["reconciliar-contadores", "--verificar"])
+    assert resultado.exit_code == 1
+
+    corrigidos = contadores.reconciliar(db.session.connection())
+    db.session.commit()
+    assert corrigidos == divergentes
+    assert contadores.divergentes(db.session.connection()) == {"chefs": 0, "ingredientes": 0, "receitas": 0}
+
+    chef = db.session.get(Chef, chef_id)
+    assert chef.total_receitas == 1
+    assert chef.versao == versao_chef + 1  # ETag/fragmento do chef mudam
+    assert versoes.versoes("chefs")["chefs"][0] == versao_chefs + 1
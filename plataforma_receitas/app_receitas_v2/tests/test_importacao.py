@@ -0,0 +1,61 @@
+"""Import (importacao.py): interrompido no meio, retoma do checkpoint sem duplicar."""
+import json
+import os
+
+import pytest
+from sqlalchemy import func, select
+
+from models import db, Chef, Ingrediente, Receita, ReceitaIngrediente
+import importacao
+
+
+class Interrompido(Exception):
+    pass
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = tmp_path / "receitas.ndjson"
+    linhas = [
+        {"titulo": f"Importada {n}", "instrucoes": "x",
+         "chef": {"nome": f"Chef {n % 2}", "especialidade": "Teste", "anos_experiencia": n},
+         "ingredientes": [{"nome": "sal", "quantidade": "1 pitada"}, {"nome": f"item {n}", "quantidade": "1"}]}
+        for n in range(7)
+    ]
+    linhas.insert(3, {"titulo": "", "chef": "sem título"})  # inválido: ignorado, mas conta no checkpoint
+    caminho.write_text("".join(json.dumps(linha) + "\n" for linha in linhas), encoding="utf-8")
+    return str(caminho)
+
+
+def _importadas():
+    return db.session.execute(
+        select(Receita.titulo).where(Receita.titulo.like("Importada %")).order_by(Receita.titulo)
+    ).scalars().all()
+
+
+def test_retoma_do_checkpoint(contexto, arquivo):
+    def parar_no_segundo_commit(importador, lidos, segundos):
+        if lidos >= 4:
+            raise Interrompido
+
+    with pytest.raises(Interrompido):
+        importacao.importar_arquivo(arquivo, lote=2, progresso=parar_no_segundo_commit)
+    assert importacao.ler_checkpoint(arquivo) == 4
+    assert len(_importadas()) == 3
+
+    importador = importacao.importar_arquivo(arquivo, lote=2)
+    assert importador.receitas == 4
+    assert _importadas() == [f"Importada {n}" for n in range(7)]
+    assert not os.path.exists(importacao.caminho_checkpoint(arquivo))
+
+    # chefs e ingredientes criados na 1ª execução foram reaproveitados
+    assert db.session.execute(select(func.count()).where(Chef.nome.like("Chef %"))).scalar() == 2
+    assert db.session.execute(
+        select(func.count()).select_from(ReceitaIngrediente).join(Ingrediente).where(Ingrediente.nome == "sal")
+    ).scalar() == 7
+
+
+def test_do_inicio_ignora_o_checkpoint(contexto, arquivo):
+    importacao.gravar_checkpoint(arquivo, 5)
+    importador = importacao.importar_arquivo(arquivo, lote=3, retomar=False)
+    assert importador.receitas == 7 and importador.ignorados == 1
@@ -0,0 +1,68 @@
+"""Índice invertido de ingredientes (indice_ingredientes.py) em dia depois de cada escrita."""
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from models import db, Chef, Ingrediente, Receita, ReceitaIngrediente
+import indice_ingredientes
+import versoes
+
+
+def _ranking(cliente, nomes):
+    resposta = cliente.get(f"/api/receitas/com-ingredientes?ingredientes={nomes}")
+    return {item["titulo"]: item["ingredientes_cobertos"] for item in resposta.get_json()}
+
+
+@pytest.fixture
+def cargas(monkeypatch):
+    """Quantas vezes o índice foi recarregado do zero durante o teste."""
+    contador = []
+    original = indice_ingredientes.indice.carregar
+    monkeypatch.setattr(indice_ingredientes.indice, "carregar",
+                        lambda *args, **kwargs: contador.append(1) or original(*args, **kwargs))
+    return contador
+
+
+def test_insercao_e_exclusao_sem_recarregar(app, cliente, cargas):
+    assert _ranking(cliente, "tomate,cebola,ovo") == {"Molho de Tomate Clássico": 2, "Bolo Simples": 1}
+    carregamentos = len(cargas)
+
+    with app.app_context():
+        chef_id = Chef.query.first().id
+    cliente.post("/receita/nova", data={
+        "titulo": "Omelete", "instrucoes": "Bata e frite.", "chef_id": chef_id,
+        "ingredientes": "ovo:3, tomate:1, cebola:1/2",
+    })
+    assert _ranking(cliente, "tomate,cebola,ovo")["Omelete"] == 3
+
+    with app.app_context():
+        omelete_id = Receita.query.filter_by(titulo="Omelete").one().id
+    cliente.post(f"/receita/excluir/{omelete_id}")
+    assert "Omelete" not in _ranking(cliente, "tomate,cebola,ovo")
+
+    # os commits deste processo atualizam o índice sem reler as associações
+    assert len(cargas) == carregamentos
+
+
+def test_escrita_de_outro_processo_recarrega(app, cliente, cargas):
+    _ranking(cliente, "manteiga")
+    carregamentos = len(cargas)
+    with app.app_context():
+        receita_id = Receita.query.filter_by(titulo="Bolo Simples").one().id
+        manteiga_id = Ingrediente.query.filter_by(nome="manteiga").one().id
+    # outra conexão, sem os hooks da sessão (como outro worker ou o import)
+    with create_engine(app.config["SQLALCHEMY_DATABASE_URI"]).begin() as conexao:
+        conexao.execute(insert(ReceitaIngrediente.__table__),
+                        {"receita_id": receita_id, "ingrediente_id": manteiga_id, "quantidade": "100g"})
+        versoes.incrementar(conexao, {"receitas"})
+
+    assert _ranking(cliente, "manteiga")["Bolo Simples"] == 1
+    assert len(cargas) == carregamentos + 1
+
+
+def test_indice_igual_ao_banco(contexto):
+    pares = db.session.execute(
+        select(ReceitaIngrediente.receita_id, ReceitaIngrediente.ingrediente_id))
+    esperado = {}
+    for receita_id, ingrediente_id in pares:
+        esperado.setdefault(receita_id, set()).add(ingrediente_id)
+    assert indice_ingredientes.obter_indice().por_receita == esperado
@@ -0,0 +1,73 @@
+"""`flask migrar` (migracoes.py) num banco com o esquema original do projeto e dados."""
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from models import db
+import migracoes
+
+# esquema do app antes das migrações (o create_all do app.py original)
+ESQUEMA_ORIGINAL = """
+CREATE TABLE usuarios (id INTEGER NOT NULL, usuario VARCHAR(50) NOT NULL, senha_hash VARCHAR(200) NOT NULL,
+    PRIMARY KEY (id), UNIQUE (usuario));
+CREATE TABLE chefs (id INTEGER NOT NULL, nome VARCHAR(100) NOT NULL, PRIMARY KEY (id));
+CREATE TABLE perfis_chefs (id INTEGER NOT NULL, especialidade VARCHAR(100), anos_experiencia INTEGER,
+    chef_id INTEGER, PRIMARY KEY (id), FOREIGN KEY(chef_id) REFERENCES chefs (id));
+CREATE TABLE receitas (id INTEGER NOT NULL, titulo VARCHAR(200) NOT NULL, instrucoes TEXT NOT NULL,
+    chef_id INTEGER NOT NULL, PRIMARY KEY (id), FOREIGN KEY(chef_id) REFERENCES chefs (id));
+CREATE TABLE ingredientes (id INTEGER NOT NULL, nome VARCHAR(100) NOT NULL, PRIMARY KEY (id), UNIQUE (nome));
+CREATE TABLE receitas_ingredientes (id INTEGER NOT NULL, quantidade VARCHAR(50), receita_id INTEGER,
+    ingrediente_id INTEGER, PRIMARY KEY (id), FOREIGN KEY(receita_id) REFERENCES receitas (id),
+    FOREIGN KEY(ingrediente_id) REFERENCES ingredientes (id));
+INSERT INTO chefs (id, nome) VALUES (1, 'Ana Maria'), (2, 'Érick Jacquin');
+INSERT INTO perfis_chefs (especialidade, anos_experiencia, chef_id) VALUES ('Brasileira', 25, 1);
+INSERT INTO receitas (id, titulo, instrucoes, chef_id) VALUES
+    (1, 'Molho', 'x', 1), (2, 'Bolo', 'x', 1), (3, 'Petit Gâteau', 'x', 2);
+INSERT INTO ingredientes (id, nome) VALUES (1, 'tomate'), (2, 'farinha'), (3, 'ovo');
+INSERT INTO receitas_ingredientes (quantidade, receita_id, ingrediente_id) VALUES
+    ('5', 1, 1), ('2 xícaras', 2, 2), ('3', 2, 3),
+    ('repetida', 2, 3), ('órfã', 99, 1), ('sem ingrediente', 1, NULL);
+"""
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'original.db'}")
+    with engine.begin() as conexao:
+        for comando in ESQUEMA_ORIGINAL.split(";"):
+            if comando.strip():
+                conexao.exec_driver_sql(comando)
+    yield engine
+    engine.dispose()
+
+
+def test_migrar_banco_original(engine):
+    aplicadas = migracoes.migrar(engine=engine)
+    assert [m.id for m in aplicadas] == [m.id for m in migracoes.MIGRACOES]
+
+    with engine.connect() as conexao:
+        assert migracoes.pendentes(conexao) == []
+        # mesmas colunas e índices que um banco novo (create_all) teria
+        inspetor = inspect(conexao)
+        for tabela in db.metadata.sorted_tables:
+            assert {c["name"] for c in inspetor.get_columns(tabela.name)} == set(tabela.c.keys()), tabela.name
+            indices = {i["name"] for i in inspetor.get_indexes(tabela.name)}
+            assert {i.name for i in tabela.indexes} <= indices, tabela.name
+
+        associacoes = conexao.exec_driver_sql(
+            "SELECT receita_id, ingrediente_id FROM receitas_ingredientes ORDER BY id").all()
+        assert associacoes == [(1, 1), (2, 2), (2, 3)]
+        assert conexao.exec_driver_sql("SELECT id, total_receitas FROM chefs ORDER BY id").all() == [(1, 2), (2, 1)]
+        assert conexao.exec_driver_sql(
+            "SELECT id, total_ingredientes FROM receitas ORDER BY id").all() == [(1, 1), (2, 2), (3, 0)]
+
+    with engine.connect() as conexao:
+        conexao.exec_driver_sql("PRAGMA foreign_keys = ON")  # antes de abrir a transação
+        conexao.exec_driver_sql("DELETE FROM chefs WHERE id = 1")
+        assert conexao.exec_driver_sql("SELECT count(*) FROM receitas WHERE chef_id = 1").scalar() == 0
+        assert conexao.exec_driver_sql("SELECT count(*) FROM receitas_ingredientes").scalar() == 0
+        conexao.rollback()
+
+
+def test_migrar_de_novo_nao_faz_nada(engine):
+    migracoes.migrar(engine=engine)
+    assert migracoes.migrar(engine=engine) == []
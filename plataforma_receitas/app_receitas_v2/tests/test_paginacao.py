@@ -0,0 +1,77 @@
+"""Paginação keyset (paginacao.py) e listas limitadas: cursor, cursor adulterado, formulário."""
+import base64
+import json
+import re
+
+import pytest
+
+from models import Chef
+from paginacao import codificar_cursor
+import receitas
+
+
+def _cursor_bruto(dados):
+    return base64.urlsafe_b64encode(json.dumps(dados).encode()).decode().rstrip("=")
+
+
+def test_percorre_todas_as_receitas_pelo_cursor(cliente):
+    vistos, paginas, url = [], [], "/api/v1/receitas?tamanho=1"
+    while url:
+        pagina = cliente.get(url).get_json()
+        paginas.append(pagina)
+        vistos += [item["id"] for item in pagina["itens"]]
+        url = pagina["proximo"] and f"/api/v1/receitas?tamanho=1&cursor={pagina['proximo']}"
+
+    assert len(paginas) == 3
+    assert vistos == sorted(vistos) and len(set(vistos)) == 3
+    assert paginas[0]["anterior"] is None
+
+    # voltando da última: a página anterior é a do meio
+    anterior = cliente.get(f"/api/v1/receitas?tamanho=1&cursor={paginas[-1]['anterior']}").get_json()
+    assert [item["id"] for item in anterior["itens"]] == [vistos[1]]
+
+
+@pytest.mark.parametrize("cursor", [
+    "isto-nao-e-base64!",
+    _cursor_bruto(["n", 1]),
+    _cursor_bruto({"d": "x", "id": 1}),
+    _cursor_bruto({"d": "n", "id": "7"}),
+    _cursor_bruto({"d": "n", "id": True}),
+    _cursor_bruto({"d": "n", "id": 1.5}),
+    _cursor_bruto({"d": "n", "id": -1}),
+    _cursor_bruto({"d": "n", "id": 10**30}),
+    _cursor_bruto({"d": "n"}),
+])
+def test_cursor_adulterado_e_400(cliente, cursor):
+    assert cliente.get(f"/api/v1/receitas?cursor={cursor}").status_code == 400
+    assert cliente.get(f"/?cursor={cursor}").status_code == 400
+
+
+def test_cursor_depois_do_ultimo_id_devolve_pagina_vazia(cliente):
+    resposta = cliente.get(f"/api/v1/receitas?cursor={codificar_cursor('n', 2**63 - 1)}")
+    assert resposta.status_code == 200
+    assert resposta.get_json()["itens"] == []
+
+
+def test_detalhes_do_chef_pagina_as_receitas(app, cliente):
+    with app.app_context():
+        chef_id = Chef.query.filter_by(nome="Ana Maria").one().id
+    primeira = cliente.get(f"/chef/{chef_id}?tamanho=1")
+    assert primeira.status_code == 200
+    assert primeira.text.count("<li>") == 1
+    proxima = re.search(r'href="([^"]*cursor=[^"]*)"[^>]*>Próxima', primeira.text).group(1).replace("&amp;", "&")
+    assert proxima.startswith(f"/chef/{chef_id}?") and "tamanho=1" in proxima
+    segunda = cliente.get(proxima)
+    assert segunda.status_code == 200 and segunda.text.count("<li>") == 1
+    assert segunda.text != primeira.text
+
+
+def test_formulario_de_receita_limita_e_busca_chefs(app, cliente, monkeypatch):
+    monkeypatch.setattr(receitas, "CHEFS_NO_FORMULARIO", 1)
+    pagina = cliente.get("/receita/nova").text
+    assert pagina.count("<option ") == 1
+    assert "use a busca" in pagina
+
+    pagina = cliente.get("/receita/nova?chef=jacq").text
+    assert re.findall(r"<option [^>]*>([^<]*)</option>", pagina) == ["Érick Jacquin"]
+    assert "use a busca" not in pagina
@@ -0,0 +1,38 @@
+"""Perfilador (perfilador.py): o liga/desliga do admin chega aos outros workers."""
+from perfilador import Perfilador
+
+
+def _worker(pasta):
+    perfilador = Perfilador()
+    perfilador.pasta = str(pasta)
+    perfilador.VERIFICAR_A_CADA = 0
+    return perfilador
+
+
+def test_controle_compartilhado_pela_pasta(tmp_path):
+    admin, outro = _worker(tmp_path), _worker(tmp_path)
+    outro.sincronizar()
+    assert not outro.ligado  # sem controle.json: vale a config
+
+    admin.configurar(["receitas.index"], 10, intervalo_ms=20)
+    outro.sincronizar()
+    assert outro.ligado
+    assert (outro.endpoints, outro.porcentagem, outro.intervalo) == ({"receitas.index"}, 10.0, 0.02)
+
+    admin.desligar()
+    assert not outro.estado()["ligado"]
+
+
+def test_rota_do_admin_grava_o_controle(app, cliente, tmp_path, monkeypatch):
+    from perfilador import perfilador
+    monkeypatch.setattr(perfilador, "pasta", str(tmp_path))
+    resposta = cliente.post("/admin/perfilador", json={"endpoints": ["receitas.index"], "porcentagem": 5})
+    assert resposta.get_json()["ligado"]
+    try:
+        outro = _worker(tmp_path)
+        outro.sincronizar()
+        assert outro.endpoints == {"receitas.index"} and outro.porcentagem == 5.0
+    finally:
+        cliente.delete("/admin/perfilador")
+    outro.sincronizar()
+    assert not outro.ligado
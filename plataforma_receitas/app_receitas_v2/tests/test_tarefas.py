@@ -0,0 +1,81 @@
+"""Fila de tarefas (tarefas.py): idempotência, reserva entre processos e novas tentativas."""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from models import db, agora, Tarefa
+import tarefas
+
+executadas = []
+
+
+@tarefas.tarefa("teste.anotar")
+def _anotar(dados):
+    executadas.append(dados["n"])
+
+
+@tarefas.tarefa("teste.falhar", max_tentativas=2)
+def _falhar(dados):
+    raise RuntimeError("sempre falha")
+
+
+@pytest.fixture(autouse=True)
+def fila_vazia(contexto):
+    db.session.execute(Tarefa.__table__.delete())
+    db.session.commit()
+    executadas.clear()
+
+
+def _tarefa(tipo):
+    return db.session.execute(select(Tarefa).where(Tarefa.tipo == tipo)).scalar_one()
+
+
+def test_mesma_chave_enfileira_uma_vez(contexto):
+    tarefas.enfileirar(db.session.connection(), "teste.anotar", {"n": 1}, chave="unica")
+    tarefas.enfileirar(db.session.connection(), "teste.anotar", {"n": 2}, chave="unica")
+    db.session.commit()
+    assert tarefas.drenar() == 1
+    assert executadas == [1]
+
+
+def test_rollback_descarta_a_tarefa(contexto):
+    tarefas.enfileirar(db.session.connection(), "teste.anotar", {"n": 1})
+    db.session.rollback()
+    assert tarefas.drenar() == 0
+
+
+def test_reserva_e_de_um_dono_so_ate_expirar(contexto):
+    tarefas.enfileirar(db.session.connection(), "teste.anotar", {"n": 1})
+    db.session.commit()
+
+    assert len(tarefas.reservar(db.engine, "a", 10, reserva=60)) == 1
+    assert tarefas.reservar(db.engine, "b", 10, reserva=60) == []
+
+    # o dono "a" morreu: depois do prazo da reserva a tarefa volta para a fila
+    db.session.execute(update(Tarefa).values(executar_em=agora() - timedelta(seconds=1)))
+    db.session.commit()
+    assert len(tarefas.reservar(db.engine, "b", 10, reserva=60)) == 1
+    assert _tarefa("teste.anotar").tentativas == 2
+
+
+def test_falha_volta_com_backoff_e_desiste_no_limite(contexto):
+    tarefas.enfileirar(db.session.connection(), "teste.falhar")
+    db.session.commit()
+
+    assert tarefas.processar("a") == 1
+    tarefa = _tarefa("teste.falhar")
+    assert (tarefa.estado, tarefa.tentativas, tarefa.dono) == ("pendente", 1, None)
+    assert "sempre falha" in tarefa.erro
+    assert tarefa.executar_em > agora()
+    assert tarefas.processar("a") == 0  # ainda no backoff
+
+    db.session.execute(update(Tarefa).values(executar_em=agora()))
+    db.session.commit()
+    assert tarefas.processar("a") == 1
+    db.session.expire_all()
+    assert (_tarefa("teste.falhar").estado, _tarefa("teste.falhar").tentativas) == ("falhou", 2)
+
+    assert tarefas.reenfileirar_falhas(db.session.connection()) == 1
+    db.session.commit()
+    assert (_tarefa("teste.falhar").estado, _tarefa("teste.falhar").tentativas) == ("pendente", 0)
@@ -0,0 +1,96 @@
+from sqlalchemy import event, insert, select, update
+
+from models import db, agora, Chef, PerfilChef, Receita, ReceitaIngrediente, VersaoTabela
+
+# ----------------- VERSÕES -----------------
+# Toda escrita em Receita/Chef/PerfilChef, na mesma transação:
+#   - incrementa `versao` e renova `atualizado_em` da própria linha;
+#   - incrementa o chef "dono" (mudou o perfil ou uma receita dele);
+#   - incrementa o contador da tabela em `versoes` ("receitas" / "chefs").
+# As páginas montam o ETag só com esses números (ver cache_http.py).
+
+
+def _modificado(session, obj):
+    return session.is_modified(obj, include_collections=False)
+
+
+@event.listens_for(db.session, "before_flush")
+def _versionar_linhas(session, flush_context, instances):
+    for obj in session.dirty:
+        if isinstance(obj, (Receita, Chef)) and _modificado(session, obj):
+            obj.versao = (obj.versao or 0) + 1
+            obj.atualizado_em = agora()
+
+
+@event.listens_for(db.session, "after_flush")
+def _versionar_tabelas(session, flush_context):
+    tabelas = set()
+    chefs = set()   # chefs cuja página de detalhes mudou sem a linha do chef mudar
+    chefs_ja_versionados = set()
+
+    sujos = session.dirty  # cada acesso monta um conjunto novo
+    for obj in session.new | sujos | session.deleted:
+        if isinstance(obj, Receita):
+            if obj in sujos and not _modificado(session, obj):
+                continue
+            tabelas.add("receitas")
+            if obj.chef_id:
+                chefs.add(obj.chef_id)
+        elif isinstance(obj, PerfilChef):
+            if obj in sujos and not _modificado(session, obj):
+                continue
+            tabelas.add("chefs")
+            if obj.chef_id:
+                chefs.add(obj.chef_id)
+        elif isinstance(obj, Chef):
+            if obj in sujos and not _modificado(session, obj):
+                continue
+            tabelas.add("chefs")
+            chefs_ja_versionados.add(obj.id)
+        elif isinstance(obj, ReceitaIngrediente):
+            tabelas.add("receitas")  # o índice de ingredientes confere essa versão
+
+    if chefs:
+        tabelas.add("chefs")  # a listagem de chefs mostra total_receitas
+    chefs -= chefs_ja_versionados
+    if not (tabelas or chefs):
+        return
+
+    conexao = session.connection()
+    momento = agora()
+    incrementar_chefs(conexao, chefs, momento)
+    incrementar(conexao, tabelas, momento)
+
+
+def incrementar_chefs(conexao, chef_ids, momento=None):
+    """Soma 1 na versão dos chefs `chef_ids` (receitas deles mudaram)."""
+    if not chef_ids:
+        return
+    conexao.execute(
+        update(Chef.__table__)
+        .where(Chef.__table__.c.id.in_(chef_ids))
+        .values(versao=Chef.__table__.c.versao + 1, atualizado_em=momento or agora())
+    )
+
+
+def incrementar(conexao, tabelas, momento=None):
+    """Soma 1 no contador das `tabelas` (use também em escritas via Core)."""
+    momento = momento or agora()
+    t = VersaoTabela.__table__
+    for nome in tabelas:
+        resultado = conexao.execute(
+            update(t).where(t.c.nome == nome).values(versao=t.c.versao + 1, atualizado_em=momento)
+        )
+        if resultado.rowcount == 0:
+            conexao.execute(insert(t).values(nome=nome, versao=1, atualizado_em=momento))
+
+
+def versoes(*tabelas):
+    """{tabela: (versao, atualizado_em)} numa única consulta."""
+    linhas = db.session.execute(
+        select(VersaoTabela.nome, VersaoTabela.versao, VersaoTabela.atualizado_em)
+        .where(VersaoTabela.nome.in_(tabelas))
+    )
+    resultado = {nome: (0, None) for nome in tabelas}
+    resultado.update({nome: (versao, quando) for nome, versao, quando in linhas})
+    return resultado
@@ -1,15 +1,23 @@
 # app.py
+import os
+import sys
 from flask import Flask, render_template
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 
+# compartilhado/banco.py fica na raiz do repositório
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from compartilhado.banco import configurar_banco, registrar_pragmas
+
 app = Flask(__name__)
 
 # Configuração do banco de dados
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///meu_banco.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+configurar_banco(app)
 db = SQLAlchemy(app)
+registrar_pragmas(app, db)
 
 # Modelo User
 class User(db.Model):
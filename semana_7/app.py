@@ -1,11 +1,20 @@
+import os
+import sys
 from flask import Flask, render_template, request, redirect, url_for
 from models import db, Chef, PerfilChef, Receita, Ingrediente
 
+# compartilhado/banco.py fica na raiz do repositório
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from compartilhado.banco import configurar_banco, registrar_pragmas
+from indice_ingredientes import receitas_com_ingredientes
+
 app = Flask(__name__)
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///receitas.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+configurar_banco(app)
 db.init_app(app)
+registrar_pragmas(app, db)
 
 with app.app_context():
     db.create_all()
@@ -76,5 +85,14 @@ def buscar_por_ingrediente(nome_ingrediente):
     ingrediente = Ingrediente.query.filter_by(nome=nome_ingrediente).first_or_404()
     return render_template("buscar_ingrediente.html", ingrediente=ingrediente)
 
+@app.route("/receitas/com-ingredientes")
+def receitas_por_ingredientes():
+    # ?nomes=Tomate,Queijo,Manjericão -> receitas que mais cobrem a lista
+    nomes = [n for n in request.args.get("nomes", "").split(",") if n.strip()]
+    ranking = receitas_com_ingredientes(nomes)
+    receitas = {r.id: r for r in Receita.query.filter(Receita.id.in_([rid for rid, _ in ranking]))}
+    resultados = [(receitas[rid], cobertos) for rid, cobertos in ranking if rid in receitas]
+    return render_template("com_ingredientes.html", nomes=nomes, resultados=resultados)
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,104 @@
+from sqlalchemy import event, insert, select, update
+
+from models import db, Receita, Ingrediente, receita_ingredientes
+from compartilhado.indice_ingredientes import IndiceInvertido
+
+# Índice invertido ingrediente -> receitas (a estrutura é a mesma do
+# app_receitas_v2, em compartilhado/indice_ingredientes.py): cada ingrediente
+# tem um bitset das receitas que o usam, e a consulta "tenho X, Y e Z" conta a
+# cobertura de cada receita com operações de bits.
+# Fica em memória e é atualizado a cada commit deste processo que mexe em
+# receitas. Escrita de outro processo (outro worker, populate.py) não passa
+# por esses commits: todo flush que mexe em receitas/ingredientes soma 1 na
+# linha de `versao_indice`, e cada consulta lê essa linha pela chave primária;
+# versão diferente da que o índice tem, recarrega.
+
+versao_indice = db.Table(
+    "versao_indice",
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("versao", db.Integer, nullable=False, default=0),
+)
+
+indice = IndiceInvertido()
+
+
+def _pares(receita_ids=None):
+    sql = select(receita_ingredientes.c.receita_id, receita_ingredientes.c.ingrediente_id)
+    if receita_ids is not None:
+        sql = sql.where(receita_ingredientes.c.receita_id.in_(receita_ids))
+    return db.session.execute(sql)
+
+
+def _versao(session):
+    return session.execute(
+        select(versao_indice.c.versao).where(versao_indice.c.id == 1)
+    ).scalar() or 0
+
+
+def obter_indice():
+    versao = _versao(db.session)  # antes dos pares: escrita no meio só força outra recarga
+    if not indice.carregado or indice.versao != versao:
+        indice.carregar(_pares(), versao)
+    return indice
+
+
+def receitas_com_ingredientes(nomes, limite=20):
+    """Recebe nomes de ingredientes e devolve [(receita_id, cobertos)]."""
+    nomes = {nome.strip() for nome in nomes if nome.strip()}
+    if not nomes:
+        return []
+    ids = db.session.execute(
+        select(Ingrediente.id).where(Ingrediente.nome.in_(nomes))
+    ).scalars().all()
+    return obter_indice().consultar(ids, limite=limite)
+
+
+@event.listens_for(db.session, "after_flush")
+def _anotar_alteracoes(session, flush_context):
+    alterados = session.info.setdefault("indice_alterados", set())
+    removidos = session.info.setdefault("indice_removidos", set())
+    mudou = False
+    deletados = session.deleted  # cada acesso monta um conjunto novo
+    for obj in session.new | session.dirty | deletados:
+        if isinstance(obj, Receita):
+            (removidos if obj in deletados else alterados).add(obj.id)
+            mudou = True
+        elif isinstance(obj, Ingrediente) and obj in deletados:
+            # some das receitas sem a receita mudar: sem patch, a versão nova
+            # faz a próxima consulta recarregar
+            mudou = True
+    if mudou:
+        conexao = session.connection()
+        if not conexao.execute(
+            update(versao_indice).where(versao_indice.c.id == 1)
+            .values(versao=versao_indice.c.versao + 1)
+        ).rowcount:
+            conexao.execute(insert(versao_indice).values(id=1, versao=1))
+
+
+@event.listens_for(db.session, "before_commit")
+def _coletar(session):
+    session.flush()
+    alterados = session.info.pop("indice_alterados", set())
+    removidos = session.info.pop("indice_removidos", set())
+    if not indice.carregado or not (alterados or removidos):
+        return
+    alterados -= removidos
+    novos = {receita_id: set() for receita_id in alterados}
+    if alterados:
+        for receita_id, ingrediente_id in _pares(alterados):
+            novos[receita_id].add(ingrediente_id)
+    session.info["indice_pendente"] = (novos, removidos, _versao(session))
+
+
+@event.listens_for(db.session, "after_commit")
+def _aplicar(session):
+    pendente = session.info.pop("indice_pendente", None)
+    if pendente:
+        indice.atualizar(*pendente)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _descartar(session, previous_transaction):
+    for chave in ("indice_alterados", "indice_removidos", "indice_pendente"):
+        session.info.pop(chave, None)